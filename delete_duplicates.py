@@ -1,34 +1,17 @@
+# Kept for existing callers; the merge now lives in the merge_duplicate_books management
+# command, which moves the duplicates' reviews onto the surviving book instead of deleting them.
 import os
+import sys
+
 import django
-from django.db.models import Count
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'book_reviews_project.settings')
 django.setup()
 
-from reviews.models import Book
-
-def delete_duplicate_books():
-    print("Finding and deleting duplicate books...")
-    duplicates = Book.objects.values('normalized_title', 'normalized_author').annotate(count=Count('id')).filter(count__gt=1)
-
-    if not duplicates:
-        print("No duplicate books found.")
-        return
-
-    for item in duplicates:
-        title = item['normalized_title']
-        author = item['normalized_author']
-
-        # Get all the duplicate books for this title/author combination
-        books_to_delete = Book.objects.filter(normalized_title=title, normalized_author=author).order_by('id')
-
-        # Keep the first book and delete the rest
-        for book in books_to_delete[1:]:
-            book.delete()
-
-        print(f"Deleted duplicates for: {title} by {author}")
+from django.core.management import call_command
 
-    print("Finished cleaning up duplicate books.")
+def delete_duplicate_books(dry_run=False):
+    call_command('merge_duplicate_books', dry_run=dry_run)
 
 if __name__ == "__main__":
-    delete_duplicate_books()
\ No newline at end of file
+    delete_duplicate_books(dry_run='--dry-run' in sys.argv[1:])
@@ -1,5 +1,10 @@
 from django.contrib import admin
-from .models import Book, Review
+from .models import Book, Review, ExportCursor, GoodreadsIdResolution, ScrapeCheckpoint, ScrapeJob, SentimentScore
 
 admin.site.register(Book)
 admin.site.register(Review)
+admin.site.register(GoodreadsIdResolution)
+admin.site.register(ScrapeJob)
+admin.site.register(SentimentScore)
+admin.site.register(ScrapeCheckpoint)
+admin.site.register(ExportCursor)
@@ -0,0 +1,171 @@
+# In reviews/book_merge.py
+#
+# Merging of duplicate Book rows (same normalized title and author) into one surviving book.
+# Reviews move to the survivor with bulk UPDATEs, reviews that become duplicates there are
+# dropped, empty metadata on the survivor is filled from the duplicates, and the duplicates
+# are deleted in bulk. Used by the merge_duplicate_books command and, with historical models,
+# by the migration that makes the normalized key unique.
+
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Case, IntegerField, Value, When
+
+from .models import Book, Review, ScrapeJob
+from .stats import recompute_book_stats
+from .utils import normalize_author, normalize_title
+
+# Book fields copied from a duplicate when the survivor has no value
+MERGE_FIELDS = [
+    'author', 'description', 'published_date', 'average_rating', 'num_ratings', 'num_reviews',
+    'cover_image_url', 'goodreads_id', 'goodreads_url', 'google_books_id', 'info_link', 'isbn',
+]
+# Unique columns that must be cleared on the duplicates before the survivor can take them
+UNIQUE_FIELDS = ['goodreads_id', 'google_books_id']
+# Row ids per IN (...) clause (stays under SQLite's bound-variable limit)
+ID_CHUNK_SIZE = 500
+
+
+def _models(apps=None):
+    """(Book, Review, ScrapeJob): the current models, or a migration's historical ones from its apps registry."""
+    if apps is None:
+        return Book, Review, ScrapeJob
+    return tuple(apps.get_model('reviews', name) for name in ('Book', 'Review', 'ScrapeJob'))
+
+
+def find_duplicate_groups(apps=None):
+    """
+    Returns {survivor_id: [duplicate_id, ...]} for every set of books sharing a normalized
+    title and author. Keys are computed from each book's title and author (normalize_title /
+    normalize_author), so the result doesn't depend on the stored key columns being filled in.
+    The survivor is the book with a Goodreads ID, then the oldest. Books whose normalized
+    title is empty are never grouped.
+    """
+    Book, _, _ = _models(apps)
+    by_key = defaultdict(list)
+    rows = Book.objects.order_by('pk').values_list('pk', 'title', 'author', 'goodreads_id')
+    for book_id, title, author, goodreads_id in rows.iterator(chunk_size=2000):
+        normalized_title = normalize_title(title or '')
+        if normalized_title:
+            by_key[(normalized_title, normalize_author(author) or '')].append((not goodreads_id, book_id))
+
+    groups = {}
+    for books in by_key.values():
+        if len(books) > 1:
+            books.sort()
+            groups[books[0][1]] = sorted(book_id for _, book_id in books[1:])
+    return dict(sorted(groups.items()))
+
+
+def _chunks(items, size=ID_CHUNK_SIZE):
+    items = list(items)
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _plan(groups, apps=None):
+    """
+    Works out what merging `groups` would change, reading only review ids, book ids and
+    fingerprints. Returns (review_ids_to_drop, moved_review_counts, field_updates) where
+    field_updates maps survivor_id -> {field: value}.
+    """
+    Book, Review, _ = _models(apps)
+    owner = {}
+    for survivor_id, losers in groups.items():
+        owner[survivor_id] = survivor_id
+        for loser_id in losers:
+            owner[loser_id] = survivor_id
+
+    # Survivor reviews are seen first, then each duplicate's in id order; a fingerprint seen
+    # before in the same group marks a review that would violate (book, fingerprint) uniqueness
+    reviews = []
+    for chunk in _chunks(owner):
+        reviews.extend(Review.objects.filter(book_id__in=chunk).values_list('id', 'book_id', 'fingerprint'))
+    reviews.sort(key=lambda row: (owner[row[1]], row[1] != owner[row[1]], row[0]))
+
+    seen = set()
+    drop = []
+    moved = {survivor_id: 0 for survivor_id in groups}
+    for review_id, book_id, fingerprint in reviews:
+        survivor_id = owner[book_id]
+        if fingerprint:
+            if (survivor_id, fingerprint) in seen:
+                drop.append(review_id)
+                continue
+            seen.add((survivor_id, fingerprint))
+        if book_id != survivor_id:
+            moved[survivor_id] += 1
+
+    books = {}
+    for chunk in _chunks(owner):
+        for book in Book.objects.filter(pk__in=chunk).only('pk', *MERGE_FIELDS):
+            books[book.pk] = book
+    field_updates = {}
+    for survivor_id, losers in groups.items():
+        survivor = books[survivor_id]
+        updates = {}
+        for field in MERGE_FIELDS:
+            if getattr(survivor, field) not in (None, ''):
+                continue
+            for loser_id in losers:
+                value = getattr(books[loser_id], field)
+                if value not in (None, ''):
+                    updates[field] = value
+                    break
+        if updates:
+            field_updates[survivor_id] = updates
+    return drop, moved, field_updates
+
+
+def merge_groups(groups, dry_run=False, apps=None):
+    """
+    Merges one batch of duplicate groups inside a single transaction (nothing is written with
+    dry_run). Returns a report dict with per-group details and totals. Pass a migration's apps
+    registry to merge with its historical models.
+    """
+    from .scraper import update_review_watermarks
+
+    Book, Review, ScrapeJob = _models(apps)
+    drop, moved, field_updates = _plan(groups, apps)
+    report = {
+        'groups': [
+            {'survivor': survivor_id, 'duplicates': losers, 'reviews_moved': moved[survivor_id],
+             'fields_filled': sorted(field_updates.get(survivor_id, {}))}
+            for survivor_id, losers in groups.items()
+        ],
+        'books_deleted': sum(len(losers) for losers in groups.values()),
+        'reviews_moved': sum(moved.values()),
+        'reviews_dropped': len(drop),
+    }
+    if dry_run or not groups:
+        return report
+
+    loser_to_survivor = {loser_id: survivor_id for survivor_id, losers in groups.items() for loser_id in losers}
+    with transaction.atomic():
+        for chunk in _chunks(drop):
+            Review.objects.filter(pk__in=chunk).delete()
+
+        for chunk in _chunks(loser_to_survivor):
+            new_book = Case(
+                *[When(book_id=loser_id, then=Value(loser_to_survivor[loser_id])) for loser_id in chunk],
+                output_field=IntegerField(),
+            )
+            Review.objects.filter(book_id__in=chunk).update(book_id=new_book)
+            ScrapeJob.objects.filter(book_id__in=chunk).update(book_id=new_book)
+
+        # Free the unique IDs held by the duplicates, then fill the survivors' empty fields
+        for chunk in _chunks(loser_to_survivor):
+            Book.objects.filter(pk__in=chunk).update(**{field: None for field in UNIQUE_FIELDS})
+        survivors = list(Book.objects.filter(pk__in=field_updates))
+        for survivor in survivors:
+            for field, value in field_updates[survivor.pk].items():
+                setattr(survivor, field, value)
+        for field_chunk in _chunks(survivors):
+            Book.objects.bulk_update(field_chunk, MERGE_FIELDS)
+
+        for chunk in _chunks(loser_to_survivor):
+            Book.objects.filter(pk__in=chunk).delete()
+
+        recompute_book_stats(list(groups), apps=apps)
+        update_review_watermarks([survivor_id for survivor_id in groups if moved[survivor_id]], apps=apps)
+    return report
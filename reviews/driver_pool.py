@@ -0,0 +1,199 @@
+# In reviews/driver_pool.py
+
+import atexit
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.common.exceptions import WebDriverException
+
+try:
+    import psutil
+except ImportError:  # Memory-based recycling is skipped without psutil
+    psutil = None
+
+# Requests matching these patterns are dropped by the fast profile: images, fonts,
+# stylesheets and the third-party ad/analytics scripts Goodreads pages pull in.
+BLOCKED_URL_PATTERNS = [
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.ico',
+    '*.woff', '*.woff2', '*.ttf', '*.otf',
+    '*.css',
+    '*googletagmanager.com*', '*google-analytics.com*', '*doubleclick.net*',
+    '*amazon-adsystem.com*', '*googlesyndication.com*', '*facebook.net*',
+    '*scorecardresearch.com*', '*quantserve.com*', '*adsafeprotected.com*',
+]
+
+
+def build_fast_options():
+    """Headless Chrome options that skip image decoding and other work a scrape doesn't need."""
+    options = Options()
+    options.add_argument('--headless=new')
+    options.add_argument('--disable-gpu')
+    options.add_argument('--disable-extensions')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    options.add_argument('--blink-settings=imagesEnabled=false')
+    options.add_experimental_option('prefs', {
+        'profile.managed_default_content_settings.images': 2,
+        'profile.managed_default_content_settings.fonts': 2,
+    })
+    options.page_load_strategy = 'eager'
+    return options
+
+
+class PooledDriver:
+    """A Chrome driver plus the bookkeeping the pool needs to decide when to recycle it."""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages = 0
+        self.created_at = time.monotonic()
+
+    def rss_mb(self):
+        """Resident memory of the browser process tree in MB, or None when psutil is unavailable."""
+        if psutil is None:
+            return None
+        try:
+            root = psutil.Process(self.driver.service.process.pid)
+            processes = [root] + root.children(recursive=True)
+            return sum(p.memory_info().rss for p in processes) / (1024 * 1024)
+        except (psutil.Error, AttributeError):
+            return None
+
+    def is_healthy(self):
+        try:
+            self.driver.execute_script('return 1')
+            return True
+        except WebDriverException:
+            return False
+
+    def quit(self):
+        try:
+            self.driver.quit()
+        except WebDriverException:
+            pass
+
+
+class DriverPool:
+    """
+    Keeps up to `size` warm headless browsers and leases them to scrapes.
+    A driver is recycled once it has loaded `max_pages` pages (the first page of each lease
+    plus every load reported with record_page_load), when its process tree grows past
+    `max_rss_mb`, or when it fails a health check.
+    """
+
+    def __init__(self, size=2, max_pages=50, max_rss_mb=1500):
+        self.size = size
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._all = set()
+        self._leased = {}
+        self._closed = False
+
+    def _create(self):
+        driver = webdriver.Chrome(options=build_fast_options())
+        try:
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_URL_PATTERNS})
+        except WebDriverException as e:
+            print(f"[INFO] Could not install URL blocking on driver: {e}")
+        pooled = PooledDriver(driver)
+        with self._lock:
+            self._all.add(pooled)
+        return pooled
+
+    def _discard(self, pooled):
+        with self._lock:
+            self._all.discard(pooled)
+        pooled.quit()
+
+    def record_page_load(self, driver):
+        """Counts one more page (e.g. a "Show more" batch) loaded by a leased driver towards max_pages."""
+        with self._lock:
+            pooled = self._leased.get(driver)
+        if pooled is not None:
+            pooled.pages += 1
+
+    def _needs_recycle(self, pooled):
+        if pooled.pages >= self.max_pages:
+            return True
+        rss = pooled.rss_mb()
+        return rss is not None and rss > self.max_rss_mb
+
+    @contextmanager
+    def lease(self):
+        """Yields a ready WebDriver, blocking while all `size` drivers are leased out."""
+        if self._closed:
+            raise RuntimeError("Driver pool is closed")
+        self._slots.acquire()
+        pooled = None
+        try:
+            try:
+                pooled = self._idle.get_nowait()
+                if not pooled.is_healthy():
+                    print("[INFO] Discarding unhealthy pooled driver.")
+                    self._discard(pooled)
+                    pooled = None
+            except queue.Empty:
+                pass
+            if pooled is None:
+                pooled = self._create()
+
+            pooled.pages += 1
+            with self._lock:
+                self._leased[pooled.driver] = pooled
+            yield pooled.driver
+        except Exception:
+            # A scrape failure may have left the browser in a bad state; don't reuse it
+            if pooled is not None:
+                self._discard(pooled)
+                pooled = None
+            raise
+        finally:
+            if pooled is not None:
+                with self._lock:
+                    self._leased.pop(pooled.driver, None)
+                if self._closed or self._needs_recycle(pooled):
+                    self._discard(pooled)
+                else:
+                    try:
+                        pooled.driver.get('about:blank')
+                        self._idle.put(pooled)
+                    except WebDriverException:
+                        self._discard(pooled)
+            self._slots.release()
+
+    def close(self):
+        self._closed = True
+        with self._lock:
+            drivers = list(self._all)
+            self._all.clear()
+        for pooled in drivers:
+            pooled.quit()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_driver_pool():
+    """Returns the process-wide driver pool, sized from settings."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = DriverPool(
+                    size=getattr(settings, 'SCRAPER_DRIVER_POOL_SIZE', 2),
+                    max_pages=getattr(settings, 'SCRAPER_DRIVER_MAX_PAGES', 50),
+                    max_rss_mb=getattr(settings, 'SCRAPER_DRIVER_MAX_RSS_MB', 1500),
+                )
+                atexit.register(_pool.close)
+    return _pool
@@ -0,0 +1,214 @@
+# In reviews/export.py
+#
+# Streaming export of reviews joined with their book as JSONL, CSV or Parquet. Rows are read in
+# id order in keyset chunks of EXPORT_CHUNK_SIZE, so memory stays flat however many reviews are
+# exported. JSONL and CSV are encoded one chunk at a time; Parquet gets one row group per chunk
+# (pyarrow is optional and only imported for Parquet). Used by the export_reviews command and
+# the reviews/export/reviews.<format> endpoint.
+
+import csv
+import importlib.util
+import io
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+from django.db.models import Max
+from django.utils import timezone
+
+from .models import ExportCursor, Review
+
+EXPORT_FORMATS = ('jsonl', 'csv', 'parquet')
+EXPORT_CONTENT_TYPES = {
+    'jsonl': 'application/x-ndjson',
+    'csv': 'text/csv; charset=utf-8',
+    'parquet': 'application/vnd.apache.parquet',
+}
+# Reviews read per query and written per Parquet row group
+EXPORT_CHUNK_SIZE = 2000
+
+# (output column, Review lookup)
+EXPORT_COLUMNS = [
+    ('review_id', 'id'),
+    ('book_id', 'book_id'),
+    ('book_title', 'book__title'),
+    ('book_author', 'book__author'),
+    ('goodreads_id', 'book__goodreads_id'),
+    ('reviewer_name', 'reviewer_name'),
+    ('rating', 'rating'),
+    ('review_date', 'review_date'),
+    ('sentiment_label', 'sentiment_label'),
+    ('sentiment_score', 'sentiment_score'),
+    ('source_website', 'source_website'),
+    ('review_text', 'review_text'),
+    ('created_at', 'created_at'),
+]
+COLUMN_NAMES = [name for name, _ in EXPORT_COLUMNS]
+
+
+def parquet_available():
+    return importlib.util.find_spec('pyarrow') is not None
+
+
+def filtered_reviews(book_ids=None, date_from=None, date_to=None, sentiment=None):
+    """Reviews to export: optionally only some books, a review_date range (inclusive) and one sentiment label."""
+    reviews = Review.objects.all()
+    if book_ids:
+        reviews = reviews.filter(book_id__in=book_ids)
+    if date_from:
+        reviews = reviews.filter(review_date__gte=date_from)
+    if date_to:
+        reviews = reviews.filter(review_date__lte=date_to)
+    if sentiment:
+        reviews = reviews.filter(sentiment_label=sentiment)
+    return reviews
+
+
+def latest_review_id():
+    """Upper bound for an export run: reviews stored while it streams are left for the next one."""
+    return Review.objects.aggregate(last=Max('id'))['last'] or 0
+
+
+def iter_row_chunks(reviews, after_id=0, upto_id=None, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Yields lists of row tuples (in EXPORT_COLUMNS order) for the reviews with
+    after_id < id <= upto_id, one keyset query per list.
+    """
+    lookups = [lookup for _, lookup in EXPORT_COLUMNS]
+    if upto_id is not None:
+        reviews = reviews.filter(id__lte=upto_id)
+    while True:
+        chunk = list(reviews.filter(id__gt=after_id).order_by('id').values_list(*lookups)[:chunk_size])
+        if not chunk:
+            return
+        yield chunk
+        after_id = chunk[-1][0]
+
+
+# --- Encoders: each takes row chunks and yields bytes
+
+def _json_value(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def jsonl_chunks(row_chunks):
+    for chunk in row_chunks:
+        lines = [
+            json.dumps(dict(zip(COLUMN_NAMES, map(_json_value, row))), ensure_ascii=False)
+            for row in chunk
+        ]
+        yield ('\n'.join(lines) + '\n').encode('utf-8')
+
+
+def csv_chunks(row_chunks):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(COLUMN_NAMES)
+    for chunk in row_chunks:
+        writer.writerows(chunk)
+        yield buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+
+class _ByteSink:
+    """Write-only file object that hands back whatever was written since the last take()."""
+
+    def __init__(self):
+        self._parts = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data):
+        self._parts.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def take(self):
+        data = b''.join(self._parts)
+        self._parts = []
+        return data
+
+
+def parquet_chunks(row_chunks):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([
+        ('review_id', pa.int64()),
+        ('book_id', pa.int64()),
+        ('book_title', pa.string()),
+        ('book_author', pa.string()),
+        ('goodreads_id', pa.string()),
+        ('reviewer_name', pa.string()),
+        ('rating', pa.decimal128(3, 2)),
+        ('review_date', pa.date32()),
+        ('sentiment_label', pa.string()),
+        ('sentiment_score', pa.decimal128(5, 4)),
+        ('source_website', pa.string()),
+        ('review_text', pa.string()),
+        ('created_at', pa.timestamp('us', tz='UTC')),
+    ])
+    sink = _ByteSink()
+    writer = pq.ParquetWriter(sink, schema, compression='zstd')
+    try:
+        for chunk in row_chunks:
+            columns = list(zip(*chunk))
+            writer.write_table(pa.Table.from_arrays(
+                [pa.array(column, type=field.type) for column, field in zip(columns, schema)], schema=schema
+            ))
+            yield sink.take()
+    finally:
+        writer.close()
+    yield sink.take()
+
+
+ENCODERS = {'jsonl': jsonl_chunks, 'csv': csv_chunks, 'parquet': parquet_chunks}
+
+
+def export_stream(fmt, reviews, after_id=0, upto_id=None, chunk_size=EXPORT_CHUNK_SIZE, counter=None):
+    """
+    Bytes of reviews encoded as fmt, produced chunk by chunk. counter, if given, is a dict whose
+    'rows' entry is incremented as rows are read.
+    """
+    if fmt not in ENCODERS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    if fmt == 'parquet' and not parquet_available():
+        raise ImportError("Parquet export needs the pyarrow package (pip install pyarrow).")
+
+    def counted(row_chunks):
+        for chunk in row_chunks:
+            if counter is not None:
+                counter['rows'] = counter.get('rows', 0) + len(chunk)
+            yield chunk
+
+    return ENCODERS[fmt](counted(iter_row_chunks(reviews, after_id, upto_id, chunk_size)))
+
+
+def cursor_position(name):
+    """Last review id exported under name (0 before its first export)."""
+    cursor = ExportCursor.objects.filter(name=name).first()
+    return cursor.last_review_id if cursor else 0
+
+
+def advance_cursor(name, upto_id, rows):
+    """Records a finished incremental export; the next one starts after upto_id. Never moves a cursor back."""
+    ExportCursor.objects.get_or_create(name=name)
+    ExportCursor.objects.filter(name=name, last_review_id__lt=upto_id).update(
+        last_review_id=upto_id, rows_exported=rows, exported_at=timezone.now()
+    )
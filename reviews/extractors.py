@@ -0,0 +1,146 @@
+# In reviews/extractors.py
+
+import re
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+
+from .parsing import parse_html
+
+# Subtrees the 'html.parser' backend builds for each page type (see parsing.parse_html)
+SEARCH_RESULTS_SUBTREE = {'name': 'table', 'attrs': {'class': 'tableList'}}
+BOOK_PAGE_SUBTREE = {'name': 'div', 'attrs': {'class': re.compile(r'^BookPage__(leftColumn|rightColumn)$')}}
+NEXT_DATA_SUBTREE = {'name': 'script', 'attrs': {'id': '__NEXT_DATA__'}}
+
+
+def extract_search_results(html, backend=None):
+    """
+    Returns the rows of a Goodreads search results page as (goodreads_id, title, author) tuples,
+    or None when the page has no results table.
+    """
+    root = parse_html(html, backend, only=SEARCH_RESULTS_SUBTREE)
+    table = root.css_first('table.tableList')
+    if table is None:
+        return None
+
+    results = []
+    for row in table.css('tr'):
+        link = row.css_first('a.bookTitle[href]')
+        if link is None:
+            continue
+        gid_match = re.search(r'/book/show/(\d+)', link.attr('href', ''))
+        if not gid_match:
+            continue
+        author_link = row.css_first('a.authorName')
+        results.append((gid_match.group(1), link.text(), author_link.text() if author_link else ''))
+    return results
+
+
+def extract_book_metadata(html, backend=None):
+    """Extracts title, author, rating statistics, cover and description from a /book/show/ page."""
+    root = parse_html(html, backend, only=BOOK_PAGE_SUBTREE)
+    if root.css_first('h1.Text__title1') is None:
+        # Layout without the expected columns; fall back to the whole document
+        root = parse_html(html, backend)
+    book_data = {}
+
+    # --- Title & Author
+    title_elem = root.css_first('h1.Text__title1')
+    book_data['title'] = title_elem.raw_text().strip() if title_elem else None
+
+    author_elem = root.css_first('span.ContributorLink__name')
+    if author_elem:
+        book_data['author'] = author_elem.text()
+    else:
+        author_link = root.css_first('span.Text__title3 a')
+        book_data['author'] = author_link.text() if author_link else None
+
+    # --- Average Rating
+    rating_elem = root.css_first('div.RatingStatistics__rating')
+    if rating_elem:
+        try:
+            book_data['average_rating'] = Decimal(rating_elem.raw_text().strip())
+        except (ValueError, InvalidOperation):
+            book_data['average_rating'] = None
+
+    # --- Num Ratings and Num Reviews (Meta Section; uses data-testid attrs for robustness!)
+    stats_container = root.css_first('div.RatingStatistics__meta')
+    if stats_container:
+        for testid, field in (('ratingsCount', 'num_ratings'), ('reviewsCount', 'num_reviews')):
+            count_span = stats_container.css_first(f'span[data-testid="{testid}"]')
+            if count_span:
+                count_match = re.search(r'([\d,]+)', count_span.raw_text())
+                book_data[field] = int(count_match.group(1).replace(",", "")) if count_match else None
+
+    # --- Cover
+    cover_elem = root.css_first('img.ResponsiveImage')
+    book_data['cover_image_url'] = cover_elem.attr('src') if cover_elem else None
+
+    # --- Description
+    description_elem = root.css_first('div[data-testid="description"]')
+    if description_elem:
+        book_data['description'] = description_elem.raw_text().strip()
+
+    return book_data
+
+
+def extract_review_card(card):
+    """Extracts one review dict from an article.ReviewCard node."""
+    # --- Extract review text
+    review_text = ''
+    review_text_element = card.css_first('div[data-testid="contentContainer"]')
+    if review_text_element:
+        review_text = review_text_element.text()
+
+    # --- Extract reviewer name
+    reviewer_name = 'Unknown'
+    name_link = card.css_first('div[data-testid="name"] a')
+    if name_link:
+        reviewer_name = name_link.text()
+
+    # --- Extract rating
+    rating = None
+    rating_element = card.css_first('span.RatingStars')
+    if rating_element:
+        rating_label = rating_element.attr('aria-label')
+        if rating_label and 'Rating' in rating_label:
+            rating_value_match = re.search(r'Rating\s*([\d.]+)\s*out\s*of\s*5', rating_label)
+            if rating_value_match:
+                rating = Decimal(rating_value_match.group(1))
+
+    # --- Extract date
+    review_date = None
+    date_link = card.css_first('span.Text.Text__body3 a')
+    if date_link:
+        try:
+            review_date = datetime.strptime(date_link.text(), '%B %d, %Y')
+        except ValueError:
+            pass
+
+    return {
+        'review_text': review_text,
+        'review_date': review_date,
+        'reviewer_name': reviewer_name,
+        'rating': rating
+    }
+
+
+def extract_review_cards(html, backend=None):
+    """Parses a page or a run of ReviewCard fragments and returns a review dict per card, in order."""
+    if not html:
+        return []
+    root = parse_html(html, backend)
+    return [extract_review_card(card) for card in root.css('article.ReviewCard')]
+
+
+def extract_next_data(html, backend=None):
+    """Returns the raw JSON text of the page's __NEXT_DATA__ script, or None."""
+    root = parse_html(html, backend, only=NEXT_DATA_SUBTREE)
+    script = root.css_first('script#__NEXT_DATA__')
+    return script.raw_text() if script else None
+
+
+def html_to_text(html, backend=None):
+    """Plain text of an HTML snippet, with stripped parts joined the way review cards are read."""
+    if not html:
+        return ''
+    return parse_html(html, backend).text()
@@ -0,0 +1,225 @@
+# In reviews/http_cache.py
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from django.conf import settings
+
+# Seconds a cached response stays fresh, by URL pattern. URLs matching no pattern are not cached.
+DEFAULT_TTLS = [
+    (r'/search\?', 24 * 3600),
+    (r'/book/show/[^/?#]+/reviews', 6 * 3600),
+    (r'/book/show/[^/?#]+$', 7 * 24 * 3600),
+]
+
+
+class OfflineCacheMiss(requests.exceptions.RequestException):
+    """Raised in cache-only mode when a URL has never been cached."""
+
+
+_stats = {'hits': 0, 'misses': 0, 'revalidated': 0, 'offline_hits': 0, 'stores': 0, 'evictions': 0}
+_stats_lock = threading.Lock()
+_size_lock = threading.Lock()
+_total_bytes = None
+_compiled_ttls = None
+
+
+def _count(name):
+    with _stats_lock:
+        _stats[name] += 1
+
+
+def cache_stats():
+    """Returns this process's hit/miss counters."""
+    with _stats_lock:
+        return dict(_stats)
+
+
+def reset_stats():
+    with _stats_lock:
+        for name in _stats:
+            _stats[name] = 0
+
+
+def is_enabled():
+    return getattr(settings, 'HTTP_CACHE_ENABLED', False)
+
+
+def is_offline():
+    return getattr(settings, 'HTTP_CACHE_OFFLINE', False)
+
+
+def cache_dir():
+    return str(getattr(settings, 'HTTP_CACHE_DIR', os.path.join(settings.BASE_DIR, '.http_cache')))
+
+
+def ttl_for(url):
+    """Freshness lifetime for url in seconds, or None when the URL should not be cached."""
+    global _compiled_ttls
+    if _compiled_ttls is None:
+        _compiled_ttls = [(re.compile(pattern), ttl) for pattern, ttl in getattr(settings, 'HTTP_CACHE_TTLS', DEFAULT_TTLS)]
+    for pattern, ttl in _compiled_ttls:
+        if pattern.search(url):
+            return ttl
+    return None
+
+
+def _paths(url):
+    key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+    directory = os.path.join(cache_dir(), key[:2])
+    return os.path.join(directory, key + '.json'), os.path.join(directory, key + '.body')
+
+
+def _load(url):
+    meta_path, body_path = _paths(url)
+    try:
+        with open(meta_path, encoding='utf-8') as f:
+            meta = json.load(f)
+        with open(body_path, 'rb') as f:
+            body = f.read()
+    except (OSError, ValueError):
+        return None
+    if meta.get('url') != url:
+        return None
+    return meta, body
+
+
+def _touch(url, meta=None):
+    """Marks the entry as recently used (LRU order is file mtime), optionally rewriting its metadata."""
+    meta_path, body_path = _paths(url)
+    try:
+        if meta is not None:
+            _write_atomic(meta_path, json.dumps(meta).encode('utf-8'))
+        os.utime(body_path)
+    except OSError:
+        pass
+
+
+def _write_atomic(path, data):
+    tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def _to_response(url, meta, body):
+    response = requests.Response()
+    response.status_code = meta['status']
+    response.headers = CaseInsensitiveDict(meta.get('headers', {}))
+    response.encoding = meta.get('encoding')
+    response.url = url
+    response._content = body
+    response.from_cache = True
+    return response
+
+
+def _store(url, response):
+    meta = {
+        'url': url,
+        'status': response.status_code,
+        'encoding': response.encoding,
+        'stored_at': time.time(),
+        'headers': {k.lower(): v for k, v in response.headers.items() if k.lower() in ('content-type', 'etag', 'last-modified')},
+    }
+    meta_path, body_path = _paths(url)
+    try:
+        os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+        _write_atomic(body_path, response.content)
+        _write_atomic(meta_path, json.dumps(meta).encode('utf-8'))
+    except OSError as e:
+        print(f"[INFO] Could not write HTTP cache entry for {url}: {e}")
+        return
+    _count('stores')
+    _account(len(response.content))
+
+
+def _scan():
+    entries = []
+    for root, _, files in os.walk(cache_dir()):
+        for name in files:
+            if name.endswith('.body'):
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, path))
+    return entries
+
+
+def _account(added_bytes):
+    """Tracks the cache size and evicts least recently used entries once it exceeds HTTP_CACHE_MAX_BYTES."""
+    global _total_bytes
+    max_bytes = getattr(settings, 'HTTP_CACHE_MAX_BYTES', 500 * 1024 * 1024)
+    with _size_lock:
+        if _total_bytes is None:
+            _total_bytes = sum(size for _, size, _ in _scan())
+        else:
+            _total_bytes += added_bytes
+        if _total_bytes <= max_bytes:
+            return
+
+        # Rescan (other processes share the directory) and trim to 90% of the limit
+        entries = sorted(_scan())
+        _total_bytes = sum(size for _, size, _ in entries)
+        target = max_bytes * 0.9
+        for _, size, body_path in entries:
+            if _total_bytes <= target:
+                break
+            for path in (body_path, body_path[:-len('.body')] + '.json'):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            _total_bytes -= size
+            _count('evictions')
+
+
+def cached_get(url, send):
+    """
+    Serves a GET for url from the cache when fresh, revalidates stale entries with
+    If-None-Match / If-Modified-Since, and stores successful responses.
+    `send(headers)` performs the real request with the extra headers and returns the response.
+    """
+    ttl = ttl_for(url)
+    if ttl is None and not is_offline():
+        return send({})
+
+    cached = _load(url)
+    if cached is not None:
+        meta, body = cached
+        if is_offline():
+            _count('offline_hits')
+            _touch(url)
+            return _to_response(url, meta, body)
+        if ttl is not None and time.time() - meta['stored_at'] < ttl:
+            _count('hits')
+            _touch(url)
+            return _to_response(url, meta, body)
+    elif is_offline():
+        raise OfflineCacheMiss(f"{url} is not in the HTTP cache (cache-only mode)")
+
+    conditional = {}
+    if cached is not None:
+        if meta['headers'].get('etag'):
+            conditional['If-None-Match'] = meta['headers']['etag']
+        if meta['headers'].get('last-modified'):
+            conditional['If-Modified-Since'] = meta['headers']['last-modified']
+
+    response = send(conditional)
+    if response.status_code == 304 and cached is not None:
+        _count('revalidated')
+        meta['stored_at'] = time.time()
+        _touch(url, meta)
+        return _to_response(url, meta, body)
+
+    _count('misses')
+    if response.status_code == 200:
+        _store(url, response)
+    return response
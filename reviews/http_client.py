@@ -0,0 +1,112 @@
+# In reviews/http_client.py
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from . import http_cache, rate_limit
+from .rate_limit import CircuitOpenError  # noqa: F401 (re-exported for callers)
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+DEFAULT_TIMEOUT = 15
+
+# Size of the keep-alive pool and the number of requests allowed in flight per host.
+POOL_MAXSIZE = 16
+MAX_CONNECTIONS_PER_HOST = 4
+# Extra attempts for a request that was throttled (429/503) or hit a connection error / timeout
+MAX_RETRIES = 3
+
+_session = None
+_session_lock = threading.Lock()
+_host_semaphores = {}
+_host_semaphores_lock = threading.Lock()
+
+
+def get_session():
+    """Returns the process-wide requests.Session with keep-alive connection pooling."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                session.headers.update(DEFAULT_HEADERS)
+                adapter = HTTPAdapter(pool_connections=POOL_MAXSIZE, pool_maxsize=POOL_MAXSIZE)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                _session = session
+    return _session
+
+
+def _host_semaphore(url):
+    host = urlsplit(url).netloc
+    with _host_semaphores_lock:
+        semaphore = _host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = threading.BoundedSemaphore(MAX_CONNECTIONS_PER_HOST)
+            _host_semaphores[host] = semaphore
+    return semaphore
+
+
+def _send(url, method, timeout, **kwargs):
+    """
+    Sends one request, paced by the shared per-host rate limiter (reviews.rate_limit) when it
+    is enabled. Throttled responses and connection errors are retried up to MAX_RETRIES times;
+    the limiter decides how long each retry waits.
+    """
+    if not rate_limit.is_enabled():
+        with _host_semaphore(url):
+            return get_session().request(method, url, timeout=timeout, **kwargs)
+
+    host = urlsplit(url).netloc
+    for attempt in range(MAX_RETRIES + 1):
+        rate_limit.acquire(host)
+        try:
+            with _host_semaphore(url):
+                response = get_session().request(method, url, timeout=timeout, **kwargs)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+            rate_limit.record_failure(host)
+            if attempt == MAX_RETRIES:
+                raise
+            continue
+        if response.status_code in rate_limit.THROTTLE_STATUSES or response.status_code >= 500:
+            rate_limit.record_failure(host, response)
+            if response.status_code in rate_limit.THROTTLE_STATUSES and attempt < MAX_RETRIES:
+                continue
+        else:
+            rate_limit.record_success(host)
+        return response
+
+
+def fetch(url, method='GET', timeout=DEFAULT_TIMEOUT, **kwargs):
+    """
+    Performs a request through the shared session, holding one of the host's
+    concurrency slots for the duration and pacing it with the host's rate limiter.
+    Plain GETs go through the on-disk response cache when it is enabled. Raises
+    for non-2xx responses, and CircuitOpenError while the host's circuit is open.
+    """
+    if method == 'GET' and http_cache.is_enabled() and not kwargs.get('params'):
+        extra_headers = kwargs.pop('headers', None) or {}
+        response = http_cache.cached_get(
+            url, lambda conditional: _send(url, method, timeout, headers={**extra_headers, **conditional}, **kwargs)
+        )
+    else:
+        response = _send(url, method, timeout, **kwargs)
+    response.raise_for_status()
+    return response
+
+
+def map_concurrent(func, items, max_workers=MAX_CONNECTIONS_PER_HOST):
+    """
+    Calls func on every item using a thread pool and returns the results in input order.
+    Per-host limits still apply inside fetch(), so max_workers only bounds total threads.
+    """
+    items = list(items)
+    if not items:
+        return []
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        return list(executor.map(func, items))
@@ -0,0 +1,104 @@
+# In reviews/ingest.py
+#
+# Streaming review ingestion. The scraper's batch generator (scraper.iter_goodreads_reviews) runs
+# on the calling thread while a writer thread stores each batch in its own transaction together
+# with the book's ScrapeCheckpoint. Fetching the next page overlaps with saving the last one,
+# memory stays bounded by a few batches, and an interrupted scrape resumes after the last batch
+# that was saved.
+
+import queue
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import ScrapeCheckpoint
+
+# Scraped batches allowed to wait for the writer before the scraper blocks
+QUEUE_DEPTH = 2
+
+_DONE = object()
+
+
+def load_checkpoint(book):
+    """
+    The book's saved scrape position as a resume state, or None. Checkpoints older than
+    settings.SCRAPE_CHECKPOINT_MAX_AGE are dropped, since the review order will have moved on.
+    """
+    checkpoint = ScrapeCheckpoint.objects.filter(book=book).first()
+    if checkpoint is None:
+        return None
+    if timezone.now() - checkpoint.updated_at > getattr(settings, 'SCRAPE_CHECKPOINT_MAX_AGE', timedelta(days=1)):
+        checkpoint.delete()
+        return None
+    return checkpoint.as_state()
+
+
+def _save_checkpoint(book, state):
+    ScrapeCheckpoint.objects.update_or_create(
+        book=book,
+        defaults={field: state[field] for field in ('backend', 'batches_done', 'reviews_scraped', 'page_token', 'work_id')},
+    )
+
+
+def ingest_reviews(book, max_reviews=50, backend=None, incremental=False, resume=True, progress=None):
+    """
+    Scrapes reviews for a stored book and saves them batch by batch. Returns (reviews scraped,
+    new reviews stored); the scraped count includes batches stored by the run being resumed.
+    progress(scraped, created) is called after every stored batch, from the writer thread.
+    resume=False starts from the first page even when a checkpoint exists. When scraping or
+    saving fails, the batches stored so far stay stored and the checkpoint is kept.
+    """
+    from .scraper import iter_goodreads_reviews, review_watermark, store_review_batch
+
+    watermark = review_watermark(book) if incremental else None
+    state = load_checkpoint(book) if resume else None
+    totals = {'scraped': state['reviews_scraped'] if state else 0, 'created': 0}
+    batches = queue.Queue(maxsize=QUEUE_DEPTH)
+    failure = []
+
+    def write():
+        try:
+            while True:
+                item = batches.get()
+                if item is _DONE:
+                    return
+                reviews, batch_state = item
+                with transaction.atomic():
+                    created = store_review_batch(book, reviews) if reviews else 0
+                    _save_checkpoint(book, batch_state)
+                totals['scraped'] = batch_state['reviews_scraped']
+                totals['created'] += created
+                if progress:
+                    progress(totals['scraped'], totals['created'])
+        except Exception as e:
+            print(f"[ERROR] Failed to store a review batch for '{book.title}': {e}")
+            failure.append(e)
+            # Keep taking batches so the scraper never blocks on a full queue before it notices
+            while batches.get() is not _DONE:
+                pass
+        finally:
+            connection.close()
+
+    writer = threading.Thread(target=write, name=f'ingest-{book.pk}', daemon=True)
+    writer.start()
+    completed = False
+    try:
+        for reviews, batch_state in iter_goodreads_reviews(book.goodreads_id, max_reviews, backend=backend,
+                                                           watermark=watermark, resume=state):
+            if failure:
+                break
+            batches.put((reviews, batch_state))
+        else:
+            completed = True
+    finally:
+        batches.put(_DONE)
+        writer.join()
+
+    if failure:
+        raise failure[0]
+    if completed:
+        ScrapeCheckpoint.objects.filter(book=book).delete()
+    return totals['scraped'], totals['created']
@@ -0,0 +1,272 @@
+# In reviews/jobs.py
+
+import os
+import socket
+import threading
+import time
+import traceback
+from datetime import timedelta
+
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Book, ScrapeJob
+
+
+def enqueue_scrape(title, author='', max_reviews=25, backend=None, incremental=False):
+    """Queues a scrape for a worker to pick up and returns the ScrapeJob."""
+    job = ScrapeJob.objects.create(
+        title=title, author=author or '', max_reviews=max_reviews, backend=backend, incremental=incremental
+    )
+    print(f"[INFO] Queued scrape job {job.pk} for '{title}' by {author or 'unknown author'}")
+    return job
+
+
+def default_worker_id():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def claim_next_job(worker_id):
+    """
+    Atomically moves the oldest queued job to 'running' for this worker.
+    The conditional UPDATE only succeeds for one claimant, so concurrent workers never share a job.
+    """
+    for job_id in ScrapeJob.objects.filter(status=ScrapeJob.STATUS_QUEUED).order_by('created_at').values_list('pk', flat=True)[:10]:
+        claimed = ScrapeJob.objects.filter(pk=job_id, status=ScrapeJob.STATUS_QUEUED).update(
+            status=ScrapeJob.STATUS_RUNNING, worker=worker_id, started_at=timezone.now(), updated_at=timezone.now()
+        )
+        if claimed:
+            return ScrapeJob.objects.get(pk=job_id)
+    return None
+
+
+def requeue_stale_jobs(stale_after=timedelta(minutes=60)):
+    """Puts 'running' jobs that have not reported progress for stale_after back in the queue."""
+    cutoff = timezone.now() - stale_after
+    count = ScrapeJob.objects.filter(status=ScrapeJob.STATUS_RUNNING, updated_at__lt=cutoff).update(
+        status=ScrapeJob.STATUS_QUEUED, worker='', phase='', updated_at=timezone.now()
+    )
+    if count:
+        print(f"[INFO] Requeued {count} stale scrape job(s).")
+    return count
+
+
+class _Phase:
+    """Context manager that records a phase name on the job and its duration in job.timings."""
+
+    def __init__(self, job, name):
+        self.job = job
+        self.name = name
+
+    def __enter__(self):
+        self.job.phase = self.name
+        self.job.save(update_fields=['phase', 'updated_at'])
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.job.timings[self.name] = round(time.perf_counter() - self.started, 3)
+        self.job.save(update_fields=['timings', 'updated_at'])
+        return False
+
+
+def _finish(job, status, error=''):
+    job.status = status
+    job.error = error
+    job.phase = ''
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'error', 'phase', 'finished_at', 'updated_at'])
+
+
+def run_scrape_job(job):
+    """Runs the full search -> metadata -> reviews -> save pipeline for a claimed job."""
+    from .ingest import ingest_reviews
+    from .resolver import resolve_goodreads_id
+    from .scraper import get_goodreads_book_metadata, create_or_update_book_record
+
+    try:
+        with _Phase(job, 'resolve'):
+            goodreads_id = resolve_goodreads_id(job.title, job.author)
+        if not goodreads_id:
+            _finish(job, ScrapeJob.STATUS_FAILED, f"Could not find a Goodreads ID for '{job.title}' by {job.author}")
+            return job
+
+        with _Phase(job, 'metadata'):
+            book_metadata = get_goodreads_book_metadata(goodreads_id)
+        if not book_metadata or not book_metadata.get('title'):
+            _finish(job, ScrapeJob.STATUS_FAILED, f"Could not scrape metadata for Goodreads ID {goodreads_id}")
+            return job
+
+        with _Phase(job, 'book'):
+            with transaction.atomic():
+                job.book = create_or_update_book_record(book_metadata, 'goodreads')
+            job.save(update_fields=['book', 'updated_at'])
+
+        # Batches are stored as they are scraped; the status page sees the count grow
+        def progress(scraped, created):
+            ScrapeJob.objects.filter(pk=job.pk).update(reviews_scraped=scraped, updated_at=timezone.now())
+
+        with _Phase(job, 'reviews'):
+            job.reviews_scraped, _ = ingest_reviews(job.book, job.max_reviews, backend=job.backend,
+                                                    incremental=job.incremental, progress=progress)
+            job.save(update_fields=['reviews_scraped', 'updated_at'])
+
+        _finish(job, ScrapeJob.STATUS_DONE)
+    except Exception as e:
+        traceback.print_exc()
+        _finish(job, ScrapeJob.STATUS_FAILED, str(e))
+    return job
+
+
+def run_worker(worker_id=None, concurrency=1, once=False, poll_interval=2.0, stale_after=timedelta(minutes=60)):
+    """
+    Claims and runs queued jobs on `concurrency` threads. With once=True each thread exits
+    as soon as the queue is empty; otherwise threads poll every poll_interval seconds.
+    """
+    worker_id = worker_id or default_worker_id()
+    requeue_stale_jobs(stale_after)
+
+    def loop(thread_index):
+        thread_worker_id = f"{worker_id}/{thread_index}"
+        try:
+            while True:
+                job = claim_next_job(thread_worker_id)
+                if job is None:
+                    if once:
+                        return
+                    time.sleep(poll_interval)
+                    continue
+                print(f"[INFO] {thread_worker_id} running job {job.pk} ('{job.title}')")
+                run_scrape_job(job)
+                print(f"[INFO] {thread_worker_id} finished job {job.pk}: {job.status} {job.timings}")
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=loop, args=(i,), daemon=True) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+# --- Bulk rescrape: workers claim books through expiring leases on the Book row
+
+def _claimable(stale_before, now):
+    return (
+        (Q(last_scraped_at__isnull=True) | Q(last_scraped_at__lt=stale_before))
+        & (Q(scrape_lease_expires_at__isnull=True) | Q(scrape_lease_expires_at__lt=now))
+    )
+
+
+def claim_book_for_scrape(owner, stale_before, lease_duration=timedelta(minutes=30)):
+    """
+    Leases the next book that has not been scraped since stale_before and is not leased by
+    a live worker. Expired leases (from crashed workers) are claimable again. The conditional
+    UPDATE makes the claim atomic across processes and machines sharing the database.
+    """
+    now = timezone.now()
+    candidates = (
+        Book.objects.filter(goodreads_id__isnull=False)
+        .filter(_claimable(stale_before, now))
+        .order_by(F('last_scraped_at').asc(nulls_first=True), 'pk')
+        .values_list('pk', flat=True)[:20]
+    )
+    for book_id in candidates:
+        claimed = Book.objects.filter(pk=book_id).filter(_claimable(stale_before, now)).update(
+            scrape_lease_owner=owner, scrape_lease_expires_at=now + lease_duration
+        )
+        if claimed:
+            return Book.objects.get(pk=book_id)
+    return None
+
+
+def renew_book_lease(book_id, owner, lease_duration=timedelta(minutes=30)):
+    """Extends a lease this owner still holds. Returns False if it was lost."""
+    return bool(Book.objects.filter(pk=book_id, scrape_lease_owner=owner).update(
+        scrape_lease_expires_at=timezone.now() + lease_duration
+    ))
+
+
+def release_book_lease(book_id, owner, scraped, retry_after=timedelta(minutes=30)):
+    """
+    Gives up a lease. A successful scrape stamps last_scraped_at; a failed one keeps the
+    book unclaimable for retry_after so workers don't spin on a book that keeps failing.
+    """
+    now = timezone.now()
+    if scraped:
+        updates = {'scrape_lease_owner': '', 'scrape_lease_expires_at': None, 'last_scraped_at': now}
+    else:
+        updates = {'scrape_lease_owner': '', 'scrape_lease_expires_at': now + retry_after}
+    Book.objects.filter(pk=book_id, scrape_lease_owner=owner).update(**updates)
+
+
+class _LeaseKeeper(threading.Thread):
+    """Renews a book lease in the background while a long scrape runs."""
+
+    def __init__(self, book_id, owner, lease_duration):
+        super().__init__(daemon=True)
+        self.book_id = book_id
+        self.owner = owner
+        self.lease_duration = lease_duration
+        self.stopped = threading.Event()
+
+    def run(self):
+        try:
+            while not self.stopped.wait(self.lease_duration.total_seconds() / 3):
+                if not renew_book_lease(self.book_id, self.owner, self.lease_duration):
+                    print(f"[INFO] Lease on book {self.book_id} was lost by {self.owner}.")
+                    return
+        finally:
+            connection.close()
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+
+def scrape_reviews_for_book(book, max_reviews=50, backend=None, incremental=False):
+    """
+    Scrapes and saves reviews for a stored book, batch by batch (see reviews.ingest), resuming
+    an interrupted scrape of it. Returns the number of reviews scraped.
+    With incremental=True pagination stops once it reaches reviews already stored.
+    """
+    from .ingest import ingest_reviews
+
+    scraped, _ = ingest_reviews(book, max_reviews, backend=backend, incremental=incremental)
+    return scraped
+
+
+def run_bulk_worker(owner, stale_before, max_reviews=50, backend=None, lease_duration=timedelta(minutes=30), report=print, incremental=False):
+    """
+    Claims and scrapes books until none are left for this run. `report` receives one dict per
+    book with its id, title, review count, duration and error (if any).
+    """
+    try:
+        while True:
+            book = claim_book_for_scrape(owner, stale_before, lease_duration)
+            if book is None:
+                return
+            keeper = _LeaseKeeper(book.pk, owner, lease_duration)
+            keeper.start()
+            started = time.perf_counter()
+            error = ''
+            reviews = 0
+            try:
+                reviews = scrape_reviews_for_book(book, max_reviews, backend=backend, incremental=incremental)
+            except Exception as e:
+                traceback.print_exc()
+                error = str(e)
+            finally:
+                keeper.stop()
+                release_book_lease(book.pk, owner, scraped=not error, retry_after=lease_duration)
+            report({
+                'worker': owner,
+                'book_id': book.pk,
+                'title': book.title,
+                'reviews': reviews,
+                'seconds': time.perf_counter() - started,
+                'error': error,
+            })
+    finally:
+        connection.close()
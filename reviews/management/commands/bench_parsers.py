@@ -0,0 +1,51 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from reviews.extractors import extract_search_results, extract_book_metadata, extract_review_cards
+from reviews.parsing import available_backends
+
+EXTRACTORS = {
+    'search': extract_search_results,
+    'book': extract_book_metadata,
+    'reviews': extract_review_cards,
+}
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks the HTML parser backends against saved Goodreads pages.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('pages', nargs='+', type=str,
+                            help='Saved pages to parse, each given as KIND:PATH where KIND is search, book or reviews.')
+        parser.add_argument('--repeat', type=int, default=20,
+                            help='Number of timed runs per backend and page. Default is 20.')
+
+    def handle(self, *args, **options):
+        pages = []
+        for spec in options['pages']:
+            kind, _, path = spec.partition(':')
+            if kind not in EXTRACTORS or not path:
+                raise CommandError(f'Expected KIND:PATH with KIND in {", ".join(EXTRACTORS)}, got "{spec}"')
+            try:
+                with open(path, encoding='utf-8') as f:
+                    pages.append((kind, path, f.read()))
+            except OSError as e:
+                raise CommandError(f'Could not read {path}: {e}')
+
+        backends = available_backends()
+        self.stdout.write(f'Backends: {", ".join(backends)}; {options["repeat"]} runs each.')
+        for kind, path, html in pages:
+            extractor = EXTRACTORS[kind]
+            self.stdout.write(f'\n{kind} page {path} ({len(html) / 1024:.0f} KB)')
+            baseline = None
+            for backend in backends:
+                result = extractor(html, backend)  # warm-up, also used to check backends agree
+                started = time.perf_counter()
+                for _ in range(options['repeat']):
+                    extractor(html, backend)
+                ms = (time.perf_counter() - started) * 1000 / options['repeat']
+                if baseline is None:
+                    baseline = result
+                agrees = 'same output' if result == baseline else 'OUTPUT DIFFERS'
+                self.stdout.write(f'  {backend:<12} {ms:9.2f} ms/page  ({agrees})')
@@ -0,0 +1,112 @@
+import gc
+import random
+import sys
+import tracemalloc
+from datetime import datetime
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+
+from reviews.models import Book
+from reviews.review_batch import ReviewBatch, dedup_key
+from reviews.utils import review_fingerprint
+
+WORDS = ('story', 'character', 'plot', 'writing', 'ending', 'great', 'slow', 'loved', 'chapter', 'world',
+         'author', 'series', 'boring', 'beautiful', 'twist', 'pages', 'dialogue', 'recommend', 'the', 'and')
+
+
+def _raw_reviews(count, text_length):
+    """(text, date ordinal, reviewer, rating, fingerprint digest) tuples, generated reproducibly."""
+    rng = random.Random(42)
+    start = datetime(2015, 1, 1).toordinal()
+    reviewers = [f'Reader {i}' for i in range(max(1, count // 3))]
+    rows = []
+    for _ in range(count):
+        words = []
+        length = 0
+        while length < text_length:
+            words.append(rng.choice(WORDS))
+            length += len(words[-1]) + 1
+        text = ' '.join(words)
+        ordinal = start + rng.randrange(3650)
+        reviewer = rng.choice(reviewers)
+        rating = rng.randint(1, 5) if rng.random() > 0.1 else None
+        digest = bytes.fromhex(review_fingerprint('goodreads', reviewer, datetime.fromordinal(ordinal), text))
+        rows.append((text, ordinal, reviewer, rating, digest))
+    return rows
+
+
+def _scraped(rows):
+    """
+    Yields review dicts the way the extractors produce them: a fresh datetime, Decimal,
+    reviewer string and hex fingerprint per review. Texts are shared with rows, so they are
+    left out of every measurement and reported once.
+    """
+    for text, ordinal, reviewer, rating, digest in rows:
+        yield {
+            'review_text': text,
+            'review_date': datetime.fromordinal(ordinal),
+            'reviewer_name': (reviewer + ' ')[:-1],
+            'rating': None if rating is None else Decimal(rating),
+            'fingerprint': digest.hex(),
+        }
+
+
+def _measure(build):
+    """Bytes still allocated once build() returns, with its result kept alive."""
+    gc.collect()
+    tracemalloc.start()
+    kept = build()
+    gc.collect()
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return allocated
+
+
+class Command(BaseCommand):
+    help = 'Measures memory per scraped review: review dicts and Review instances versus a compact ReviewBatch.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=100000,
+                            help='Number of synthetic reviews to hold in memory. Default is 100000.')
+        parser.add_argument('--text-length', type=int, default=600,
+                            help='Approximate review text length in characters. Default is 600.')
+
+    def handle(self, *args, **options):
+        count = max(1, options['count'])
+        rows = _raw_reviews(count, options['text_length'])
+        text_bytes = sum(sys.getsizeof(row[0]) for row in rows)
+        book = Book(pk=1, title='Benchmark')
+
+        def as_dicts():
+            # The old pipeline: every dict kept until the save, plus a set of hex fingerprints
+            reviews = list(_scraped(rows))
+            return reviews, {review['fingerprint'] for review in reviews}
+
+        def as_model_rows():
+            return ReviewBatch.from_dicts(_scraped(rows)).to_reviews(book, range(count))
+
+        def as_batch():
+            batch = ReviewBatch()
+            seen = set()
+            for review in _scraped(rows):
+                fingerprint = batch.append(review['review_text'], review['reviewer_name'], review['rating'],
+                                           review['review_date'], review['fingerprint'])
+                seen.add(dedup_key(fingerprint))
+            return batch, seen
+
+        results = [
+            ('review dicts + fingerprint set', _measure(as_dicts)),
+            ('Review model instances', _measure(as_model_rows)),
+            ('ReviewBatch + dedup key set', _measure(as_batch)),
+        ]
+
+        self.stdout.write(f'{count} reviews of ~{options["text_length"]} characters; '
+                          f'the review text itself is {text_bytes / count:.0f} bytes/review in every layout.')
+        baseline = results[0][1]
+        for label, overhead in results:
+            self.stdout.write(
+                f'  {label:<32} {overhead / count:6.0f} bytes/review overhead, '
+                f'{(overhead + text_bytes) / count:6.0f} with text  ({overhead / baseline:.2f}x)'
+            )
@@ -0,0 +1,96 @@
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+
+# Modules that should only be loaded once a scrape or sentiment run actually needs them
+HEAVY_MODULES = ('selenium', 'nltk', 'textblob', 'bs4', 'lxml', 'selectolax')
+
+# Runs in a fresh interpreter: times Django setup, URLconf/view import, the first and second
+# request, and reports peak RSS and which heavy modules got imported along the way.
+PROBE = '''
+import json, os, resource, sys, time
+started = time.perf_counter()
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "book_reviews_project.settings")
+import django
+django.setup()
+setup_done = time.perf_counter()
+from django.urls import get_resolver
+get_resolver().url_patterns
+urls_done = time.perf_counter()
+from django.test import Client
+client = Client()
+request_started = time.perf_counter()
+status = client.get(sys.argv[1], HTTP_HOST="localhost").status_code
+first_done = time.perf_counter()
+client.get(sys.argv[1], HTTP_HOST="localhost")
+second_done = time.perf_counter()
+print(json.dumps({
+    "setup": setup_done - started,
+    "urls": urls_done - setup_done,
+    "first_request": first_done - request_started,
+    "second_request": second_done - first_done,
+    "status": status,
+    "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "heavy": sorted(m for m in %r if m in sys.modules),
+}))
+''' % (HEAVY_MODULES,)
+
+
+class Command(BaseCommand):
+    help = 'Measures cold-start cost: `manage.py check` wall time and RSS, and first-request latency in a fresh process.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=5,
+                            help='Number of fresh processes to measure; medians are reported. Default is 5.')
+        parser.add_argument('--path', default=None,
+                            help='URL to request for the first-request measurement. Defaults to the book list.')
+
+    def handle(self, *args, **options):
+        repeat = max(1, options['repeat'])
+        options['path'] = options['path'] or reverse('reviews:book_list')
+        base_dir = str(settings.BASE_DIR)
+        manage_py = os.path.join(base_dir, 'manage.py')
+
+        check_seconds = []
+        check_rss = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            result = subprocess.run([sys.executable, manage_py, 'check'], cwd=base_dir, capture_output=True, text=True)
+            check_seconds.append(time.perf_counter() - started)
+            if result.returncode != 0:
+                raise CommandError(f'manage.py check failed:\n{result.stderr}')
+            # ru_maxrss of children is the largest finished child so far; all runs are the same command
+            check_rss.append(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024)
+
+        probes = []
+        for _ in range(repeat):
+            result = subprocess.run([sys.executable, '-c', PROBE, options['path']], cwd=base_dir, capture_output=True, text=True)
+            if result.returncode != 0:
+                raise CommandError(f'Startup probe failed:\n{result.stderr}')
+            probes.append(json.loads(result.stdout.strip().splitlines()[-1]))
+
+        def median_ms(values):
+            return f'{statistics.median(values) * 1000:8.1f} ms'
+
+        self.stdout.write(f'Median of {repeat} fresh processes:')
+        self.stdout.write(f'  manage.py check        {median_ms(check_seconds)}  (peak RSS {max(check_rss):.0f} MB)')
+        self.stdout.write(f'  django.setup()         {median_ms([p["setup"] for p in probes])}')
+        self.stdout.write(f'  URLconf + views import {median_ms([p["urls"] for p in probes])}')
+        self.stdout.write(f'  first request {options["path"]:<8} {median_ms([p["first_request"] for p in probes])}  '
+                          f'(HTTP {probes[0]["status"]})')
+        self.stdout.write(f'  second request         {median_ms([p["second_request"] for p in probes])}')
+        self.stdout.write(f'  peak RSS after request {statistics.median(p["rss_mb"] for p in probes):8.0f} MB')
+
+        heavy = sorted({module for p in probes for module in p['heavy']})
+        if heavy:
+            self.stdout.write(self.style.WARNING(f'Heavy modules loaded while serving {options["path"]}: {", ".join(heavy)}'))
+        else:
+            self.stdout.write(self.style.SUCCESS('No scraping/NLP modules loaded at startup or while serving the page.'))
@@ -0,0 +1,56 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from reviews.book_merge import find_duplicate_groups, merge_groups
+from reviews.models import Book
+
+
+class Command(BaseCommand):
+    help = 'Merges books sharing a normalized title and author, moving their reviews onto one surviving book.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Report what would be merged without changing anything.')
+        parser.add_argument('--chunk-size', type=int, default=200,
+                            help='Duplicate groups merged per transaction. Default is 200.')
+        parser.add_argument('--list', action='store_true',
+                            help='Print every duplicate group, not just the totals.')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        groups = find_duplicate_groups()
+        if not groups:
+            self.stdout.write(self.style.SUCCESS('No duplicate books found.'))
+            return
+
+        verb = 'Would merge' if options['dry_run'] else 'Merging'
+        self.stdout.write(f'{verb} {len(groups)} duplicate groups '
+                          f'({sum(len(losers) for losers in groups.values())} duplicate books).')
+
+        titles = {}
+        if options['list']:
+            titles = dict(Book.objects.filter(pk__in=list(groups)).values_list('pk', 'title'))
+
+        survivors = list(groups)
+        chunk_size = max(1, options['chunk_size'])
+        totals = {'books_deleted': 0, 'reviews_moved': 0, 'reviews_dropped': 0}
+        for start in range(0, len(survivors), chunk_size):
+            chunk = {survivor_id: groups[survivor_id] for survivor_id in survivors[start:start + chunk_size]}
+            report = merge_groups(chunk, dry_run=options['dry_run'])
+            for key in totals:
+                totals[key] += report[key]
+            if options['list']:
+                for group in report['groups']:
+                    filled = f', fills {", ".join(group["fields_filled"])}' if group['fields_filled'] else ''
+                    self.stdout.write(
+                        f'  "{titles.get(group["survivor"], "?")}" (book {group["survivor"]}) <- books '
+                        f'{", ".join(map(str, group["duplicates"]))}: {group["reviews_moved"]} reviews moved{filled}'
+                    )
+
+        summary = (f'{totals["books_deleted"]} books merged away, {totals["reviews_moved"]} reviews moved, '
+                   f'{totals["reviews_dropped"]} duplicate reviews dropped in {time.perf_counter() - started:.1f}s.')
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING(f'Dry run: {summary}'))
+        else:
+            self.stdout.write(self.style.SUCCESS(summary))
@@ -0,0 +1,37 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from reviews import rate_limit
+
+
+class Command(BaseCommand):
+    help = 'Shows the learned per-host request rates and circuit breaker state, or resets them.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true',
+                            help='Forget the learned rate and failures (of --host, or of every host).')
+        parser.add_argument('--host', default=None,
+                            help='Limit --reset to this host, e.g. www.goodreads.com.')
+
+    def handle(self, *args, **options):
+        if options['reset']:
+            rate_limit.reset(options['host'])
+            self.stdout.write(self.style.SUCCESS(f'Reset rate limiter state for {options["host"] or "all hosts"}.'))
+            return
+
+        states = rate_limit.host_states()
+        if not states:
+            self.stdout.write('No hosts have been contacted yet.')
+            return
+        now = time.time()
+        for state in states:
+            if state['failures'] >= rate_limit.circuit_failures():
+                circuit = f'open for {max(0, state["circuit_until"] - now):.0f}s' if now < state['circuit_until'] else 'half-open'
+            else:
+                circuit = 'closed'
+            paused = f', paused for {state["blocked_until"] - now:.0f}s' if now < state['blocked_until'] else ''
+            self.stdout.write(
+                f'{state["host"]}: {state["rate"]:.2f} req/s, {state["failures"]} consecutive failures, '
+                f'circuit {circuit}{paused}'
+            )
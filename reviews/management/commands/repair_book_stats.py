@@ -0,0 +1,20 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from reviews.stats import recompute_book_stats
+
+
+class Command(BaseCommand):
+    help = 'Recomputes the BookStats review aggregates from the Review table.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('book_ids', nargs='*', type=int,
+                            help='Books to repair. If not provided, stats for every book are rebuilt.')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        written = recompute_book_stats(options['book_ids'] or None)
+        self.stdout.write(self.style.SUCCESS(
+            f'Recomputed stats for {written} books in {time.perf_counter() - started:.1f}s.'
+        ))
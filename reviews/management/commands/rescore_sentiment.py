@@ -0,0 +1,64 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from reviews import sentiment
+from reviews.models import Review
+from reviews.stats import recompute_book_stats
+
+
+class Command(BaseCommand):
+    help = 'Recomputes sentiment for stored reviews in chunks, scoring uncached texts across a process pool.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--analyzer', choices=sorted(sentiment.ANALYZERS), default=None,
+                            help='Analyzer to score with. Defaults to settings.SENTIMENT_ANALYZER.')
+        parser.add_argument('--chunk-size', type=int, default=2000,
+                            help='Reviews read, scored and updated per batch. Default is 2000.')
+        parser.add_argument('--processes', type=int, default=None,
+                            help='Scoring processes. Defaults to settings.SENTIMENT_PROCESSES or the CPU count.')
+        parser.add_argument('--only-missing', action='store_true',
+                            help='Only score reviews that have no sentiment label yet.')
+        parser.add_argument('--book-id', type=int, default=None,
+                            help='Only rescore reviews of this book.')
+
+    def handle(self, *args, **options):
+        if options['processes']:
+            sentiment.configure_pool(options['processes'])
+        analyzer = options['analyzer'] or sentiment.default_analyzer()
+        chunk_size = max(1, options['chunk_size'])
+
+        reviews = Review.objects.all()
+        if options['only_missing']:
+            reviews = reviews.filter(sentiment_label__isnull=True)
+        if options['book_id']:
+            reviews = reviews.filter(book_id=options['book_id'])
+        total = reviews.count()
+        self.stdout.write(self.style.SUCCESS(
+            f'Rescoring {total} reviews with {sentiment.analyzer_key(analyzer)} '
+            f'({sentiment.pool_size()} processes, chunks of {chunk_size}).'
+        ))
+
+        started = time.perf_counter()
+        done = 0
+        last_id = 0
+        try:
+            while True:
+                # Keyset pagination on id, so each chunk is an index range scan however far in we are
+                chunk = list(reviews.filter(id__gt=last_id).order_by('id').only('id', 'review_text')[:chunk_size])
+                if not chunk:
+                    break
+                last_id = chunk[-1].id
+                sentiment.score_reviews(chunk, analyzer)
+                Review.objects.bulk_update(chunk, ['sentiment_score', 'sentiment_label'], batch_size=500)
+                done += len(chunk)
+                rate = done / max(time.perf_counter() - started, 1e-6)
+                self.stdout.write(f'  {done}/{total} reviews ({rate:.0f}/s)')
+        finally:
+            sentiment.shutdown_pool()
+
+        # Labels changed, so the per-book sentiment counts need rebuilding
+        recompute_book_stats([options['book_id']] if options['book_id'] else None)
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f'Rescored {done} reviews in {elapsed:.1f}s.'))
@@ -0,0 +1,33 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from reviews.jobs import run_worker
+
+
+class Command(BaseCommand):
+    help = 'Runs queued scrape jobs (created by the scrape form) until stopped.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=2,
+                            help='Number of jobs to run at the same time. Default is 2.')
+        parser.add_argument('--once', action='store_true',
+                            help='Exit once the queue is empty instead of polling for new jobs.')
+        parser.add_argument('--poll-interval', type=float, default=2.0,
+                            help='Seconds to wait between polls of an empty queue. Default is 2.')
+        parser.add_argument('--stale-minutes', type=int, default=60,
+                            help='Requeue running jobs with no progress for this many minutes. Default is 60.')
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.SUCCESS(f'Starting scrape worker with concurrency {options["concurrency"]}.'))
+        try:
+            run_worker(
+                concurrency=options['concurrency'],
+                once=options['once'],
+                poll_interval=options['poll_interval'],
+                stale_after=timedelta(minutes=options['stale_minutes']),
+            )
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.WARNING('Scrape worker stopped.'))
+            return
+        self.stdout.write(self.style.SUCCESS('Scrape queue is empty; worker exiting.'))
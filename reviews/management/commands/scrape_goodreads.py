@@ -1,43 +1,134 @@
+import multiprocessing
+import queue
+import time
+from datetime import timedelta
+
 from django.core.management.base import BaseCommand, CommandError
-from reviews.scraper import scrape_goodreads_book_reviews
-from reviews.models import Book # Import the Book model if you want to scrape all existing books
+from django.utils import timezone
+
+from reviews.jobs import default_worker_id, run_bulk_worker, scrape_reviews_for_book
+from reviews.models import Book
+from reviews.scraper import REVIEW_BACKENDS, get_goodreads_book_metadata, create_or_update_book_record
+from reviews.worker_process import bulk_scrape_process
+
 
 class Command(BaseCommand):
-    help = 'Scrapes reviews for a given Goodreads book ID or for all existing books.'
+    help = 'Scrapes reviews for a given Goodreads book ID, or rescrapes all existing books in parallel.'
 
     def add_arguments(self, parser):
-        # Optional: Allow passing a specific goodreads_id as an argument
         parser.add_argument('goodreads_id', nargs='?', type=str,
                             help='The Goodreads book ID to scrape. If not provided, all existing books will be updated.')
-        parser.add_argument('--max-pages', type=int, default=10,
-                            help='Maximum number of review pages to scrape per book. Default is 10.')
+        parser.add_argument('--workers', type=int, default=1,
+                            help='Number of worker processes for a bulk rescrape. Default is 1.')
+        parser.add_argument('--max-reviews', type=int, default=50,
+                            help='Maximum number of reviews to scrape per book (-1 for all). Default is 50.')
+        parser.add_argument('--only-stale', action='store_true',
+                            help='Only rescrape books not scraped within --stale-hours.')
+        parser.add_argument('--stale-hours', type=float, default=24,
+                            help='Age after which a book counts as stale for --only-stale. Default is 24.')
+        parser.add_argument('--lease-minutes', type=float, default=30,
+                            help='How long a worker holds a book before another worker may take it over. Default is 30.')
+        parser.add_argument('--incremental', action='store_true',
+                            help='Stop paginating each book once a batch contains only reviews already stored.')
+        parser.add_argument('--backend', choices=REVIEW_BACKENDS, default=None,
+                            help='Reviews backend to use. Defaults to settings.GOODREADS_REVIEWS_BACKEND.')
 
     def handle(self, *args, **options):
-        goodreads_id = options['goodreads_id']
-        max_pages = options['max_pages']
-
-        if goodreads_id:
-            self.stdout.write(self.style.SUCCESS(f'Initiating scrape for Goodreads ID: {goodreads_id}'))
-            try:
-                scrape_goodreads_book_reviews(goodreads_id, max_pages=max_pages)
-                self.stdout.write(self.style.SUCCESS(f'Successfully scraped reviews for Goodreads ID: {goodreads_id}'))
-            except Exception as e:
-                self.stderr.write(self.style.ERROR(f'Error scraping Goodreads ID {goodreads_id}: {e}'))
-                raise CommandError(f'Scraping failed for Goodreads ID {goodreads_id}')
+        if options['goodreads_id']:
+            self._scrape_one(options['goodreads_id'], options)
+        else:
+            self._scrape_all(options)
+
+    def _scrape_one(self, goodreads_id, options):
+        self.stdout.write(self.style.SUCCESS(f'Initiating scrape for Goodreads ID: {goodreads_id}'))
+        try:
+            book = Book.objects.filter(goodreads_id=goodreads_id).first()
+            if book is None:
+                book_metadata = get_goodreads_book_metadata(goodreads_id)
+                if not book_metadata or not book_metadata.get('title'):
+                    raise CommandError(f'Could not scrape metadata for Goodreads ID {goodreads_id}')
+                book = create_or_update_book_record(book_metadata, 'goodreads')
+            count = scrape_reviews_for_book(book, options['max_reviews'], backend=options['backend'],
+                                            incremental=options['incremental'])
+            Book.objects.filter(pk=book.pk).update(last_scraped_at=timezone.now())
+            self.stdout.write(self.style.SUCCESS(f'Successfully scraped {count} reviews for Goodreads ID: {goodreads_id}'))
+        except CommandError:
+            raise
+        except Exception as e:
+            self.stderr.write(self.style.ERROR(f'Error scraping Goodreads ID {goodreads_id}: {e}'))
+            raise CommandError(f'Scraping failed for Goodreads ID {goodreads_id}')
+
+    def _scrape_all(self, options):
+        # A book is due if it hasn't been scraped since this run started (or within --stale-hours)
+        stale_before = timezone.now()
+        if options['only_stale']:
+            stale_before -= timedelta(hours=options['stale_hours'])
+        lease_duration = timedelta(minutes=options['lease_minutes'])
+        workers = max(1, options['workers'])
+
+        if not Book.objects.filter(goodreads_id__isnull=False).exists():
+            self.stdout.write(self.style.WARNING('No books found in the database to scrape.'))
+            return
+
+        self.stdout.write(self.style.SUCCESS(f'Initiating rescrape of existing books with {workers} worker(s).'))
+        self.started = time.perf_counter()
+        self.books_done = 0
+        self.reviews_done = 0
+        self.failures = 0
+
+        base_owner = default_worker_id()
+        if workers == 1:
+            run_bulk_worker(base_owner, stale_before, options['max_reviews'], options['backend'], lease_duration,
+                            report=self._report, incremental=options['incremental'])
         else:
-            self.stdout.write(self.style.SUCCESS('Initiating scrape for all existing books in the database.'))
-            books = Book.objects.all()
-            if not books.exists():
-                self.stdout.write(self.style.WARNING('No books found in the database to scrape.'))
-                return
-
-            for book in books:
-                self.stdout.write(self.style.SUCCESS(f'Scraping reviews for book "{book.title}" (ID: {book.goodreads_id})...'))
+            ctx = multiprocessing.get_context('spawn')
+            events = ctx.Queue()
+            processes = [
+                ctx.Process(
+                    target=bulk_scrape_process,
+                    args=(f'{base_owner}/{i}', stale_before, options['max_reviews'], options['backend'], lease_duration,
+                          events, options['incremental']),
+                )
+                for i in range(workers)
+            ]
+            for process in processes:
+                process.start()
+
+            running = workers
+            while running:
                 try:
-                    # Pass the goodreads_id from the book object
-                    scrape_goodreads_book_reviews(book.goodreads_id, max_pages=max_pages)
-                    self.stdout.write(self.style.SUCCESS(f'Successfully updated reviews for "{book.title}"'))
-                except Exception as e:
-                    self.stderr.write(self.style.ERROR(f'Error updating reviews for "{book.title}" (ID: {book.goodreads_id}): {e}'))
-                    # Continue to the next book even if one fails
-            self.stdout.write(self.style.SUCCESS('Finished scraping for all existing books.'))
\ No newline at end of file
+                    event = events.get(timeout=5)
+                except queue.Empty:
+                    if not any(process.is_alive() for process in processes):
+                        break
+                    continue
+                if event.get('done'):
+                    running -= 1
+                else:
+                    self._report(event)
+            for process in processes:
+                process.join()
+
+        elapsed = time.perf_counter() - self.started
+        self.stdout.write(self.style.SUCCESS(
+            f'Finished rescrape: {self.books_done} books ({self.failures} failed), {self.reviews_done} reviews '
+            f'in {elapsed:.0f}s — {self._rates()}.'
+        ))
+
+    def _rates(self):
+        minutes = max(time.perf_counter() - self.started, 1e-6) / 60
+        return f'{self.books_done / minutes:.1f} books/min, {self.reviews_done / minutes:.0f} reviews/min'
+
+    def _report(self, event):
+        self.books_done += 1
+        self.reviews_done += event['reviews']
+        if event['error']:
+            self.failures += 1
+            self.stderr.write(self.style.ERROR(
+                f'Error updating reviews for "{event["title"]}" (book {event["book_id"]}): {event["error"]}'
+            ))
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f'[{event["worker"]}] "{event["title"]}": {event["reviews"]} reviews in {event["seconds"]:.1f}s '
+                f'({self._rates()})'
+            ))
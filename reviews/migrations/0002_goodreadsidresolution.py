@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GoodreadsIdResolution',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('normalized_title', models.CharField(max_length=255)),
+                ('normalized_author', models.CharField(blank=True, default='', max_length=255)),
+                ('goodreads_id', models.CharField(blank=True, max_length=255, null=True)),
+                ('match_score', models.IntegerField(default=0)),
+                ('resolved_at', models.DateTimeField()),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('normalized_title', 'normalized_author'), name='unique_resolution_key')],
+            },
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:43
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0002_goodreadsidresolution'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScrapeJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=255)),
+                ('author', models.CharField(blank=True, default='', max_length=255)),
+                ('max_reviews', models.IntegerField(default=25)),
+                ('backend', models.CharField(blank=True, max_length=20, null=True)),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], db_index=True, default='queued', max_length=20)),
+                ('phase', models.CharField(blank=True, default='', max_length=50)),
+                ('reviews_scraped', models.IntegerField(default=0)),
+                ('timings', models.JSONField(blank=True, default=dict)),
+                ('error', models.TextField(blank=True, default='')),
+                ('worker', models.CharField(blank=True, default='', max_length=100)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('book', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='scrape_jobs', to='reviews.book')),
+            ],
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0003_scrapejob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='book',
+            name='last_scraped_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='book',
+            name='scrape_lease_expires_at',
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='book',
+            name='scrape_lease_owner',
+            field=models.CharField(blank=True, default='', max_length=100),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:51
+
+from django.db import migrations, models
+
+
+def mark_goodreads_reviews(apps, schema_editor):
+    # Every review stored so far was scraped from Goodreads; fingerprints include the source
+    Review = apps.get_model("reviews", "Review")
+    Review.objects.filter(source_website__isnull=True).update(source_website="goodreads")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0004_book_scrape_lease'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='book',
+            name='latest_review_date',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='book',
+            name='recent_review_fingerprints',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.AddField(
+            model_name='scrapejob',
+            name='incremental',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.RunPython(mark_goodreads_reviews, migrations.RunPython.noop),
+    ]
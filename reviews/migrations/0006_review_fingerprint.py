@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:51
+
+from django.db import migrations, models
+
+from reviews.utils import review_fingerprint
+
+
+def backfill_fingerprints(apps, schema_editor):
+    # Fingerprint existing rows, then drop duplicates (keeping the oldest row) so the
+    # (book, fingerprint) constraint can be added
+    Review = apps.get_model("reviews", "Review")
+    seen = set()
+    duplicate_ids = []
+    batch = []
+    rows = Review.objects.order_by("id").only("id", "book_id", "source_website", "reviewer_name", "review_date", "review_text")
+    for review in rows.iterator(chunk_size=2000):
+        review.fingerprint = review_fingerprint(
+            review.source_website or "goodreads", review.reviewer_name, review.review_date, review.review_text
+        )
+        key = (review.book_id, review.fingerprint)
+        if key in seen:
+            duplicate_ids.append(review.id)
+            continue
+        seen.add(key)
+        batch.append(review)
+        if len(batch) >= 500:
+            Review.objects.bulk_update(batch, ["fingerprint"])
+            batch = []
+    if batch:
+        Review.objects.bulk_update(batch, ["fingerprint"])
+    for start in range(0, len(duplicate_ids), 500):
+        Review.objects.filter(id__in=duplicate_ids[start:start + 500]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0005_review_watermark'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='review',
+            name='fingerprint',
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+        migrations.RunPython(backfill_fingerprints, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='review',
+            constraint=models.UniqueConstraint(fields=('book', 'fingerprint'), name='unique_review_fingerprint_per_book'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0006_review_fingerprint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SentimentScore',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('text_hash', models.CharField(max_length=64)),
+                ('analyzer', models.CharField(max_length=50)),
+                ('score', models.FloatField()),
+                ('label', models.CharField(max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('analyzer', 'text_hash'), name='unique_sentiment_per_text')],
+            },
+        ),
+    ]
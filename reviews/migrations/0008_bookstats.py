@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:56
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0007_sentimentscore'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BookStats',
+            fields=[
+                ('book', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='reviews.book')),
+                ('review_count', models.IntegerField(default=0)),
+                ('positive_count', models.IntegerField(default=0)),
+                ('neutral_count', models.IntegerField(default=0)),
+                ('negative_count', models.IntegerField(default=0)),
+                ('rating_1_count', models.IntegerField(default=0)),
+                ('rating_2_count', models.IntegerField(default=0)),
+                ('rating_3_count', models.IntegerField(default=0)),
+                ('rating_4_count', models.IntegerField(default=0)),
+                ('rating_5_count', models.IntegerField(default=0)),
+                ('rating_count', models.IntegerField(default=0)),
+                ('rating_sum', models.FloatField(default=0)),
+                ('latest_review_date', models.DateField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0008_bookstats'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['book', '-review_date', '-id'], name='review_book_date_id_idx'),
+        ),
+    ]
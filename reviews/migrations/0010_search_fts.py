@@ -0,0 +1,99 @@
+from django.db import migrations
+
+# External-content FTS5 indexes over review text and book metadata, kept in sync by triggers so
+# every write path (ORM saves, bulk_create, raw SQL) updates them. SQLite only; see reviews.search.
+FTS_SQL = [
+    """
+    CREATE VIRTUAL TABLE reviews_review_fts USING fts5(
+        review_text, reviewer_name,
+        content='reviews_review', content_rowid='id',
+        tokenize='porter unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER reviews_review_fts_insert AFTER INSERT ON reviews_review BEGIN
+        INSERT INTO reviews_review_fts(rowid, review_text, reviewer_name)
+        VALUES (new.id, new.review_text, new.reviewer_name);
+    END
+    """,
+    """
+    CREATE TRIGGER reviews_review_fts_delete AFTER DELETE ON reviews_review BEGIN
+        INSERT INTO reviews_review_fts(reviews_review_fts, rowid, review_text, reviewer_name)
+        VALUES ('delete', old.id, old.review_text, old.reviewer_name);
+    END
+    """,
+    """
+    CREATE TRIGGER reviews_review_fts_update AFTER UPDATE OF review_text, reviewer_name ON reviews_review BEGIN
+        INSERT INTO reviews_review_fts(reviews_review_fts, rowid, review_text, reviewer_name)
+        VALUES ('delete', old.id, old.review_text, old.reviewer_name);
+        INSERT INTO reviews_review_fts(rowid, review_text, reviewer_name)
+        VALUES (new.id, new.review_text, new.reviewer_name);
+    END
+    """,
+    """
+    CREATE VIRTUAL TABLE reviews_book_fts USING fts5(
+        title, author, description,
+        content='reviews_book', content_rowid='id',
+        tokenize='porter unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER reviews_book_fts_insert AFTER INSERT ON reviews_book BEGIN
+        INSERT INTO reviews_book_fts(rowid, title, author, description)
+        VALUES (new.id, new.title, new.author, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER reviews_book_fts_delete AFTER DELETE ON reviews_book BEGIN
+        INSERT INTO reviews_book_fts(reviews_book_fts, rowid, title, author, description)
+        VALUES ('delete', old.id, old.title, old.author, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER reviews_book_fts_update AFTER UPDATE OF title, author, description ON reviews_book BEGIN
+        INSERT INTO reviews_book_fts(reviews_book_fts, rowid, title, author, description)
+        VALUES ('delete', old.id, old.title, old.author, old.description);
+        INSERT INTO reviews_book_fts(rowid, title, author, description)
+        VALUES (new.id, new.title, new.author, new.description);
+    END
+    """,
+    # Index the rows that already exist
+    "INSERT INTO reviews_review_fts(reviews_review_fts) VALUES ('rebuild')",
+    "INSERT INTO reviews_book_fts(reviews_book_fts) VALUES ('rebuild')",
+]
+
+DROP_SQL = [
+    "DROP TRIGGER IF EXISTS reviews_review_fts_insert",
+    "DROP TRIGGER IF EXISTS reviews_review_fts_delete",
+    "DROP TRIGGER IF EXISTS reviews_review_fts_update",
+    "DROP TABLE IF EXISTS reviews_review_fts",
+    "DROP TRIGGER IF EXISTS reviews_book_fts_insert",
+    "DROP TRIGGER IF EXISTS reviews_book_fts_delete",
+    "DROP TRIGGER IF EXISTS reviews_book_fts_update",
+    "DROP TABLE IF EXISTS reviews_book_fts",
+]
+
+
+def create_fts(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for statement in FTS_SQL:
+        schema_editor.execute(statement)
+
+
+def drop_fts(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for statement in DROP_SQL:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0009_review_keyset_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts, drop_fts),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-17 21:05
+
+from django.db import migrations
+
+from reviews.utils import normalize_title, normalize_author
+
+
+def backfill_normalized_keys(apps, schema_editor):
+    # Book.save() fills these from now on; existing rows were created with them empty
+    Book = apps.get_model("reviews", "Book")
+    batch = []
+    for book in Book.objects.only("id", "title", "author").iterator(chunk_size=2000):
+        book.normalized_title = normalize_title(book.title or "")
+        book.normalized_author = normalize_author(book.author)
+        batch.append(book)
+        if len(batch) >= 500:
+            Book.objects.bulk_update(batch, ["normalized_title", "normalized_author"])
+            batch = []
+    if batch:
+        Book.objects.bulk_update(batch, ["normalized_title", "normalized_author"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0010_search_fts'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_normalized_keys, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:03
+
+from django.db import migrations, models
+
+# Duplicate groups merged per transaction
+MERGE_CHUNK_SIZE = 200
+
+
+def merge_duplicate_books(apps, schema_editor):
+    # Books sharing a normalized key are merged (reviews moved onto one survivor) so the key
+    # can become unique; this runs on the historical models, as the tables looked before 0012
+    from reviews.book_merge import find_duplicate_groups, merge_groups
+
+    groups = find_duplicate_groups(apps)
+    survivors = list(groups)
+    for start in range(0, len(survivors), MERGE_CHUNK_SIZE):
+        chunk = {survivor_id: groups[survivor_id] for survivor_id in survivors[start:start + MERGE_CHUNK_SIZE]}
+        merge_groups(chunk, apps=apps)
+    if groups:
+        print(f"\n  Merged {sum(len(losers) for losers in groups.values())} duplicate books into {len(groups)}.")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0011_backfill_book_normalized_keys'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_books, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(fields=['normalized_title', 'normalized_author'], name='book_normalized_key_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='book',
+            constraint=models.UniqueConstraint(condition=models.Q(('normalized_title', ''), _negated=True), fields=('normalized_title', 'normalized_author'), name='unique_book_normalized_key'),
+        ),
+    ]
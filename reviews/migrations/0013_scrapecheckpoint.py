@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:09
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0012_book_normalized_key_unique'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScrapeCheckpoint',
+            fields=[
+                ('book', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='scrape_checkpoint', serialize=False, to='reviews.book')),
+                ('backend', models.CharField(max_length=20)),
+                ('batches_done', models.IntegerField(default=0)),
+                ('reviews_scraped', models.IntegerField(default=0)),
+                ('page_token', models.TextField(blank=True, default='')),
+                ('work_id', models.CharField(blank=True, default='', max_length=255)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0013_scrapecheckpoint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExportCursor',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('last_review_id', models.BigIntegerField(default=0)),
+                ('rows_exported', models.IntegerField(default=0)),
+                ('exported_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -1,5 +1,7 @@
 from django.db import models
-from django.db.models import Avg
+from django.db.models import Avg, Q
+
+from .utils import normalize_title, normalize_author
 
 class Book(models.Model):
     title = models.CharField(max_length=255)
@@ -17,6 +19,36 @@ class Book(models.Model):
     google_books_id = models.CharField(max_length=255, unique=True, blank=True, null=True)
     info_link = models.URLField(max_length=2000, blank=True, null=True)
     isbn = models.CharField(max_length=255, blank=True, null=True)
+    last_scraped_at = models.DateTimeField(blank=True, null=True)
+    # Lease held by a bulk scrape worker while it processes this book (see jobs.claim_book_for_scrape)
+    scrape_lease_owner = models.CharField(max_length=100, blank=True, default='')
+    scrape_lease_expires_at = models.DateTimeField(blank=True, null=True, db_index=True)
+    # Watermark for incremental re-scrapes: newest stored review date and the fingerprints
+    # of the most recent stored reviews (maintained by store_review_batch)
+    latest_review_date = models.DateField(blank=True, null=True)
+    recent_review_fingerprints = models.JSONField(default=list, blank=True)
+
+    class Meta:
+        constraints = [
+            # One row per canonical title/author; create_or_update_book_record upserts on this key
+            models.UniqueConstraint(
+                fields=['normalized_title', 'normalized_author'], condition=~Q(normalized_title=''),
+                name='unique_book_normalized_key',
+            ),
+        ]
+        indexes = [
+            # Serves the equality lookup itself (SQLite won't pick the partial unique index for it)
+            models.Index(fields=['normalized_title', 'normalized_author'], name='book_normalized_key_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        # Canonical lookup keys are derived from title/author on every save
+        self.normalized_title = normalize_title(self.title or '')
+        self.normalized_author = normalize_author(self.author)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'title', 'author'} & set(update_fields):
+            kwargs['update_fields'] = set(update_fields) | {'normalized_title', 'normalized_author'}
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.title} by {self.author}"
@@ -35,8 +67,167 @@ class Review(models.Model):
     review_date = models.DateField(null=True, blank=True)
     sentiment_score = models.DecimalField(max_digits=5, decimal_places=4, null=True, blank=True) # <-- Add this line
     sentiment_label = models.CharField(max_length=20, null=True, blank=True) # <-- Add this line
+    # utils.review_fingerprint of (source, reviewer, date, normalized text); unique per book
+    fingerprint = models.CharField(max_length=64, null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['book', 'fingerprint'], name='unique_review_fingerprint_per_book'),
+        ]
+        indexes = [
+            # Keyset pagination of a book's reviews, newest first (see views.review_page)
+            models.Index(fields=['book', '-review_date', '-id'], name='review_book_date_id_idx'),
+        ]
+
     def __str__(self):
         return f"Review for {self.book.title} by {self.reviewer_name or 'Anonymous'}"
+
+class BookStats(models.Model):
+    """
+    Review aggregates for a book, kept in step with ingest by reviews.stats and rebuilt
+    from scratch by the repair_book_stats command.
+    """
+    book = models.OneToOneField(Book, on_delete=models.CASCADE, primary_key=True, related_name='stats')
+    review_count = models.IntegerField(default=0)
+    positive_count = models.IntegerField(default=0)
+    neutral_count = models.IntegerField(default=0)
+    negative_count = models.IntegerField(default=0)
+    # Histogram of our stored ratings, rounded to whole stars
+    rating_1_count = models.IntegerField(default=0)
+    rating_2_count = models.IntegerField(default=0)
+    rating_3_count = models.IntegerField(default=0)
+    rating_4_count = models.IntegerField(default=0)
+    rating_5_count = models.IntegerField(default=0)
+    rating_count = models.IntegerField(default=0)
+    rating_sum = models.FloatField(default=0)
+    latest_review_date = models.DateField(blank=True, null=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Stats for book {self.book_id}: {self.review_count} reviews"
+
+    @property
+    def mean_rating(self):
+        return self.rating_sum / self.rating_count if self.rating_count else None
+
+    @property
+    def rating_histogram(self):
+        """(stars, count, percent of rated reviews) from 5 stars down to 1."""
+        counts = [(stars, getattr(self, f'rating_{stars}_count')) for stars in range(5, 0, -1)]
+        return [(stars, count, count * 100 / self.rating_count if self.rating_count else 0) for stars, count in counts]
+
+    def sentiment_percentages(self):
+        total = self.review_count
+        if not total:
+            return {'total': 0, 'positive_percent': 0, 'neutral_percent': 0, 'negative_percent': 0}
+        return {
+            'total': total,
+            'positive_percent': self.positive_count * 100 / total,
+            'neutral_percent': self.neutral_count * 100 / total,
+            'negative_percent': self.negative_count * 100 / total,
+        }
+
+class GoodreadsIdResolution(models.Model):
+    """Cached result of resolving a normalized (title, author) pair to a Goodreads ID. A null ID records "no match"."""
+    normalized_title = models.CharField(max_length=255)
+    normalized_author = models.CharField(max_length=255, blank=True, default='')
+    goodreads_id = models.CharField(max_length=255, blank=True, null=True)
+    match_score = models.IntegerField(default=0)
+    resolved_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['normalized_title', 'normalized_author'], name='unique_resolution_key'),
+        ]
+
+    def __str__(self):
+        return f"{self.normalized_title} / {self.normalized_author} -> {self.goodreads_id or 'no match'}"
+
+class ScrapeJob(models.Model):
+    """A queued title/author scrape, claimed and run by the run_scrape_worker command."""
+    STATUS_QUEUED = 'queued'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, 'Queued'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_DONE, 'Done'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    title = models.CharField(max_length=255)
+    author = models.CharField(max_length=255, blank=True, default='')
+    max_reviews = models.IntegerField(default=25)
+    backend = models.CharField(max_length=20, blank=True, null=True)
+    incremental = models.BooleanField(default=False)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_QUEUED, db_index=True)
+    phase = models.CharField(max_length=50, blank=True, default='')
+    book = models.ForeignKey(Book, on_delete=models.SET_NULL, null=True, blank=True, related_name='scrape_jobs')
+    reviews_scraped = models.IntegerField(default=0)
+    timings = models.JSONField(default=dict, blank=True)  # phase name -> seconds
+    error = models.TextField(blank=True, default='')
+    worker = models.CharField(max_length=100, blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Scrape job {self.pk} for '{self.title}' ({self.status})"
+
+    @property
+    def is_finished(self):
+        return self.status in (self.STATUS_DONE, self.STATUS_FAILED)
+
+class ScrapeCheckpoint(models.Model):
+    """
+    How far an unfinished review scrape of a book got (see reviews.ingest). Advanced in the same
+    transaction as each stored batch and deleted once the scrape completes, so a crashed or timed
+    out scrape resumes after the last batch it saved.
+    """
+    book = models.OneToOneField(Book, on_delete=models.CASCADE, primary_key=True, related_name='scrape_checkpoint')
+    backend = models.CharField(max_length=20)
+    batches_done = models.IntegerField(default=0)
+    reviews_scraped = models.IntegerField(default=0)
+    # GraphQL position for the http backend; the Selenium backend replays batches_done "Show more" clicks
+    page_token = models.TextField(blank=True, default='')
+    work_id = models.CharField(max_length=255, blank=True, default='')
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Checkpoint for book {self.book_id}: {self.batches_done} batches via {self.backend}"
+
+    def as_state(self):
+        return {
+            'backend': self.backend, 'batches_done': self.batches_done, 'reviews_scraped': self.reviews_scraped,
+            'page_token': self.page_token, 'work_id': self.work_id,
+        }
+
+class SentimentScore(models.Model):
+    """Cached sentiment for a review text, keyed by the text's sha256 and the analyzer name/version (see reviews.sentiment)."""
+    text_hash = models.CharField(max_length=64)
+    analyzer = models.CharField(max_length=50)
+    score = models.FloatField()
+    label = models.CharField(max_length=20)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['analyzer', 'text_hash'], name='unique_sentiment_per_text'),
+        ]
+
+    def __str__(self):
+        return f"{self.analyzer} {self.text_hash[:12]}: {self.label} ({self.score})"
+
+class ExportCursor(models.Model):
+    """Highest review id handed out by a named incremental export (see reviews.export)."""
+    name = models.CharField(max_length=100, unique=True)
+    last_review_id = models.BigIntegerField(default=0)
+    rows_exported = models.IntegerField(default=0)
+    exported_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Export '{self.name}' up to review {self.last_review_id}"
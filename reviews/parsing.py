@@ -0,0 +1,154 @@
+# In reviews/parsing.py
+
+import importlib.util
+
+from django.conf import settings
+
+PARSER_BACKENDS = ('selectolax', 'lxml', 'html.parser')
+
+# Top-level package(s) each backend needs; the parsers themselves are imported on first parse
+BACKEND_PACKAGES = {
+    'selectolax': ('selectolax',),
+    'lxml': ('lxml', 'cssselect'),
+    'html.parser': ('bs4',),
+}
+
+
+class SoupNode:
+    """
+    Node wrapper for BeautifulSoup ('html.parser' backend). Every backend's node offers
+    css(), css_first(), text() (stripped parts joined, like get_text(strip=True)),
+    raw_text() and attr().
+    """
+    __slots__ = ('_el',)
+
+    def __init__(self, el):
+        self._el = el
+
+    def css(self, selector):
+        return [SoupNode(el) for el in self._el.select(selector)]
+
+    def css_first(self, selector):
+        el = self._el.select_one(selector)
+        return SoupNode(el) if el is not None else None
+
+    def text(self):
+        return self._el.get_text(strip=True)
+
+    def raw_text(self):
+        return self._el.get_text()
+
+    def attr(self, name, default=None):
+        value = self._el.get(name, default)
+        return ' '.join(value) if isinstance(value, list) else value
+
+
+_lxml_selectors = {}
+
+
+class LxmlNode:
+    """Node wrapper for lxml.html, with compiled CSS selectors cached per selector string."""
+    __slots__ = ('_el',)
+
+    def __init__(self, el):
+        self._el = el
+
+    @staticmethod
+    def _selector(selector):
+        compiled = _lxml_selectors.get(selector)
+        if compiled is None:
+            from lxml.cssselect import CSSSelector
+            compiled = _lxml_selectors[selector] = CSSSelector(selector)
+        return compiled
+
+    def css(self, selector):
+        return [LxmlNode(el) for el in self._selector(selector)(self._el)]
+
+    def css_first(self, selector):
+        matches = self._selector(selector)(self._el)
+        return LxmlNode(matches[0]) if matches else None
+
+    def text(self):
+        return ''.join(part.strip() for part in self._el.itertext())
+
+    def raw_text(self):
+        return self._el.text_content()
+
+    def attr(self, name, default=None):
+        return self._el.get(name, default)
+
+
+class SelectolaxNode:
+    """Node wrapper for selectolax's Lexbor parser."""
+    __slots__ = ('_el',)
+
+    def __init__(self, el):
+        self._el = el
+
+    def css(self, selector):
+        return [SelectolaxNode(el) for el in self._el.css(selector)]
+
+    def css_first(self, selector):
+        el = self._el.css_first(selector)
+        return SelectolaxNode(el) if el is not None else None
+
+    def text(self):
+        return self._el.text(deep=True, separator='', strip=True)
+
+    def raw_text(self):
+        return self._el.text(deep=True, separator='', strip=False)
+
+    def attr(self, name, default=None):
+        value = self._el.attributes.get(name)
+        return default if value is None else value
+
+
+_available = None
+
+
+def available_backends():
+    """Installed backends, fastest first. Checks for the packages without importing them."""
+    global _available
+    if _available is None:
+        _available = [
+            backend for backend in PARSER_BACKENDS
+            if all(importlib.util.find_spec(package) is not None for package in BACKEND_PACKAGES[backend])
+        ]
+    return _available
+
+
+def default_backend():
+    """settings.SCRAPER_HTML_PARSER if set, otherwise the fastest backend that is installed."""
+    return getattr(settings, 'SCRAPER_HTML_PARSER', None) or available_backends()[0]
+
+
+def parse_html(html, backend=None, only=None):
+    """
+    Parses html and returns the root node for the chosen backend.
+
+    `only` is a dict of SoupStrainer arguments (e.g. {'name': 'table', 'attrs': {'class': 'tableList'}})
+    naming the subtrees the caller needs. The 'html.parser' backend builds just those subtrees;
+    lxml and selectolax parse in C, where building the full tree is cheaper than filtering in Python,
+    so they ignore it. Callers query the returned node the same way in every case.
+    """
+    backend = backend or default_backend()
+    if backend not in PARSER_BACKENDS:
+        raise ValueError(f"Unknown HTML parser backend: {backend}")
+
+    if backend == 'selectolax':
+        try:
+            from selectolax.lexbor import LexborHTMLParser
+        except ImportError:
+            raise ImportError("The 'selectolax' parser backend requires the selectolax package.")
+        return SelectolaxNode(LexborHTMLParser(html).root)
+    if backend == 'lxml':
+        try:
+            from lxml import html as lxml_html
+            import lxml.cssselect  # noqa: F401 (needed by LxmlNode)
+        except ImportError:
+            raise ImportError("The 'lxml' parser backend requires the lxml and cssselect packages.")
+        return LxmlNode(lxml_html.document_fromstring(html))
+
+    from bs4 import BeautifulSoup, SoupStrainer
+    parse_only = SoupStrainer(**only) if only else None
+    return SoupNode(BeautifulSoup(html, 'html.parser', parse_only=parse_only))
@@ -0,0 +1,225 @@
+# In reviews/rate_limit.py
+#
+# Per-host request pacing shared by every thread and process that scrapes, kept in a small
+# SQLite file (settings.RATE_LIMIT_DB) separate from the app database. Each host has a token
+# bucket whose rate adapts AIMD-style: it creeps up while requests succeed and halves on a
+# 429/503, which also pauses the host for the Retry-After period. Repeated failures open a
+# circuit breaker that fails requests fast until a cool-down has passed, after which a single
+# probe request decides whether to close it again.
+
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+import requests
+from django.conf import settings
+
+# Statuses that mean "slow down"
+THROTTLE_STATUSES = (429, 503)
+# Rate added per successful request (requests/sec) and factor applied on throttling
+RATE_INCREASE = 0.05
+RATE_DECREASE = 0.5
+# Pause used after a throttled response that carries no Retry-After, doubling per consecutive failure
+DEFAULT_BACKOFF = 5.0
+MAX_BACKOFF = 600.0
+# Longest single sleep while waiting for a token, so waiting callers notice an opened circuit
+MAX_SLEEP = 5.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS host_limit (
+    host TEXT PRIMARY KEY,
+    rate REAL NOT NULL,
+    tokens REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    blocked_until REAL NOT NULL DEFAULT 0,
+    failures INTEGER NOT NULL DEFAULT 0,
+    circuit_until REAL NOT NULL DEFAULT 0
+)
+"""
+
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """Raised instead of sending a request while the host's circuit breaker is open."""
+
+
+def is_enabled():
+    return getattr(settings, 'RATE_LIMIT_ENABLED', True)
+
+
+def db_path():
+    return str(getattr(settings, 'RATE_LIMIT_DB', os.path.join(settings.BASE_DIR, '.rate_limit.sqlite3')))
+
+
+def initial_rate():
+    return getattr(settings, 'RATE_LIMIT_INITIAL_RATE', 2.0)
+
+
+def min_rate():
+    return getattr(settings, 'RATE_LIMIT_MIN_RATE', 0.1)
+
+
+def max_rate():
+    return getattr(settings, 'RATE_LIMIT_MAX_RATE', 10.0)
+
+
+def burst():
+    return getattr(settings, 'RATE_LIMIT_BURST', 3)
+
+
+def circuit_failures():
+    return getattr(settings, 'RATE_LIMIT_CIRCUIT_FAILURES', 5)
+
+
+def circuit_cooldown():
+    return getattr(settings, 'RATE_LIMIT_CIRCUIT_COOLDOWN', 120.0)
+
+
+_local = threading.local()
+
+
+def _connection():
+    """Per-thread (and per-process) connection to the limiter database."""
+    path = db_path()
+    conn = getattr(_local, 'conn', None)
+    if conn is None or _local.pid != os.getpid() or _local.path != path:
+        conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute(_SCHEMA)
+        _local.conn, _local.pid, _local.path = conn, os.getpid(), path
+    return conn
+
+
+class _Transaction:
+    """BEGIN IMMEDIATE ... COMMIT, so read-modify-write of a host row is atomic across processes."""
+
+    def __enter__(self):
+        self.conn = _connection()
+        self.conn.execute('BEGIN IMMEDIATE')
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        self.conn.execute('ROLLBACK' if exc_type else 'COMMIT')
+        return False
+
+
+def _load(conn, host, now):
+    row = conn.execute(
+        'SELECT rate, tokens, updated_at, blocked_until, failures, circuit_until FROM host_limit WHERE host = ?', (host,)
+    ).fetchone()
+    if row is None:
+        row = (initial_rate(), float(burst()), now, 0.0, 0, 0.0)
+        conn.execute(
+            'INSERT INTO host_limit (host, rate, tokens, updated_at, blocked_until, failures, circuit_until) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?)', (host, *row)
+        )
+    return list(row)
+
+
+def acquire(host):
+    """
+    Blocks until host's bucket has a token and takes it. Raises CircuitOpenError while the
+    host's circuit is open; once the cool-down is over the first caller through is the probe
+    and the circuit stays closed to everyone else until that probe's outcome is recorded.
+    """
+    while True:
+        with _Transaction() as conn:
+            now = time.time()
+            rate, tokens, updated_at, blocked_until, failures, circuit_until = _load(conn, host, now)
+            if failures >= circuit_failures():
+                if now < circuit_until:
+                    raise CircuitOpenError(
+                        f"Circuit open for {host} after {failures} failures; retrying in {circuit_until - now:.0f}s"
+                    )
+                # Half-open: let this request through as the probe, hold everyone else off
+                conn.execute('UPDATE host_limit SET circuit_until = ? WHERE host = ?', (now + circuit_cooldown(), host))
+                return
+
+            tokens = min(float(burst()), tokens + max(0.0, now - updated_at) * rate)
+            if now < blocked_until:
+                wait = blocked_until - now
+            elif tokens >= 1:
+                conn.execute('UPDATE host_limit SET tokens = ?, updated_at = ? WHERE host = ?', (tokens - 1, now, host))
+                return
+            else:
+                wait = (1 - tokens) / rate
+            conn.execute('UPDATE host_limit SET tokens = ?, updated_at = ? WHERE host = ?', (tokens, now, host))
+        time.sleep(min(wait, MAX_SLEEP))
+
+
+def retry_after_seconds(response):
+    """Seconds asked for by a Retry-After header (delta-seconds or HTTP date), or None."""
+    value = response.headers.get('Retry-After') if response is not None else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def record_success(host):
+    """Additive increase: nudges the host's rate up and closes its circuit."""
+    with _Transaction() as conn:
+        rate, *_ = _load(conn, host, time.time())
+        conn.execute(
+            'UPDATE host_limit SET rate = ?, failures = 0, circuit_until = 0 WHERE host = ?',
+            (min(max_rate(), rate + RATE_INCREASE), host),
+        )
+
+
+def record_failure(host, response=None):
+    """
+    Counts a failed request against host's circuit breaker. Throttling responses (429/503)
+    also halve the rate and pause the host for Retry-After, or an exponential backoff when
+    the header is missing. Returns the pause in seconds (0 for other failures).
+    """
+    with _Transaction() as conn:
+        now = time.time()
+        rate, tokens, updated_at, blocked_until, failures, circuit_until = _load(conn, host, now)
+        failures += 1
+        pause = 0.0
+        if response is not None and response.status_code in THROTTLE_STATUSES:
+            # Requests already in flight when the host first pushed back don't cut the rate again
+            if now >= blocked_until:
+                rate = max(min_rate(), rate * RATE_DECREASE)
+            retry_after = retry_after_seconds(response)
+            pause = min(MAX_BACKOFF, retry_after if retry_after is not None else DEFAULT_BACKOFF * 2 ** (failures - 1))
+            blocked_until = max(blocked_until, now + pause)
+            tokens = 0.0
+        if failures >= circuit_failures():
+            circuit_until = max(circuit_until, blocked_until, now + circuit_cooldown())
+            print(f"[ERROR] Opening circuit for {host} after {failures} consecutive failures.")
+        conn.execute(
+            'UPDATE host_limit SET rate = ?, tokens = ?, updated_at = ?, blocked_until = ?, failures = ?, '
+            'circuit_until = ? WHERE host = ?',
+            (rate, tokens, now, blocked_until, failures, circuit_until, host),
+        )
+    if pause:
+        print(f"[INFO] {host} throttled (HTTP {response.status_code}); pausing {pause:.0f}s, rate now {rate:.2f}/s.")
+    return pause
+
+
+def host_states():
+    """Current limiter state of every host seen so far, as dicts."""
+    columns = ['host', 'rate', 'tokens', 'updated_at', 'blocked_until', 'failures', 'circuit_until']
+    rows = _connection().execute(f'SELECT {", ".join(columns)} FROM host_limit ORDER BY host').fetchall()
+    return [dict(zip(columns, row)) for row in rows]
+
+
+def reset(host=None):
+    """Forgets the learned rate and failures of host (or of every host)."""
+    with _Transaction() as conn:
+        if host:
+            conn.execute('DELETE FROM host_limit WHERE host = ?', (host,))
+        else:
+            conn.execute('DELETE FROM host_limit')
@@ -0,0 +1,103 @@
+# In reviews/resolver.py
+
+from datetime import timedelta
+
+import requests
+from django.conf import settings
+from django.utils import timezone
+
+from . import http_client, title_index
+from .models import Book, GoodreadsIdResolution
+from .utils import normalize_title, normalize_author
+
+
+def resolution_key(title, author=None):
+    """Normalized (title, author) pair used to key the resolution cache."""
+    return normalize_title(title or ''), normalize_author(author)
+
+
+def _is_fresh(resolution, now):
+    if resolution.goodreads_id:
+        ttl = getattr(settings, 'GOODREADS_RESOLUTION_TTL', timedelta(days=30))
+    else:
+        ttl = getattr(settings, 'GOODREADS_NEGATIVE_RESOLUTION_TTL', timedelta(days=1))
+    return now - resolution.resolved_at < ttl
+
+
+def _record(key, goodreads_id, score):
+    GoodreadsIdResolution.objects.update_or_create(
+        normalized_title=key[0],
+        normalized_author=key[1],
+        defaults={'goodreads_id': goodreads_id, 'match_score': score, 'resolved_at': timezone.now()},
+    )
+
+
+def _search(pair):
+    """Network search for one pair. Returns (goodreads_id, score), or None when the search itself failed."""
+    from .scraper import search_goodreads_id
+    try:
+        return search_goodreads_id(*pair)
+    except requests.exceptions.RequestException as e:
+        print(f"[ERROR] HTTP request failed for Goodreads search: {e}")
+    except Exception as e:
+        print(f"[ERROR] An unexpected error occurred during Goodreads ID lookup: {e}")
+    return None
+
+
+def resolve_goodreads_ids(title_author_pairs, max_workers=http_client.MAX_CONNECTIONS_PER_HOST):
+    """
+    Resolves (title, author) pairs to Goodreads IDs. Each pair is answered from, in order:
+    a fresh resolution cache row, a Book already stored under the same normalized keys, a stored
+    Book that the title index matches confidently (different spelling or subtitle), or a
+    Goodreads search (run concurrently for all remaining pairs). Searches that return no match
+    are cached with the shorter negative TTL; failed searches are not cached.
+    Returns a dict mapping each pair to its Goodreads ID or None.
+    """
+    pairs = list(dict.fromkeys(title_author_pairs))
+    keys = {pair: resolution_key(*pair) for pair in pairs}
+    titles = {key[0] for key in keys.values()}
+    now = timezone.now()
+
+    cached = {
+        (r.normalized_title, r.normalized_author): r
+        for r in GoodreadsIdResolution.objects.filter(normalized_title__in=titles)
+    }
+    stored = {}
+    for row in Book.objects.filter(normalized_title__in=titles, goodreads_id__isnull=False).values(
+        'normalized_title', 'normalized_author', 'goodreads_id'
+    ):
+        stored.setdefault((row['normalized_title'], row['normalized_author'] or ''), row['goodreads_id'])
+
+    results = {}
+    to_search = []
+    for pair in pairs:
+        key = keys[pair]
+        resolution = cached.get(key)
+        if resolution is not None and _is_fresh(resolution, now):
+            results[pair] = resolution.goodreads_id
+        elif key in stored:
+            results[pair] = stored[key]
+            _record(key, stored[key], 0)
+        else:
+            candidate = title_index.confident_match(*pair)
+            if candidate is not None:
+                print(f"[INFO] Matched '{pair[0]}' to stored book '{candidate.title}' "
+                      f"(similarity {candidate.score}); skipping Goodreads search.")
+                results[pair] = candidate.goodreads_id
+                _record(key, candidate.goodreads_id, 0)
+            else:
+                to_search.append(pair)
+
+    for pair, outcome in zip(to_search, http_client.map_concurrent(_search, to_search, max_workers=max_workers)):
+        if outcome is None:
+            results[pair] = None
+            continue
+        goodreads_id, score = outcome
+        _record(keys[pair], goodreads_id, score)
+        results[pair] = goodreads_id
+    return results
+
+
+def resolve_goodreads_id(title, author=None):
+    """Resolves one title/author to a Goodreads ID, going to the network only on a cache miss."""
+    return resolve_goodreads_ids([(title, author)])[(title, author)]
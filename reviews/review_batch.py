@@ -0,0 +1,109 @@
+# In reviews/review_batch.py
+#
+# Compact column store for scraped reviews on their way to the database. A batch keeps one
+# array per field instead of a dict per review: ratings as hundredths in an array of shorts,
+# dates as day ordinals, fingerprints as raw 32-byte digests, and reviewer names interned.
+# Review model instances are built only at insert time, one chunk at a time (to_reviews).
+
+import sys
+from array import array
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+
+from .utils import review_fingerprint
+
+# Stand-ins for a missing rating / date in the integer columns
+NO_RATING = -1
+NO_DATE = 0
+DIGEST_SIZE = 32
+
+
+def dedup_key(fingerprint):
+    """Integer key for in-memory "seen" sets: the first 8 bytes of the hex fingerprint."""
+    return int(fingerprint[:16], 16)
+
+
+class ReviewBatch:
+    """Reviews scraped for one book, stored column-wise. Indexing returns the review as a dict."""
+
+    __slots__ = ('texts', 'reviewers', 'ratings', 'dates', 'digests')
+
+    def __init__(self):
+        self.texts = []
+        self.reviewers = []
+        self.ratings = array('h')
+        self.dates = array('i')
+        self.digests = bytearray()
+
+    @classmethod
+    def from_dicts(cls, reviews):
+        batch = cls()
+        for review in reviews:
+            batch.append(review.get('review_text'), review.get('reviewer_name'), review.get('rating'),
+                         review.get('review_date'), review.get('fingerprint'))
+        return batch
+
+    def append(self, review_text, reviewer_name, rating, review_date, fingerprint=None):
+        """Adds one review; the fingerprint is computed when not given. Returns the fingerprint."""
+        if fingerprint is None:
+            fingerprint = review_fingerprint('goodreads', reviewer_name, review_date, review_text)
+        self.texts.append(review_text or '')
+        self.reviewers.append(sys.intern(reviewer_name) if reviewer_name else reviewer_name)
+        try:
+            encoded_rating = NO_RATING if rating is None else int(Decimal(str(rating)) * 100)
+        except InvalidOperation:
+            encoded_rating = NO_RATING
+        self.ratings.append(encoded_rating)
+        if isinstance(review_date, datetime):
+            review_date = review_date.date()
+        self.dates.append(review_date.toordinal() if review_date else NO_DATE)
+        self.digests += bytes.fromhex(fingerprint)
+        return fingerprint
+
+    def __len__(self):
+        return len(self.texts)
+
+    def fingerprint(self, i):
+        return self.digests[i * DIGEST_SIZE:(i + 1) * DIGEST_SIZE].hex()
+
+    def rating(self, i):
+        value = self.ratings[i]
+        return None if value == NO_RATING else Decimal(value) / 100
+
+    def review_date(self, i):
+        value = self.dates[i]
+        return None if value == NO_DATE else date.fromordinal(value)
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError('review index out of range')
+        return {
+            'review_text': self.texts[i],
+            'review_date': self.review_date(i),
+            'reviewer_name': self.reviewers[i],
+            'rating': self.rating(i),
+            'fingerprint': self.fingerprint(i),
+        }
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def to_reviews(self, book, indexes):
+        """Unsaved Review instances for the reviews at indexes (for bulk_create)."""
+        from .models import Review
+
+        return [
+            Review(
+                book=book,
+                source_website='goodreads',
+                fingerprint=self.fingerprint(i),
+                review_text=self.texts[i],
+                review_date=self.review_date(i),
+                reviewer_name=self.reviewers[i],
+                rating=self.rating(i),
+            )
+            for i in indexes
+        ]
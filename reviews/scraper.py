@@ -1,105 +1,113 @@
 # In reviews/scraper.py
 
+# Selenium, the driver pool and the NLP analyzers are imported on first use (see
+# iter_goodreads_reviews_selenium and reviews.sentiment), so importing this module stays cheap.
 import requests
-from bs4 import BeautifulSoup
+import json
+import queue
+import threading
 import time
-import re
 from datetime import datetime
 import os
-import django
-import random
 from urllib.parse import quote_plus
 from decimal import Decimal, InvalidOperation
-
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import NoSuchElementException, TimeoutException, WebDriverException, ElementClickInterceptedException, StaleElementReferenceException
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.chrome.options import Options
-
-from nltk.sentiment import SentimentIntensityAnalyzer
-from .utils import normalize_title, normalize_author
-from django.db import transaction
-
-os.environ.setdefault("DJANGO_SETTINGS_MODULE", "book_reviews_project.settings")
-django.setup()
+from datetime import timezone
+
+from .utils import normalize_title, normalize_author, review_fingerprint
+from . import http_client, sentiment, stats
+from .signals import invalidate_catalogue
+from .review_batch import ReviewBatch, dedup_key
+from .extractors import extract_search_results, extract_book_metadata, extract_review_cards, extract_next_data, html_to_text
+from django.db import IntegrityError, models, transaction
+from django.db.models import F, Q, Value
+from django.db.models.functions import Coalesce, NullIf
+from django.conf import settings
 
 from reviews.models import Book, Review
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__)) 
 
-sid = SentimentIntensityAnalyzer()
-
-def find_goodreads_id_from_title_author(title, author=None):
+REVIEW_BACKENDS = ('selenium', 'http')
+
+GRAPHQL_GET_REVIEWS_QUERY = """
+query getReviews($filters: BookReviewsFilterInput!, $pagination: PaginationInput) {
+  getReviews(filters: $filters, pagination: $pagination) {
+    totalCount
+    edges { node { id text rating createdAt creator { name } } }
+    pageInfo { nextPageToken }
+  }
+}
+"""
+
+# Review order requested from the reviews page and the GraphQL query; incremental scrapes can
+# only stop at the first stored reviews when the newest come first
+REVIEWS_SORT = 'NEWEST'
+# Number of newest stored reviews whose fingerprints make up a book's incremental watermark
+RECENT_FINGERPRINT_COUNT = 60
+# Fingerprints looked up / rows inserted per statement (stays under SQLite's bound-variable limit)
+REVIEW_INSERT_CHUNK_SIZE = 500
+
+def goodreads_base_url():
+    """Base URL for Goodreads pages; overridable in settings so scrapes can target a local stub server."""
+    return getattr(settings, 'GOODREADS_BASE_URL', 'https://www.goodreads.com').rstrip('/')
+
+def search_goodreads_id(title, author=None):
     """
-    Searches Goodreads and finds the best matching book ID based on title and author.
-    This version includes filters to ignore non-book results like Study Guides.
+    Searches Goodreads and returns (best matching book ID, match score), or (None, 0) when
+    nothing matches. Non-book results like Study Guides are ignored. Network errors propagate
+    as requests exceptions so callers can tell "no match" apart from "could not search".
     """
     search_query = f"{title} {author}" if author else title
-    url = f"https://www.goodreads.com/search?q={quote_plus(search_query)}"
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
+    url = f"{goodreads_base_url()}/search?q={quote_plus(search_query)}"
 
     print(f"[DEBUG] Searching Goodreads with query: '{search_query}'")
-    try:
-        r = requests.get(url, headers=headers, timeout=15)
-        r.raise_for_status()
-        soup = BeautifulSoup(r.text, 'html.parser')
-
-        search_results_container = soup.find('table', class_='tableList')
-        if not search_results_container:
-            print("[INFO] No search results table found. Returning None.")
-            return None
-            
-        search_results = search_results_container.find_all('tr')
-        best_match_id = None
-        best_score = -1
-        normalized_target_title = normalize_title(title)
-        normalized_target_author = normalize_author(author) if author else None
-
-        for result_tr in search_results:
-            result_link = result_tr.find('a', class_='bookTitle', href=True)
-            if not result_link:
-                continue
-
-            result_title = result_link.get_text(strip=True)
-            if 'study guide' in result_title.lower() or 'summary' in result_title.lower():
-                continue
-            gid_match = re.search(r'/book/show/(\d+)', result_link['href'])
-            if not gid_match:
-                continue
-            gid = gid_match.group(1)
-            author_element = result_tr.find('a', class_='authorName')
-            result_author = author_element.get_text(strip=True) if author_element else ''
-            score = 0
-            normalized_result_title = normalize_title(result_title)
-            normalized_result_author = normalize_author(result_author)
-            
-            if normalized_target_title == normalized_result_title:
-                score += 10
-            elif normalized_target_title in normalized_result_title:
-                    score += 5
-            
-            if normalized_target_author and normalized_target_author == normalized_result_author:
-                score += 10
-            elif normalized_target_author and normalized_target_author in normalized_result_author:
-                score += 5
-            
-            if score > best_score:
-                best_score = score
-                best_match_id = gid
-
-        if best_match_id and best_score > 0:
-            print(f"[INFO] Best match found with score {best_score}. Goodreads ID: {best_match_id}")
-            return best_match_id
-        else:
-            print("[INFO] No good match found. Returning None.")
-            return None
+    r = http_client.fetch(url)
+    search_results = extract_search_results(r.text)
+    if search_results is None:
+        print("[INFO] No search results table found.")
+        return None, 0
+
+    best_match_id = None
+    best_score = -1
+    normalized_target_title = normalize_title(title)
+    normalized_target_author = normalize_author(author) if author else None
+
+    for gid, result_title, result_author in search_results:
+        if 'study guide' in result_title.lower() or 'summary' in result_title.lower():
+            continue
+        score = 0
+        normalized_result_title = normalize_title(result_title)
+        normalized_result_author = normalize_author(result_author)
+
+        if normalized_target_title == normalized_result_title:
+            score += 10
+        elif normalized_target_title in normalized_result_title:
+            score += 5
+
+        if normalized_target_author and normalized_target_author == normalized_result_author:
+            score += 10
+        elif normalized_target_author and normalized_target_author in normalized_result_author:
+            score += 5
+
+        if score > best_score:
+            best_score = score
+            best_match_id = gid
+
+    if best_match_id and best_score > 0:
+        print(f"[INFO] Best match found with score {best_score}. Goodreads ID: {best_match_id}")
+        return best_match_id, best_score
+    print("[INFO] No good match found.")
+    return None, 0
 
+def find_goodreads_id_from_title_author(title, author=None):
+    """
+    Searches Goodreads and finds the best matching book ID based on title and author.
+    Always goes to the network; reviews.resolver.resolve_goodreads_id consults the
+    resolution cache first.
+    """
+    try:
+        goodreads_id, _ = search_goodreads_id(title, author)
+        return goodreads_id
     except requests.exceptions.RequestException as e:
         print(f"[ERROR] HTTP request failed for Goodreads search: {e}")
         return None
@@ -124,7 +132,68 @@ def filter_to_model_fields(data, model):
     model_fields = {field.name for field in model._meta.get_fields()}
     return {k: v for k, v in data.items() if k in model_fields}
 
+def _fill_author(book, author):
+    """
+    Sets the author of a book stored without one, together with its normalized key. If another
+    book already holds the completed (title, author) key, the two are the same book: this one is
+    merged into it. Returns (the book to keep using, whether anything changed).
+    """
+    normalized_author = normalize_author(author)
+    try:
+        with transaction.atomic():
+            filled = Book.objects.filter(pk=book.pk).filter(Q(author__isnull=True) | Q(author='')).update(
+                author=author, normalized_author=normalized_author,
+            )
+    except IntegrityError:
+        existing = Book.objects.filter(
+            normalized_title=normalize_title(book.title or ''), normalized_author=normalized_author,
+        ).exclude(pk=book.pk).first()
+        if existing is None:
+            raise
+        from .book_merge import merge_groups
+        print(f"DEBUG: Merging book {book.pk} into '{existing.title}' ({existing.pk}), now that its author is known")
+        merge_groups({existing.pk: [book.pk]})
+        existing.refresh_from_db()
+        return existing, True
+    if filled:
+        book.refresh_from_db(fields=['author', 'normalized_author'])
+    return book, bool(filled)
+
+def _fill_empty_fields(book, book_data):
+    """
+    Copies non-null values onto the book's empty fields with conditional UPDATEs, so a
+    concurrent scraper filling the same book can't have its values overwritten. A missing
+    author is filled too (see _fill_author), which can merge the book into another one.
+    Returns (the book, whether anything changed).
+    """
+    changed = False
+    if book_data.get('author') and book.author in (None, ''):
+        book, changed = _fill_author(book, book_data['author'])
+
+    updates = {}
+    for k, v in book_data.items():
+        if v is None or k in ('title', 'author'):
+            continue
+        if getattr(book, k) in (None, ''):
+            field = Book._meta.get_field(k)
+            current = NullIf(F(k), Value('')) if isinstance(field, (models.CharField, models.TextField)) else F(k)
+            updates[k] = Coalesce(current, Value(v), output_field=field)
+    if updates:
+        Book.objects.filter(pk=book.pk).update(**updates)
+        book.refresh_from_db(fields=list(updates))
+        changed = True
+    if changed:
+        invalidate_catalogue()
+    return book, changed
+
 def create_or_update_book_record(raw_data, source_platform):
+    """
+    Finds the book by Goodreads ID or by its canonical (normalized title, normalized author)
+    key, both indexed equality lookups, creating it if neither matches. Creation relies on the
+    unique key, so concurrent scrapers of the same book end up with one row. Empty fields of an
+    existing book, author included, are filled from raw_data; the book returned is the one the
+    record was merged into if the filled-in author made it a duplicate.
+    """
     if source_platform == 'goodreads':
         book_data = normalize_goodreads_book_data(raw_data)
     else:
@@ -139,25 +208,34 @@ def create_or_update_book_record(raw_data, source_platform):
     book_data = filter_to_model_fields(book_data, Book)
     title = book_data.get('title')
     author = book_data.get('author')
-    existing_book = None
-    if source_platform == 'goodreads' and book_data.get('goodreads_id'):
-        existing_book = Book.objects.filter(goodreads_id=book_data['goodreads_id']).first()
-    if not existing_book and title:
-        norm_title = normalize_title(title)
-        norm_author = normalize_author(author) if author else ""
-        q = {'title__iexact': norm_title}
-        if norm_author:
-            q['author__iexact'] = norm_author
-        existing_book = Book.objects.filter(**q).first()
+    goodreads_id = book_data.get('goodreads_id') if source_platform == 'goodreads' else None
+
+    existing_book = Book.objects.filter(goodreads_id=goodreads_id).first() if goodreads_id else None
+    if existing_book is None and title:
+        key = {'normalized_title': normalize_title(title), 'normalized_author': normalize_author(author)}
+        existing_book = Book.objects.filter(**key).first()
+        created = False
+        if existing_book is None:
+            # Insert in its own write-first transaction (SQLite can't upgrade a read transaction
+            # under contention); the unique key turns a lost race into an IntegrityError
+            try:
+                with transaction.atomic():
+                    existing_book = Book.objects.create(**book_data)
+                created = True
+            except IntegrityError:
+                existing_book = Book.objects.filter(**key).first()
+                if existing_book is None and goodreads_id:
+                    # Another scraper stored this Goodreads ID under a different title/author
+                    existing_book = Book.objects.filter(goodreads_id=goodreads_id).first()
+                if existing_book is None:
+                    raise
+        if created:
+            print(f"DEBUG: Created new book '{existing_book.title}' from {source_platform}")
+            return existing_book
 
     if existing_book:
-        updated = False
-        for k, v in book_data.items():
-            if v is not None and getattr(existing_book, k) in (None, ''):
-                setattr(existing_book, k, v)
-                updated = True
+        existing_book, updated = _fill_empty_fields(existing_book, book_data)
         if updated:
-            existing_book.save()
             print(f"DEBUG: Updated existing book '{existing_book.title}' from {source_platform}")
         return existing_book
     else:
@@ -168,70 +246,12 @@ def create_or_update_book_record(raw_data, source_platform):
 def get_goodreads_book_metadata(goodreads_id):
     """Scrapes book metadata from the main book page using requests."""
     book_data = {'goodreads_id': goodreads_id}
-    url = f'https://www.goodreads.com/book/show/{goodreads_id}'
+    url = f'{goodreads_base_url()}/book/show/{goodreads_id}'
     print(f"Scraping metadata from URL: {url}")
 
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
-
     try:
-        r = requests.get(url, headers=headers, timeout=15)
-        r.raise_for_status()
-        soup = BeautifulSoup(r.text, 'html.parser')
-
-        # --- Title & Author
-        book_title_elem = soup.find('h1', class_='Text__title1')
-        book_data['title'] = book_title_elem.text.strip() if book_title_elem else None
-
-        author_elem = soup.find('span', class_='ContributorLink__name')
-        if author_elem:
-            book_data['author'] = author_elem.get_text(strip=True)
-        else:
-            author_elem = soup.find('span', class_='Text__title3')
-            if author_elem:
-                author_link = author_elem.find('a')
-                book_data['author'] = author_link.get_text(strip=True) if author_link else None
-            else:
-                book_data['author'] = None
-
-        # --- Average Rating
-        rating_elem = soup.find('div', class_='RatingStatistics__rating')
-        if rating_elem:
-            try:
-                book_data['average_rating'] = Decimal(rating_elem.text.strip())
-            except (ValueError, InvalidOperation):
-                book_data['average_rating'] = None
-
-        # --- Num Ratings and Num Reviews (Meta Section; uses data-testid attrs for robustness!)
-        stats_container = soup.find('div', class_='RatingStatistics__meta')
-        if stats_container:
-            # Ratings
-            ratings_span = stats_container.find('span', {'data-testid': 'ratingsCount'})
-            if ratings_span:
-                ratings_match = re.search(r'([\d,]+)', ratings_span.text)
-                if ratings_match:
-                    book_data['num_ratings'] = int(ratings_match.group(1).replace(",", ""))
-                else:
-                    book_data['num_ratings'] = None
-            # Reviews
-            reviews_span = stats_container.find('span', {'data-testid': 'reviewsCount'})
-            if reviews_span:
-                reviews_match = re.search(r'([\d,]+)', reviews_span.text)
-                if reviews_match:
-                    book_data['num_reviews'] = int(reviews_match.group(1).replace(",", ""))
-                else:
-                    book_data['num_reviews'] = None
-
-        # --- Cover
-        cover_elem = soup.find('img', class_='ResponsiveImage')
-        book_data['cover_image_url'] = cover_elem['src'] if cover_elem else None
-
-        # --- Description
-        description_elem = soup.find('div', {'data-testid': 'description'})
-        if description_elem:
-            book_data['description'] = description_elem.text.strip()
-
+        r = http_client.fetch(url)
+        book_data.update(extract_book_metadata(r.text))
         return book_data
 
     except requests.exceptions.RequestException as e:
@@ -242,171 +262,534 @@ def get_goodreads_book_metadata(goodreads_id):
         return None
 
 
-def get_goodreads_reviews(goodreads_id, max_reviews_to_scrape=50):
+def fetch_metadata_many(goodreads_ids, max_workers=http_client.MAX_CONNECTIONS_PER_HOST):
+    """
+    Fetches metadata for several books concurrently over the pooled session.
+    Returns a dict mapping each Goodreads ID to its metadata (or None on failure).
+    """
+    goodreads_ids = list(goodreads_ids)
+    results = http_client.map_concurrent(get_goodreads_book_metadata, goodreads_ids, max_workers=max_workers)
+    return dict(zip(goodreads_ids, results))
+
+
+def resolve_ids_many(title_author_pairs, max_workers=http_client.MAX_CONNECTIONS_PER_HOST):
+    """
+    Resolves several (title, author) pairs to Goodreads IDs, consulting the resolution cache
+    first and searching Goodreads concurrently for the rest.
+    Returns a dict mapping each pair to its Goodreads ID (or None when no match was found).
+    """
+    from .resolver import resolve_goodreads_ids
+    return resolve_goodreads_ids(title_author_pairs, max_workers=max_workers)
+
+
+def review_watermark(book):
+    """
+    The book's incremental scrape watermark, or None if nothing has been stored yet.
+    A scraped review counts as known when its fingerprint is among the newest stored
+    reviews or it is dated before the newest stored review.
+    """
+    latest_date, fingerprints = Book.objects.filter(pk=book.pk).values_list(
+        'latest_review_date', 'recent_review_fingerprints'
+    ).first() or (None, None)
+    if not latest_date and not fingerprints:
+        return None
+    return {'latest_date': latest_date, 'fingerprints': {dedup_key(fingerprint) for fingerprint in fingerprints}}
+
+def update_review_watermarks(book_ids, apps=None):
+    """
+    Recomputes the watermarks of the given books from their newest stored reviews (one indexed
+    query per book). Pass a migration's apps registry to use its historical models.
+    """
+    book_model = apps.get_model('reviews', 'Book') if apps else Book
+    review_model = apps.get_model('reviews', 'Review') if apps else Review
+    for book_id in book_ids:
+        newest = list(
+            review_model.objects.filter(book_id=book_id)
+            .order_by(F('review_date').desc(nulls_last=True), '-id')
+            .values_list('fingerprint', 'review_date')[:RECENT_FINGERPRINT_COUNT]
+        )
+        book_model.objects.filter(pk=book_id).update(
+            latest_review_date=max((review_date for _, review_date in newest if review_date), default=None),
+            recent_review_fingerprints=[fingerprint for fingerprint, _ in newest if fingerprint],
+        )
+
+def _add_fingerprint(review):
+    """Stores the review's dedup fingerprint on the review dict and returns it."""
+    review['fingerprint'] = review_fingerprint('goodreads', review['reviewer_name'], review['review_date'], review['review_text'])
+    return review['fingerprint']
+
+def _is_known_review(review, watermark):
+    if dedup_key(review['fingerprint']) in watermark['fingerprints']:
+        return True
+    review_date = review['review_date']
+    return bool(watermark['latest_date'] and review_date and review_date.date() < watermark['latest_date'])
+
+class _NewestFirstCheck:
+    """
+    Watches the dates of the reviews a scrape reads (undated ones aside). Goodreads is asked for
+    the newest reviews first, but an incremental scrape only stops at stored reviews while the
+    listing is seen to actually follow that order.
+    """
+
+    def __init__(self):
+        self.holds = True
+        self._last_date = None
+
+    def see(self, review):
+        review_date = review['review_date']
+        if review_date is None:
+            return
+        if self.holds and self._last_date is not None and review_date > self._last_date:
+            print("[INFO] Reviews are not listed newest first; the scrape will not stop at stored reviews.")
+            self.holds = False
+        self._last_date = review_date
+
+def reviews_page_url(goodreads_id):
+    """The book's reviews page, asking for the newest reviews first."""
+    return f'{goodreads_base_url()}/book/show/{goodreads_id}/reviews?sort={REVIEWS_SORT}'
+
+class ReviewsBackendUnavailable(Exception):
+    """The http reviews backend can't serve a book (no embedded page data, or more pages are needed but no GraphQL endpoint is configured)."""
+
+def new_scrape_state(backend):
+    """Position of a review scrape that has not stored anything yet (see ScrapeCheckpoint)."""
+    return {'backend': backend, 'batches_done': 0, 'reviews_scraped': 0, 'page_token': '', 'work_id': ''}
+
+def iter_goodreads_reviews(goodreads_id, max_reviews_to_scrape=50, backend=None, watermark=None, resume=None):
     """
-    Scrape Goodreads reviews across all paginated batches (button click replaces page),
-    extracting new reviews after each load and deduplicating by (reviewer, date, text[:100]).
+    Scrapes Goodreads reviews batch by batch with the requested backend ('selenium' or 'http'),
+    yielding (reviews, state) per batch. state is the scrape position once that batch is stored;
+    passing it back as resume continues right after it (with the backend that produced it).
+    Defaults to settings.GOODREADS_REVIEWS_BACKEND. The HTTP backend falls back to Selenium when
+    the page data it needs is unavailable.
+
+    With a watermark (see review_watermark) the scrape is incremental: already-stored reviews
+    are skipped, and pagination stops after a batch made up only of them as long as the
+    reviews arrive newest first.
     """
-    from selenium import webdriver
-    from selenium.webdriver.chrome.options import Options
+    backend = backend or getattr(settings, 'GOODREADS_REVIEWS_BACKEND', 'selenium')
+    if backend not in REVIEW_BACKENDS:
+        raise ValueError(f"Unknown reviews backend: {backend}")
+    if resume and resume.get('backend') in REVIEW_BACKENDS:
+        backend = resume['backend']
+    else:
+        resume = None
 
+    if backend == 'http':
+        try:
+            yield from iter_goodreads_reviews_http(goodreads_id, max_reviews_to_scrape, watermark=watermark, resume=resume)
+            return
+        except ReviewsBackendUnavailable as e:
+            print(f"[INFO] HTTP reviews backend could not serve this book ({e}); falling back to Selenium.")
+            resume = None
+    yield from iter_goodreads_reviews_selenium(goodreads_id, max_reviews_to_scrape, watermark=watermark, resume=resume)
+
+def get_goodreads_reviews(goodreads_id, max_reviews_to_scrape=50, backend=None, watermark=None):
+    """
+    Scrapes Goodreads reviews into one list (see iter_goodreads_reviews). Large scrapes should go
+    through reviews.ingest.ingest_reviews instead, which stores each batch as it arrives.
+    """
     reviews_data = []
-    seen_dedupes = set()
+    for batch, _ in iter_goodreads_reviews(goodreads_id, max_reviews_to_scrape, backend=backend, watermark=watermark):
+        reviews_data.extend(batch)
+    return reviews_data
+
+def _review_from_apollo(review_obj, apollo_state):
+    """Converts a Review object from Goodreads' Apollo/GraphQL data into our review dict shape."""
+    creator = review_obj.get('creator') or {}
+    if '__ref' in creator:
+        creator = apollo_state.get(creator['__ref'], {})
+    reviewer_name = creator.get('name') or 'Unknown'
+
+    review_text = ''
+    if review_obj.get('text'):
+        review_text = html_to_text(review_obj['text'])
+
+    rating = None
+    if review_obj.get('rating'):
+        try:
+            rating = Decimal(str(review_obj['rating']))
+        except InvalidOperation:
+            rating = None
 
-    options = Options()
-    # options.add_argument("--headless")  # Uncomment for headless mode
-    driver = webdriver.Chrome(options=options)
-    try:
-        reviews_page_url = f'https://www.goodreads.com/book/show/{goodreads_id}/reviews'
-        driver.get(reviews_page_url)
-        
-        wait = WebDriverWait(driver, 10)
+    review_date = None
+    if review_obj.get('createdAt'):
+        created = datetime.fromtimestamp(review_obj['createdAt'] / 1000, tz=timezone.utc)
+        review_date = datetime(created.year, created.month, created.day)
 
-        batch_num = 0
-        scraped_total = 0
-        while True:
-            # Wait for review cards to load
-            wait.until(EC.presence_of_all_elements_located((By.CLASS_NAME, 'ReviewCard')))
-            soup = BeautifulSoup(driver.page_source, 'html.parser')
-            review_containers = soup.find_all('article', class_='ReviewCard')
-            
-            batch_count = 0
-            for container in review_containers:
-                # --- Extract review text
-                review_text = ''
-                review_text_element = container.find('div', {'data-testid': 'contentContainer'})
-                if review_text_element:
-                    review_text = review_text_element.get_text(strip=True)
-                
-                # --- Extract reviewer name
-                reviewer_name = 'Unknown'
-                name_div = container.find('div', {'data-testid': 'name'})
-                if name_div:
-                    name_link = name_div.find('a')
-                    if name_link:
-                        reviewer_name = name_link.get_text(strip=True)
-                
-                # --- Extract rating
-                rating = None
-                rating_element = container.find('span', class_='RatingStars')
-                if rating_element:
-                    rating_label = rating_element.get('aria-label')
-                    if rating_label and 'Rating' in rating_label:
-                        rating_value_match = re.search(r'Rating\s*([\d.]+)\s*out\s*of\s*5', rating_label)
-                        if rating_value_match:
-                            rating = Decimal(rating_value_match.group(1))
-
-                # --- Extract date (using correct selector structure)
-                review_date = None
-                date_span = container.find('span', class_='Text Text__body3')
-                if date_span:
-                    a_tag = date_span.find('a')
-                    if a_tag:
-                        review_date_str = a_tag.get_text(strip=True)
-                        try:
-                            review_date = datetime.strptime(review_date_str, '%B %d, %Y')
-                        except Exception:
-                            pass
-
-                # --- Robust deduplication key: reviewer, date, first 100 chars of text
-                trunc_txt = (review_text or '')[:100]
-                dedup_key = (reviewer_name or "Unknown", review_date or "", trunc_txt)
-                if dedup_key in seen_dedupes:
-                    continue
-                seen_dedupes.add(dedup_key)
-
-                reviews_data.append({
-                    'review_text': review_text,
-                    'review_date': review_date,
-                    'reviewer_name': reviewer_name,
-                    'rating': rating
-                })
-                batch_count += 1
-                scraped_total += 1
-                if max_reviews_to_scrape != -1 and scraped_total >= max_reviews_to_scrape:
-                    print(f"Collected {scraped_total} reviews (limit reached).")
-                    return reviews_data
-            
-            print(f"Batch {batch_num + 1}: Scraped {batch_count} reviews, {scraped_total} total.")
-            batch_num += 1
-
-            # Try to click "Show more reviews" for next batch
+    return {
+        'review_text': review_text,
+        'review_date': review_date,
+        'reviewer_name': reviewer_name,
+        'rating': rating,
+    }
+
+def _fetch_graphql_reviews_page(work_id, page_token):
+    """Requests one page of reviews from Goodreads' GraphQL endpoint. Returns (review objects, next token)."""
+    payload = {
+        'operationName': 'getReviews',
+        'query': GRAPHQL_GET_REVIEWS_QUERY,
+        'variables': {
+            'filters': {'resourceType': 'WORK', 'resourceId': work_id, 'sort': REVIEWS_SORT},
+            'pagination': {'after': page_token, 'limit': 30},
+        },
+    }
+    r = http_client.fetch(
+        settings.GOODREADS_GRAPHQL_URL,
+        method='POST',
+        json=payload,
+        headers={'x-api-key': settings.GOODREADS_GRAPHQL_API_KEY},
+    )
+    data = r.json()['data']['getReviews']
+    nodes = [edge['node'] for edge in data.get('edges', [])]
+    return nodes, (data.get('pageInfo') or {}).get('nextPageToken')
+
+def iter_goodreads_reviews_http(goodreads_id, max_reviews_to_scrape=50, watermark=None, resume=None):
+    """
+    Browserless review scrape, newest reviews first. Reads the first batch of reviews from the
+    page's embedded __NEXT_DATA__ JSON (or from GraphQL when the page ignored the requested
+    order), then follows the GraphQL page tokens Goodreads uses for "Show more",
+    yielding (reviews, state) per page; a resume state continues from its stored page token.
+    Raises ReviewsBackendUnavailable, before yielding anything, when the page data is missing
+    or further pages are needed but no GraphQL endpoint is configured. A page that fails
+    further in raises its error, leaving the stored batches resumable.
+    """
+    graphql_configured = bool(getattr(settings, 'GOODREADS_GRAPHQL_URL', None))
+    apollo_state = {}
+    if resume and resume['page_token']:
+        if not graphql_configured or not resume['work_id']:
+            raise ReviewsBackendUnavailable("no GraphQL endpoint configured to resume from")
+        state = dict(resume)
+        work_id = state['work_id']
+        print(f"[INFO] Resuming review scrape after batch {state['batches_done']} ({state['reviews_scraped']} reviews).")
+        nodes, page_token = _fetch_graphql_reviews_page(work_id, state['page_token'])
+    else:
+        state = new_scrape_state('http')
+        try:
+            r = http_client.fetch(reviews_page_url(goodreads_id))
+            next_data = extract_next_data(r.text)
+            if not next_data:
+                raise ReviewsBackendUnavailable("no __NEXT_DATA__ on the reviews page")
+            apollo_state = json.loads(next_data)['props']['pageProps']['apolloState']
+        except requests.exceptions.RequestException as e:
+            print(f"[ERROR] HTTP request failed for Goodreads reviews page: {e}")
+            raise ReviewsBackendUnavailable("reviews page request failed")
+        except (ValueError, KeyError, TypeError) as e:
+            print(f"[ERROR] Could not read embedded review data: {e}")
+            raise ReviewsBackendUnavailable("unreadable embedded review data")
+
+        # --- The ROOT_QUERY getReviews entry holds the first page, the work ID and the next page token
+        connection = None
+        for key, value in apollo_state.get('ROOT_QUERY', {}).items():
+            if key.startswith('getReviews('):
+                connection = value
+                filters = json.loads(key[len('getReviews('):-1]).get('filters', {})
+                work_id = filters.get('resourceId')
+                break
+        if connection is None:
+            raise ReviewsBackendUnavailable("embedded data has no getReviews connection")
+
+        nodes = [apollo_state.get(edge['node']['__ref'], {}) for edge in connection.get('edges', [])]
+        page_token = (connection.get('pageInfo') or {}).get('nextPageToken')
+
+        # The page may ignore the requested order; its page tokens then follow the page's own
+        # order too, so ask GraphQL for the sorted first page instead
+        if filters.get('sort') != REVIEWS_SORT and graphql_configured and work_id:
             try:
-                load_more_button = WebDriverWait(driver, 6).until(
-                    EC.element_to_be_clickable((By.CSS_SELECTOR, "span[data-testid='loadMore']"))
-                )
-                driver.execute_script("arguments[0].scrollIntoView();", load_more_button)
-                time.sleep(1)
-                driver.execute_script("arguments[0].click();", load_more_button)
-                time.sleep(2)  # Wait for DOM update
-            except (NoSuchElementException, TimeoutException):
-                print("No more 'Show more reviews' button; finished scraping all batches.")
+                nodes, page_token = _fetch_graphql_reviews_page(work_id, None)
+            except (requests.exceptions.RequestException, ValueError, KeyError, TypeError) as e:
+                print(f"[INFO] Could not request the newest reviews first ({e}); using the page's order.")
+
+    seen_keys = set()
+    order = _NewestFirstCheck()
+    while True:
+        batch = ReviewBatch()
+        batch_known = 0
+        limit_reached = False
+        for node in nodes:
+            review = _review_from_apollo(node, apollo_state)
+            fingerprint = _add_fingerprint(review)
+            if dedup_key(fingerprint) in seen_keys:
+                continue
+            seen_keys.add(dedup_key(fingerprint))
+            order.see(review)
+            if watermark and _is_known_review(review, watermark):
+                batch_known += 1
+                continue
+            batch.append(review['review_text'], review['reviewer_name'], review['rating'], review['review_date'], fingerprint)
+            if max_reviews_to_scrape != -1 and state['reviews_scraped'] + len(batch) >= max_reviews_to_scrape:
+                limit_reached = True
                 break
-            except ElementClickInterceptedException:
-                time.sleep(2)
-                continue  # Try again
 
-        print(f"Total reviews scraped across batches: {len(reviews_data)}")
-        return reviews_data
+        caught_up = bool(watermark and order.holds and batch_known and not len(batch))
+        more = bool(page_token and nodes) and not limit_reached and not caught_up
+        if more and not (graphql_configured and work_id):
+            raise ReviewsBackendUnavailable("more reviews are available but no GraphQL endpoint is configured")
+
+        state['batches_done'] += 1
+        state['reviews_scraped'] += len(batch)
+        state['page_token'] = page_token if more else ''
+        state['work_id'] = work_id or ''
+        print(f"Batch {state['batches_done']}: Scraped {len(batch)} reviews, {state['reviews_scraped']} total.")
+        yield batch, dict(state)
+
+        if limit_reached:
+            print(f"Collected {state['reviews_scraped']} reviews (limit reached).")
+            return
+        if caught_up:
+            print("Batch contained only already-stored reviews; incremental scrape caught up.")
+            return
+        if not more:
+            break
+        try:
+            nodes, page_token = _fetch_graphql_reviews_page(work_id, page_token)
+        except requests.exceptions.RequestException as e:
+            print(f"[ERROR] HTTP request failed for Goodreads reviews page {state['batches_done'] + 1}: {e}")
+            raise
+        except (ValueError, KeyError, TypeError) as e:
+            print(f"[ERROR] Unexpected GraphQL response on page {state['batches_done'] + 1}: {e}")
+            raise
+
+    print(f"Total reviews scraped across batches: {state['reviews_scraped']}")
+
+# Cards already handed back are tagged with data-scraped, so each batch serializes only the
+# cards added since the last one (whether "Show more" appends to or replaces the list)
+HAS_NEW_REVIEW_CARDS_JS = "return document.querySelector('article.ReviewCard:not([data-scraped])') !== null;"
+NEW_REVIEW_CARDS_JS = (
+    "return Array.from(document.querySelectorAll('article.ReviewCard:not([data-scraped])'))"
+    ".map(function (el) { el.setAttribute('data-scraped', '1'); return el.outerHTML; });"
+)
+# Tags the current cards without reading them (replaying batches already stored when resuming)
+SKIP_REVIEW_CARDS_JS = (
+    "document.querySelectorAll('article.ReviewCard:not([data-scraped])')"
+    ".forEach(function (el) { el.setAttribute('data-scraped', '1'); });"
+)
+BATCH_LOAD_TIMEOUT = 10
+# "Show more reviews" clicks retried when another element intercepts them
+MAX_CLICK_RETRIES = 3
+
+# Batches of card HTML allowed to wait for the parse thread
+PARSE_QUEUE_DEPTH = 2
+
+def _parse_review_cards(cards_html):
+    """Parses ReviewCard fragments into review dicts carrying their fingerprints. Returns (reviews, seconds)."""
+    started = time.perf_counter()
+    reviews = extract_review_cards(''.join(cards_html))
+    for review in reviews:
+        _add_fingerprint(review)
+    return reviews, time.perf_counter() - started
+
+class _CardParser:
+    """
+    Parses batches of ReviewCard HTML in the order they are submitted. Threaded, the parsing runs
+    while the browser loads the next batch, with submitted batches waiting in a bounded queue;
+    otherwise result() parses inline.
+    """
 
-    finally:
-        driver.quit()
+    def __init__(self, threaded=True):
+        self._pending = queue.Queue(maxsize=PARSE_QUEUE_DEPTH)
+        self._results = queue.Queue()
+        self._thread = None
+        if threaded:
+            self._thread = threading.Thread(target=self._run, name='review-card-parser', daemon=True)
+            self._thread.start()
 
-def save_goodreads_reviews_to_db(book, reviews_data):
-    print(f"DEBUG: Processing {len(reviews_data)} reviews for book '{book.title}'")
-    
-    reviews_to_create = []
-    
-    for review_data in reviews_data:
-        # Check if a review with the same reviewer and date already exists for this book
-        if review_data.get('reviewer_name') and review_data.get('review_date'):
-            existing_review = Review.objects.filter(
-                book=book,
-                reviewer_name=review_data['reviewer_name'],
-                review_date=review_data['review_date']
-            ).first()
-
-            if existing_review:
-                print(f"INFO: Skipping duplicate review by '{review_data['reviewer_name']}' on {review_data['review_date']}.")
-                continue
-        
-        # If no duplicate is found, prepare the review for saving
-        rating_value = review_data.get('rating')
-        if rating_value is not None:
+    def _run(self):
+        while True:
+            cards_html = self._pending.get()
+            if cards_html is None:
+                return
             try:
-                rating_decimal = Decimal(str(rating_value))
-            except InvalidOperation:
-                rating_decimal = None
+                self._results.put((_parse_review_cards(cards_html), None))
+            except Exception as e:
+                self._results.put((None, e))
+
+    def submit(self, cards_html):
+        self._pending.put(cards_html)
+
+    def result(self):
+        """(reviews, parse seconds) for the oldest submitted batch, waiting for it if needed."""
+        if self._thread is None:
+            return _parse_review_cards(self._pending.get())
+        outcome, error = self._results.get()
+        if error is not None:
+            raise error
+        return outcome
+
+    def close(self):
+        if self._thread is not None:
+            self._pending.put(None)
+            self._thread.join()
+            self._thread = None
+
+def iter_goodreads_reviews_selenium(goodreads_id, max_reviews_to_scrape=50, watermark=None, resume=None):
+    """
+    Scrape Goodreads reviews across all paginated batches, yielding (reviews, state) per batch.
+    After each "Show more" click only the newly added ReviewCards are pulled from the browser
+    and parsed, so the cost per batch stays flat. With settings.GOODREADS_SELENIUM_PIPELINE
+    (the default) a batch is parsed on a separate thread while the browser already loads the
+    next one. Deduplicates by review fingerprint. The reviews page is asked for the newest
+    reviews first. A resume state replays its batches_done clicks without reading those cards again.
+    """
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.common.exceptions import NoSuchElementException, TimeoutException, ElementClickInterceptedException
+    from .driver_pool import get_driver_pool
+
+    state = dict(resume) if resume else new_scrape_state('selenium')
+    seen_keys = set()
+    order = _NewestFirstCheck()
+
+    # Lease a warm headless browser from the shared pool instead of starting Chrome per book
+    pool = get_driver_pool()
+    with pool.lease() as driver:
+        driver.get(reviews_page_url(goodreads_id))
+
+        WebDriverWait(driver, 10).until(EC.presence_of_all_elements_located((By.CLASS_NAME, 'ReviewCard')))
+
+        def show_more():
+            """Clicks "Show more reviews" and waits for new cards; returns the seconds waited, or None at the end."""
+            for _ in range(MAX_CLICK_RETRIES + 1):
+                try:
+                    load_more_button = WebDriverWait(driver, 6).until(
+                        EC.element_to_be_clickable((By.CSS_SELECTOR, "span[data-testid='loadMore']"))
+                    )
+                    driver.execute_script("arguments[0].scrollIntoView();", load_more_button)
+                    driver.execute_script("arguments[0].click();", load_more_button)
+                    wait_started = time.perf_counter()
+                    WebDriverWait(driver, BATCH_LOAD_TIMEOUT).until(
+                        lambda d: d.execute_script(HAS_NEW_REVIEW_CARDS_JS)
+                    )
+                    pool.record_page_load(driver)
+                    return time.perf_counter() - wait_started
+                except (NoSuchElementException, TimeoutException):
+                    print("No more 'Show more reviews' button; finished scraping all batches.")
+                    return None
+                except ElementClickInterceptedException:
+                    continue  # Try again
+            print("[INFO] 'Show more reviews' kept being intercepted; stopping.")
+            return None
+
+        if state['batches_done']:
+            print(f"[INFO] Resuming review scrape after batch {state['batches_done']} ({state['reviews_scraped']} reviews).")
+            for _ in range(state['batches_done']):
+                driver.execute_script(SKIP_REVIEW_CARDS_JS)
+                if show_more() is None:
+                    return
+
+        parser = _CardParser(threaded=getattr(settings, 'GOODREADS_SELENIUM_PIPELINE', True))
+        try:
+            wait_seconds = 0.0
+            while True:
+                # --- Pull only the cards added since the last batch and hand them to the parser
+                extract_started = time.perf_counter()
+                new_cards_html = driver.execute_script(NEW_REVIEW_CARDS_JS)
+                parser.submit(new_cards_html)
+                extract_seconds = time.perf_counter() - extract_started
+
+                # Load the next batch while this one is parsed, unless this batch may already reach the limit
+                prefetched = max_reviews_to_scrape == -1 or state['reviews_scraped'] + len(new_cards_html) < max_reviews_to_scrape
+                next_wait = show_more() if prefetched else None
+
+                stall_started = time.perf_counter()
+                batch_reviews, parse_seconds = parser.result()
+                stall_seconds = time.perf_counter() - stall_started
+
+                batch = ReviewBatch()
+                batch_known = 0
+                limit_reached = False
+                for review in batch_reviews:
+                    fingerprint = review['fingerprint']
+
+                    # --- Same fingerprint the database's unique (book, fingerprint) constraint uses
+                    if dedup_key(fingerprint) in seen_keys:
+                        continue
+                    seen_keys.add(dedup_key(fingerprint))
+                    order.see(review)
+                    if watermark and _is_known_review(review, watermark):
+                        batch_known += 1
+                        continue
+
+                    batch.append(review['review_text'], review['reviewer_name'], review['rating'], review['review_date'], fingerprint)
+                    if max_reviews_to_scrape != -1 and state['reviews_scraped'] + len(batch) >= max_reviews_to_scrape:
+                        limit_reached = True
+                        break
+
+                state['batches_done'] += 1
+                state['reviews_scraped'] += len(batch)
+                print(
+                    f"Batch {state['batches_done']}: Scraped {len(batch)} reviews, {state['reviews_scraped']} total "
+                    f"(wait {wait_seconds:.2f}s, extract {extract_seconds:.2f}s, parse {parse_seconds:.2f}s, "
+                    f"waited on parser {stall_seconds:.2f}s)."
+                )
+                yield batch, dict(state)
+
+                if limit_reached:
+                    print(f"Collected {state['reviews_scraped']} reviews (limit reached).")
+                    return
+                if watermark and order.holds and batch_known and not len(batch):
+                    print("Batch contained only already-stored reviews; incremental scrape caught up.")
+                    return
+
+                if not prefetched:
+                    next_wait = show_more()
+                if next_wait is None:
+                    break
+                wait_seconds = next_wait
+        finally:
+            parser.close()
+
+        print(f"Total reviews scraped across batches: {state['reviews_scraped']}")
+
+def store_review_batch(book, reviews_data):
+    """
+    Inserts scraped reviews for a book (a ReviewBatch or review dicts), skipping ones already
+    stored, and returns the number of new reviews. Dedup is set-based on the review fingerprint:
+    one query per chunk finds the fingerprints already present, and the insert ignores conflicts
+    on the unique (book, fingerprint) constraint in case a concurrent scraper stored the same
+    review in between; only the rows actually inserted are counted. Review instances are built
+    a chunk at a time. The book's BookStats are updated in the same transaction. Errors propagate.
+    """
+    batch = reviews_data if isinstance(reviews_data, ReviewBatch) else ReviewBatch.from_dicts(reviews_data)
+
+    # Dedup within the incoming batch first
+    incoming = {}
+    for i in range(len(batch)):
+        incoming.setdefault(batch.fingerprint(i), i)
+
+    created = []
+    fingerprints = list(incoming)
+    with transaction.atomic():
+        for start in range(0, len(fingerprints), REVIEW_INSERT_CHUNK_SIZE):
+            chunk = fingerprints[start:start + REVIEW_INSERT_CHUNK_SIZE]
+            existing = set(
+                Review.objects.filter(book=book, fingerprint__in=chunk).values_list('fingerprint', flat=True)
+            )
+            reviews_to_create = batch.to_reviews(book, [incoming[fingerprint] for fingerprint in chunk if fingerprint not in existing])
+            if reviews_to_create:
+                sentiment.score_reviews(reviews_to_create)
+                Review.objects.bulk_create(reviews_to_create, ignore_conflicts=True)
+                # Rows skipped as conflicts were stored by another scraper: keep only the rows
+                # carrying the created_at this insert gave them
+                ours = {review.fingerprint: review.created_at for review in reviews_to_create}
+                created.extend(
+                    review for review in Review.objects.filter(book=book, fingerprint__in=list(ours))
+                    if review.created_at == ours[review.fingerprint]
+                )
+        if created:
+            stats.apply_new_reviews(book, created)
+            update_review_watermarks([book.pk])
+            print(f"DEBUG: Successfully saved {len(created)} new reviews to the database.")
         else:
-            rating_decimal = None
-
-        sentiment_score = 0
-        sentiment_label = 'Neutral'
-        if review_data['review_text']:
-            sentiment_score = sid.polarity_scores(review_data['review_text'])['compound']
-            if sentiment_score >= 0.05:
-                sentiment_label = 'Positive'
-            elif sentiment_score <= -0.05:
-                sentiment_label = 'Negative'
-            else:
-                sentiment_label = 'Neutral'
-
-        reviews_to_create.append(Review(
-            book=book,
-            review_text=review_data['review_text'],
-            review_date=review_data.get('review_date'),
-            reviewer_name=review_data['reviewer_name'],
-            rating=rating_decimal,
-            sentiment_score=sentiment_score,
-            sentiment_label=sentiment_label
-        ))
+            print("DEBUG: No new reviews to save.")
+    return len(created)
 
+def save_goodreads_reviews_to_db(book, reviews_data):
+    """Stores reviews with store_review_batch, logging instead of raising on failure. Returns the number of new reviews."""
+    print(f"DEBUG: Processing {len(reviews_data)} reviews for book '{book.title}'")
     try:
-        with transaction.atomic():
-            if reviews_to_create:
-                Review.objects.bulk_create(reviews_to_create)
-                print(f"DEBUG: Successfully saved {len(reviews_to_create)} new reviews to the database.")
-            else:
-                print("DEBUG: No new reviews to save.")
+        return store_review_batch(book, reviews_data)
     except Exception as e:
-        print(f"ERROR: Failed to save reviews to the database. Reason: {e}")
\ No newline at end of file
+        print(f"ERROR: Failed to save reviews to the database. Reason: {e}")
+        return 0
@@ -0,0 +1,123 @@
+# In reviews/search.py
+#
+# Full-text search over reviews and books using the SQLite FTS5 tables created by migration
+# 0010_search_fts (kept in sync by triggers). Results are ranked by BM25 and carry highlighted
+# snippets.
+
+import re
+
+from django.db import DatabaseError, connection
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+# Markers snippet() puts around matched terms; swapped for <mark> after the text is escaped
+_HIGHLIGHT_START = '\x02'
+_HIGHLIGHT_END = '\x03'
+SNIPPET_TOKENS = 24
+
+# BM25 column weights: (review_text, reviewer_name) and (title, author, description)
+REVIEW_WEIGHTS = (1.0, 0.5)
+BOOK_WEIGHTS = (10.0, 5.0, 1.0)
+
+_QUERY_TERM = re.compile(r'"([^"]*)"|(\S+)')
+
+
+def is_available():
+    return connection.vendor == 'sqlite'
+
+
+def fts_query(text):
+    """
+    Turns user input into a safe FTS5 MATCH expression: "quoted phrases" stay phrases, other
+    words must all appear, and a trailing * makes a word a prefix match. FTS5 operators typed
+    by the user are treated as plain words. Returns '' when there is nothing to search for.
+    """
+    terms = []
+    for phrase, word in _QUERY_TERM.findall(text or ''):
+        if phrase:
+            tokens = re.findall(r'\w+', phrase)
+            if tokens:
+                terms.append('"' + ' '.join(tokens) + '"')
+        else:
+            prefix = word.endswith('*')
+            tokens = re.findall(r'\w+', word)
+            for token in tokens:
+                terms.append(f'"{token}"')
+            if prefix and tokens:
+                terms[-1] += '*'
+    return ' '.join(terms)
+
+
+def highlight(snippet):
+    """HTML-escapes a snippet() result and wraps the matched terms in <mark>."""
+    html = escape(snippet or '')
+    return mark_safe(html.replace(_HIGHLIGHT_START, '<mark>').replace(_HIGHLIGHT_END, '</mark>'))
+
+
+def _run(sql, params):
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            columns = [col[0] for col in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+    except DatabaseError as e:
+        print(f"[ERROR] Full-text search failed: {e}")
+        return []
+
+
+def search_reviews(query, book_id=None, sentiment=None, limit=20, offset=0):
+    """
+    Reviews matching query, best BM25 match first, optionally limited to one book and/or one
+    sentiment label. Each result is a dict of review fields plus the book title, a highlighted
+    `snippet` and the BM25 `rank` (lower is better).
+    """
+    match = fts_query(query)
+    if not match or not is_available():
+        return []
+
+    where = ['reviews_review_fts MATCH %s']
+    params = [match]
+    if book_id:
+        where.append('r.book_id = %s')
+        params.append(book_id)
+    if sentiment:
+        where.append('r.sentiment_label = %s')
+        params.append(sentiment)
+    sql = f"""
+        SELECT r.id, r.book_id, b.title AS book_title, r.reviewer_name, r.rating, r.review_date,
+               r.sentiment_label,
+               snippet(reviews_review_fts, 0, %s, %s, '…', {SNIPPET_TOKENS}) AS snippet,
+               bm25(reviews_review_fts, {', '.join(map(str, REVIEW_WEIGHTS))}) AS rank
+        FROM reviews_review_fts
+        JOIN reviews_review r ON r.id = reviews_review_fts.rowid
+        JOIN reviews_book b ON b.id = r.book_id
+        WHERE {' AND '.join(where)}
+        ORDER BY rank
+        LIMIT %s OFFSET %s
+    """
+    rows = _run(sql, [_HIGHLIGHT_START, _HIGHLIGHT_END] + params + [limit, offset])
+    for row in rows:
+        row['snippet'] = highlight(row['snippet'])
+    return rows
+
+
+def search_books(query, limit=10):
+    """Books whose title, author or description match query, best BM25 match first."""
+    match = fts_query(query)
+    if not match or not is_available():
+        return []
+
+    sql = f"""
+        SELECT b.id, b.title, b.author, b.cover_image_url, b.average_rating,
+               snippet(reviews_book_fts, 2, %s, %s, '…', {SNIPPET_TOKENS}) AS snippet,
+               bm25(reviews_book_fts, {', '.join(map(str, BOOK_WEIGHTS))}) AS rank
+        FROM reviews_book_fts
+        JOIN reviews_book b ON b.id = reviews_book_fts.rowid
+        WHERE reviews_book_fts MATCH %s
+        ORDER BY rank
+        LIMIT %s
+    """
+    rows = _run(sql, [_HIGHLIGHT_START, _HIGHLIGHT_END, match, limit])
+    for row in rows:
+        row['snippet'] = highlight(row['snippet'])
+    return rows
@@ -0,0 +1,223 @@
+# In reviews/sentiment.py
+#
+# Single entry point for review sentiment. Analyzers are looked up by name, results are cached
+# per (text hash, analyzer version) in SentimentScore, and large batches are scored across a
+# process pool. Kept free of model imports at module level so pool workers can import it
+# before Django is set up.
+
+import atexit
+import hashlib
+import multiprocessing
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+
+SENTIMENT_LABELS = ('Positive', 'Neutral', 'Negative')
+
+# Cache lookups / inserts per statement (stays under SQLite's bound-variable limit)
+CACHE_CHUNK_SIZE = 500
+# Texts handed to a pool worker at a time
+POOL_CHUNK_SIZE = 64
+
+
+# --- Analyzers
+
+class VaderAnalyzer:
+    """NLTK VADER compound score in [-1, 1]."""
+    name = 'vader'
+    version = 1
+    threshold = 0.05
+    strict_threshold = False
+
+    def __init__(self):
+        from nltk.sentiment import SentimentIntensityAnalyzer
+        self._sid = SentimentIntensityAnalyzer()
+
+    def score(self, text):
+        return self._sid.polarity_scores(text)['compound']
+
+
+class TextBlobAnalyzer:
+    """TextBlob pattern polarity in [-1, 1]. A polarity of exactly +/-0.1 stays Neutral, as it always has."""
+    name = 'textblob'
+    version = 2
+    threshold = 0.1
+    strict_threshold = True
+
+    def score(self, text):
+        from textblob import TextBlob
+        return TextBlob(text).sentiment.polarity
+
+
+class LexiconAnalyzer:
+    """Counts words from small positive/negative sets; score is (pos - neg) / (pos + neg)."""
+    name = 'lexicon'
+    version = 1
+    threshold = 0
+    strict_threshold = False
+
+    POSITIVE_WORDS = {'love', 'great', 'excellent', 'amazing', 'perfect', 'beautiful', 'wonderful', 'enjoyed', 'best'}
+    NEGATIVE_WORDS = {'hate', 'bad', 'terrible', 'awful', 'disappointing', 'boring', 'worst', 'confusing'}
+
+    def score(self, text):
+        words = re.findall(r'\w+', text.lower())
+        positive = sum(1 for word in words if word in self.POSITIVE_WORDS)
+        negative = sum(1 for word in words if word in self.NEGATIVE_WORDS)
+        if not positive and not negative:
+            return 0.0
+        return (positive - negative) / (positive + negative)
+
+
+ANALYZERS = {cls.name: cls for cls in (VaderAnalyzer, TextBlobAnalyzer, LexiconAnalyzer)}
+
+_instances = {}
+_instances_lock = threading.Lock()
+
+
+def default_analyzer():
+    return getattr(settings, 'SENTIMENT_ANALYZER', 'vader')
+
+
+def get_analyzer(name=None):
+    """Returns the (per-process, lazily built) analyzer instance registered under name."""
+    name = name or default_analyzer()
+    if name not in ANALYZERS:
+        raise ValueError(f"Unknown sentiment analyzer: {name}")
+    analyzer = _instances.get(name)
+    if analyzer is None:
+        with _instances_lock:
+            analyzer = _instances.get(name)
+            if analyzer is None:
+                analyzer = _instances[name] = ANALYZERS[name]()
+    return analyzer
+
+
+def analyzer_key(name=None):
+    """Cache key for an analyzer's results; bumping its version invalidates earlier scores."""
+    name = name or default_analyzer()
+    if name not in ANALYZERS:
+        raise ValueError(f"Unknown sentiment analyzer: {name}")
+    return f'{name}:{ANALYZERS[name].version}'
+
+
+def label_for(score, threshold, strict=False):
+    """Positive / Negative once score reaches +/-threshold (passes it, when strict), otherwise Neutral."""
+    if score > 0 and (score > threshold if strict else score >= threshold):
+        return 'Positive'
+    if score < 0 and (score < -threshold if strict else score <= -threshold):
+        return 'Negative'
+    return 'Neutral'
+
+
+def text_hash(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+# --- Scoring
+
+def _score_chunk(name, texts):
+    """Pool worker entry point: scores texts with the named analyzer and returns (score, label) pairs."""
+    analyzer = get_analyzer(name)
+    results = []
+    for text in texts:
+        score = analyzer.score(text)
+        results.append((round(score, 4), label_for(score, analyzer.threshold, analyzer.strict_threshold)))
+    return results
+
+
+_pool = None
+_pool_lock = threading.Lock()
+_processes = None
+
+
+def pool_size():
+    return _processes or getattr(settings, 'SENTIMENT_PROCESSES', None) or os.cpu_count() or 1
+
+
+def configure_pool(processes):
+    """Overrides settings.SENTIMENT_PROCESSES for this process (e.g. from a command-line flag)."""
+    global _processes
+    shutdown_pool()
+    _processes = processes
+
+
+def _get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ProcessPoolExecutor(max_workers=pool_size(), mp_context=multiprocessing.get_context('spawn'))
+                atexit.register(shutdown_pool)
+    return _pool
+
+
+def shutdown_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(cancel_futures=True)
+            _pool = None
+
+
+def _score_uncached(name, texts):
+    """Scores texts inline for small batches, or across the process pool once the batch is large enough."""
+    if len(texts) < getattr(settings, 'SENTIMENT_POOL_MIN_BATCH', 200) or pool_size() < 2:
+        return _score_chunk(name, texts)
+    chunks = [texts[i:i + POOL_CHUNK_SIZE] for i in range(0, len(texts), POOL_CHUNK_SIZE)]
+    results = []
+    for chunk_results in _get_pool().map(_score_chunk, [name] * len(chunks), chunks):
+        results.extend(chunk_results)
+    return results
+
+
+def score_texts(texts, analyzer=None):
+    """
+    Returns a (score, label) pair per text, in input order. Cached scores are read in one query
+    per chunk; the rest are scored (in a process pool for large batches) and written back.
+    Empty texts are Neutral with a score of 0 and never cached.
+    """
+    from .models import SentimentScore
+
+    name = analyzer or default_analyzer()
+    key = analyzer_key(name)
+    hashes = {}
+    for text in texts:
+        if text and text not in hashes:
+            hashes[text] = text_hash(text)
+
+    known = {}
+    unique_hashes = list(set(hashes.values()))
+    for start in range(0, len(unique_hashes), CACHE_CHUNK_SIZE):
+        rows = SentimentScore.objects.filter(analyzer=key, text_hash__in=unique_hashes[start:start + CACHE_CHUNK_SIZE])
+        for text_hash_value, score, label in rows.values_list('text_hash', 'score', 'label'):
+            known[text_hash_value] = (score, label)
+
+    missing = [text for text, digest in hashes.items() if digest not in known]
+    if missing:
+        scored = _score_uncached(name, missing)
+        rows = []
+        for text, (score, label) in zip(missing, scored):
+            known[hashes[text]] = (score, label)
+            rows.append(SentimentScore(text_hash=hashes[text], analyzer=key, score=score, label=label))
+        SentimentScore.objects.bulk_create(rows, batch_size=CACHE_CHUNK_SIZE, ignore_conflicts=True)
+        print(f"[DEBUG] Sentiment: scored {len(missing)} new texts with {key}, {len(hashes) - len(missing)} from cache.")
+
+    return [known[hashes[text]] if text else (0.0, 'Neutral') for text in texts]
+
+
+def analyze(text, analyzer=None):
+    """Scores a single text; returns (label, score)."""
+    score, label = score_texts([text], analyzer)[0]
+    return label, score
+
+
+def score_reviews(reviews, analyzer=None):
+    """Sets sentiment_score / sentiment_label on Review instances in place (does not save them)."""
+    results = score_texts([review.review_text or '' for review in reviews], analyzer)
+    for review, (score, label) in zip(reviews, results):
+        review.sentiment_score = score
+        review.sentiment_label = label
+    return reviews
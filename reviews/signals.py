@@ -0,0 +1,60 @@
+# In reviews/signals.py
+#
+# Invalidation for the cached book_list pages. Cached pages are keyed by a catalogue version
+# number; any change to a book, its reviews or its stats bumps the version (once the
+# transaction commits), so stale pages are simply never read again and expire on their own.
+# Saved and deleted books are also passed on to the in-process title index (reviews.title_index).
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import title_index
+from .models import Book, BookStats, Review
+
+CATALOGUE_VERSION_KEY = 'book_list:version'
+
+
+def catalogue_version():
+    version = cache.get(CATALOGUE_VERSION_KEY)
+    if version is None:
+        cache.add(CATALOGUE_VERSION_KEY, 1, timeout=None)
+        version = cache.get(CATALOGUE_VERSION_KEY, 1)
+    return version
+
+
+def _bump_version():
+    try:
+        cache.incr(CATALOGUE_VERSION_KEY)
+    except ValueError:
+        cache.set(CATALOGUE_VERSION_KEY, 1, timeout=None)
+
+
+def invalidate_catalogue():
+    """
+    Drops every cached book_list page. Called from the signals below and by code that changes
+    books or reviews without sending them (bulk_create, QuerySet.update).
+    """
+    transaction.on_commit(_bump_version)
+
+
+@receiver(post_save, sender=Book)
+@receiver(post_delete, sender=Book)
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+@receiver(post_save, sender=BookStats)
+@receiver(post_delete, sender=BookStats)
+def _catalogue_changed(sender, **kwargs):
+    invalidate_catalogue()
+
+
+@receiver(post_save, sender=Book)
+def _book_saved(sender, instance, **kwargs):
+    transaction.on_commit(lambda: title_index.add_book(instance))
+
+
+@receiver(post_delete, sender=Book)
+def _book_deleted(sender, instance, **kwargs):
+    book_id = instance.pk
+    transaction.on_commit(lambda: title_index.remove_book(book_id))
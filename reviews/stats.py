@@ -0,0 +1,120 @@
+# In reviews/stats.py
+
+import math
+
+from django.db.models import Count, F, Max, Q, Sum
+
+from .models import Book, BookStats
+from .signals import invalidate_catalogue
+
+SENTIMENT_FIELDS = {'Positive': 'positive_count', 'Neutral': 'neutral_count', 'Negative': 'negative_count'}
+STAT_FIELDS = [
+    'review_count', 'positive_count', 'neutral_count', 'negative_count',
+    'rating_1_count', 'rating_2_count', 'rating_3_count', 'rating_4_count', 'rating_5_count',
+    'rating_count', 'rating_sum', 'latest_review_date',
+]
+# Books recomputed per aggregate query by recompute_book_stats
+RECOMPUTE_CHUNK_SIZE = 500
+
+
+def rating_bucket(rating):
+    """Whole-star bucket (1-5) for a stored rating, rounding halves up."""
+    return min(5, max(1, math.floor(float(rating) + 0.5)))
+
+
+def apply_new_reviews(book, reviews):
+    """
+    Adds freshly inserted Review instances to the book's stats with a single UPDATE of F()
+    increments, so concurrent ingests for the same book compose. Call inside the ingest
+    transaction, after the reviews are written.
+    """
+    if not reviews:
+        return
+    deltas = {'review_count': len(reviews)}
+    rating_sum = 0.0
+    latest = None
+    for review in reviews:
+        label_field = SENTIMENT_FIELDS.get(review.sentiment_label)
+        if label_field:
+            deltas[label_field] = deltas.get(label_field, 0) + 1
+        if review.rating is not None:
+            bucket_field = f'rating_{rating_bucket(review.rating)}_count'
+            deltas[bucket_field] = deltas.get(bucket_field, 0) + 1
+            deltas['rating_count'] = deltas.get('rating_count', 0) + 1
+            rating_sum += float(review.rating)
+        review_date = review.review_date.date() if hasattr(review.review_date, 'date') else review.review_date
+        if review_date and (latest is None or review_date > latest):
+            latest = review_date
+
+    stats, created = BookStats.objects.get_or_create(book=book)
+    if created and book.reviews.count() != len(reviews):
+        # The book had reviews before stats existed; count everything once instead of adding
+        recompute_book_stats([book.pk])
+        return
+
+    invalidate_catalogue()
+    updates = {field: F(field) + value for field, value in deltas.items()}
+    if rating_sum:
+        updates['rating_sum'] = F('rating_sum') + rating_sum
+    BookStats.objects.filter(book=book).update(**updates)
+    if latest:
+        BookStats.objects.filter(book=book).filter(
+            Q(latest_review_date__isnull=True) | Q(latest_review_date__lt=latest)
+        ).update(latest_review_date=latest)
+
+
+def _aggregate(books):
+    bucket = lambda stars: Q(reviews__rating__gte=stars - 0.5, reviews__rating__lt=stars + 0.5)
+    return books.annotate(
+        stat_review_count=Count('reviews'),
+        stat_positive_count=Count('reviews', filter=Q(reviews__sentiment_label='Positive')),
+        stat_neutral_count=Count('reviews', filter=Q(reviews__sentiment_label='Neutral')),
+        stat_negative_count=Count('reviews', filter=Q(reviews__sentiment_label='Negative')),
+        stat_rating_1_count=Count('reviews', filter=Q(reviews__rating__lt=1.5)),
+        stat_rating_2_count=Count('reviews', filter=bucket(2)),
+        stat_rating_3_count=Count('reviews', filter=bucket(3)),
+        stat_rating_4_count=Count('reviews', filter=bucket(4)),
+        stat_rating_5_count=Count('reviews', filter=Q(reviews__rating__gte=4.5)),
+        stat_rating_count=Count('reviews__rating'),
+        stat_rating_sum=Sum('reviews__rating'),
+        stat_latest_review_date=Max('reviews__review_date'),
+    ).values('pk', *[f'stat_{field}' for field in STAT_FIELDS])
+
+
+def recompute_book_stats(book_ids=None, apps=None):
+    """
+    Rebuilds BookStats from the Review table with one grouped aggregate query per chunk of
+    books and upserts the rows. book_ids=None recomputes every book. Returns the number of
+    books written. Pass a migration's apps registry to run with its historical models.
+    """
+    book_model = apps.get_model('reviews', 'Book') if apps else Book
+    stats_model = apps.get_model('reviews', 'BookStats') if apps else BookStats
+    if book_ids is None:
+        book_ids = list(book_model.objects.order_by('pk').values_list('pk', flat=True))
+    else:
+        book_ids = sorted(set(book_ids))
+
+    written = 0
+    for start in range(0, len(book_ids), RECOMPUTE_CHUNK_SIZE):
+        chunk = book_ids[start:start + RECOMPUTE_CHUNK_SIZE]
+        rows = []
+        for row in _aggregate(book_model.objects.filter(pk__in=chunk)):
+            values = {field: row[f'stat_{field}'] for field in STAT_FIELDS}
+            values['rating_sum'] = float(values['rating_sum'] or 0)
+            rows.append(stats_model(book_id=row['pk'], **values))
+        stats_model.objects.bulk_create(
+            rows, update_conflicts=True, unique_fields=['book'], update_fields=STAT_FIELDS + ['updated_at']
+        )
+        written += len(rows)
+    if written:
+        invalidate_catalogue()
+    return written
+
+
+def get_book_stats(book):
+    """The book's stats row, built on first access for books stored before stats existed."""
+    try:
+        return book.stats
+    except BookStats.DoesNotExist:
+        recompute_book_stats([book.pk])
+        return BookStats.objects.get(book=book)
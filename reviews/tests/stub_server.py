@@ -0,0 +1,91 @@
+# In reviews/tests/stub_server.py
+#
+# Local stand-in for Goodreads: serves recorded fixture pages over http.server on a free port,
+# so the scrapers run their real HTTP code paths in tests without touching the network.
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+FIXTURES_DIR = Path(__file__).resolve().parent / 'fixtures'
+
+
+def fixture(name):
+    return (FIXTURES_DIR / name).read_bytes()
+
+
+class StubGoodreads:
+    """
+    Context manager running a stub server in a background thread. get_routes maps a path to a
+    fixture name (served as HTML); graphql_pages maps a GraphQL pagination token to a fixture
+    name (served as JSON from POST /graphql); scripted maps a path to a list of (status,
+    headers, body bytes) answers handed out one per GET before get_routes applies. Every
+    request is recorded in .requests as (method, path, headers, parsed JSON body or None).
+    """
+
+    def __init__(self, get_routes=None, graphql_pages=None, scripted=None):
+        self.get_routes = dict(get_routes or {})
+        self.graphql_pages = dict(graphql_pages or {})
+        self.scripted = {path: list(answers) for path, answers in (scripted or {}).items()}
+        self.requests = []
+        self._server = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    @property
+    def graphql_url(self):
+        return f'{self.url}/graphql'
+
+    def requests_for(self, method):
+        return [request for request in self.requests if request[0] == method]
+
+    def __enter__(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _reply(self, status, content_type, body, headers=None):
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                stub.requests.append(('GET', self.path, dict(self.headers), None))
+                if stub.scripted.get(self.path):
+                    status, headers, body = stub.scripted[self.path].pop(0)
+                    self._reply(status, 'text/html; charset=utf-8', body, headers)
+                    return
+                name = stub.get_routes.get(self.path)
+                if name is None:
+                    self._reply(404, 'text/html', b'<html><body>Not found</body></html>')
+                else:
+                    self._reply(200, 'text/html; charset=utf-8', fixture(name))
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                payload = json.loads(self.rfile.read(length) or b'null')
+                stub.requests.append(('POST', self.path, dict(self.headers), payload))
+                token = ((payload or {}).get('variables') or {}).get('pagination', {}).get('after')
+                name = stub.graphql_pages.get(token) if self.path == '/graphql' else None
+                if name is None:
+                    self._reply(404, 'application/json', b'{"errors": [{"message": "unknown page"}]}')
+                else:
+                    self._reply(200, 'application/json', fixture(name))
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,88 @@
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TestCase, TransactionTestCase
+
+from reviews.book_merge import find_duplicate_groups
+from reviews.models import Book, BookStats, Review
+
+
+def review(book, fingerprint, rating=4):
+    return Review(book=book, fingerprint=fingerprint, review_text=f'Text {fingerprint}', reviewer_name='Reader',
+                  rating=Decimal(rating), review_date=date(2024, 1, 1), source_website='goodreads')
+
+
+class MergeDuplicateBooksTests(TestCase):
+    def setUp(self):
+        # bulk_create skips Book.save(), leaving the normalized key columns empty like rows
+        # stored before they existed
+        self.older, self.with_id, self.other, self.untitled, self.untitled_too = Book.objects.bulk_create([
+            Book(title='The Hobbit', author='J. R. R. Tolkien', description='A hobbit goes there and back again.'),
+            Book(title='the hobbit ', author='j. r. r. tolkien', goodreads_id='5907'),
+            Book(title='The Hobbit', author='Someone Else'),
+            Book(title=''),
+            Book(title=''),
+        ])
+        Review.objects.bulk_create([
+            review(self.older, 'a' * 64), review(self.older, 'b' * 64, rating=2),
+            review(self.with_id, 'b' * 64, rating=2), review(self.with_id, 'c' * 64),
+        ])
+
+    def test_groups_by_computed_key_even_when_stored_keys_are_empty(self):
+        self.assertEqual(Book.objects.filter(normalized_title='').count(), 5)
+        self.assertEqual(find_duplicate_groups(), {self.with_id.pk: [self.older.pk]})
+
+    def test_merge_moves_reviews_drops_duplicates_and_fills_fields(self):
+        call_command('merge_duplicate_books', stdout=StringIO())
+
+        self.assertFalse(Book.objects.filter(pk=self.older.pk).exists())
+        survivor = Book.objects.get(pk=self.with_id.pk)
+        self.assertEqual(survivor.description, 'A hobbit goes there and back again.')
+        self.assertEqual(sorted(survivor.reviews.values_list('fingerprint', flat=True)), ['a' * 64, 'b' * 64, 'c' * 64])
+        stats = BookStats.objects.get(book=survivor)
+        self.assertEqual((stats.review_count, stats.rating_count), (3, 3))
+        self.assertTrue(Book.objects.filter(pk=self.other.pk).exists())
+
+    def test_dry_run_changes_nothing(self):
+        call_command('merge_duplicate_books', '--dry-run', stdout=StringIO())
+        self.assertEqual(Book.objects.count(), 5)
+        self.assertEqual(Review.objects.count(), 4)
+
+
+class MergeOnUpgradeMigrationTests(TransactionTestCase):
+    """Upgrading a database holding duplicate books merges them before the key becomes unique."""
+
+    migrate_from = [('reviews', '0011_backfill_book_normalized_keys')]
+
+    def setUp(self):
+        executor = MigrationExecutor(connection)
+        self.migrate_to = [executor.loader.graph.leaf_nodes('reviews')[0]]
+        executor.migrate(self.migrate_from)
+        self.old_apps = executor.loader.project_state(self.migrate_from).apps
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(self.migrate_to)
+
+    def test_duplicates_are_merged_during_migrate(self):
+        OldBook = self.old_apps.get_model('reviews', 'Book')
+        OldReview = self.old_apps.get_model('reviews', 'Review')
+        older = OldBook.objects.create(title='The Hobbit', normalized_title='the hobbit', description='There and back.')
+        with_id = OldBook.objects.create(title='the hobbit', normalized_title='the hobbit', goodreads_id='5907')
+        OldReview.objects.create(book=older, fingerprint='a' * 64, review_text='a', rating=5)
+        OldReview.objects.create(book=older, fingerprint='b' * 64, review_text='b', rating=3)
+        OldReview.objects.create(book=with_id, fingerprint='b' * 64, review_text='b', rating=3)
+
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(self.migrate_to)
+
+        survivor = Book.objects.get()
+        self.assertEqual((survivor.pk, survivor.description), (with_id.pk, 'There and back.'))
+        self.assertEqual(survivor.reviews.count(), 2)
+        self.assertEqual(BookStats.objects.get(book=survivor).rating_sum, 8)
@@ -0,0 +1,51 @@
+from datetime import date
+from io import StringIO
+from unittest import mock
+
+from django.test import TestCase
+
+from reviews.models import Book, BookStats, Review
+from reviews.scraper import create_or_update_book_record
+from reviews.utils import normalize_author
+
+
+class BookRecordTests(TestCase):
+    def setUp(self):
+        quiet = mock.patch('sys.stdout', new_callable=StringIO)
+        quiet.start()
+        self.addCleanup(quiet.stop)
+
+    def record(self, **raw):
+        return create_or_update_book_record(raw, 'goodreads')
+
+    def test_missing_author_is_filled_with_its_normalized_key(self):
+        book = Book.objects.create(title='The Hobbit', goodreads_id='5907')
+
+        found = self.record(goodreads_id='5907', title='The Hobbit', author='J.R.R. Tolkien', description='Hobbits.')
+
+        self.assertEqual(found.pk, book.pk)
+        book.refresh_from_db()
+        self.assertEqual((book.author, book.normalized_author), ('J.R.R. Tolkien', normalize_author('J.R.R. Tolkien')))
+        self.assertEqual(book.description, 'Hobbits.')
+        self.assertEqual(self.record(title='the hobbit', author='j.r.r. tolkien ').pk, book.pk)
+
+    def test_stored_author_is_kept(self):
+        book = Book.objects.create(title='The Hobbit', author='Tolkien', goodreads_id='5907')
+        self.record(goodreads_id='5907', title='The Hobbit', author='Someone Else')
+        book.refresh_from_db()
+        self.assertEqual((book.author, book.normalized_author), ('Tolkien', normalize_author('Tolkien')))
+
+    def test_filled_author_that_duplicates_another_book_merges_into_it(self):
+        with_author = Book.objects.create(title='The Hobbit', author='J.R.R. Tolkien')
+        without_author = Book.objects.create(title='The Hobbit', goodreads_id='5907')
+        for book, fingerprint in ((with_author, 'a' * 64), (without_author, 'b' * 64)):
+            Review.objects.create(book=book, fingerprint=fingerprint, review_text=fingerprint, rating=4,
+                                  review_date=date(2024, 1, 1))
+
+        found = self.record(goodreads_id='5907', title='The Hobbit', author='J.R.R. Tolkien', description='Hobbits.')
+
+        self.assertEqual(found.pk, with_author.pk)
+        self.assertFalse(Book.objects.filter(pk=without_author.pk).exists())
+        self.assertEqual((found.goodreads_id, found.description), ('5907', 'Hobbits.'))
+        self.assertEqual(found.reviews.count(), 2)
+        self.assertEqual(BookStats.objects.get(book=found).review_count, 2)
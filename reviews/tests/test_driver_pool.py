@@ -0,0 +1,62 @@
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from reviews.driver_pool import DriverPool, PooledDriver
+
+
+class FakeDriver:
+    def __init__(self):
+        self.quit_called = False
+
+    def execute_script(self, script):
+        return 1
+
+    def get(self, url):
+        pass
+
+    def quit(self):
+        self.quit_called = True
+
+
+class DriverPoolTests(SimpleTestCase):
+    def setUp(self):
+        self.pool = DriverPool(size=1, max_pages=4, max_rss_mb=10 ** 6)
+        patcher = mock.patch.object(DriverPool, '_create', autospec=True, side_effect=self.create)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.pool.close)
+
+    def create(self, pool):
+        pooled = PooledDriver(FakeDriver())
+        pool._all.add(pooled)
+        return pooled
+
+    def test_show_more_loads_count_towards_max_pages(self):
+        with self.pool.lease() as driver:
+            for _ in range(2):
+                self.pool.record_page_load(driver)
+        self.assertFalse(driver.quit_called)
+        # The next lease's first page is the fourth load
+        with self.pool.lease() as reused:
+            self.assertIs(reused, driver)
+        self.assertTrue(driver.quit_called)
+
+        with self.pool.lease() as fresh:
+            self.assertIsNot(fresh, driver)
+
+    def test_one_long_scrape_is_recycled_after_its_lease(self):
+        with self.pool.lease() as driver:
+            for _ in range(200):
+                self.pool.record_page_load(driver)
+            self.assertFalse(driver.quit_called)
+        self.assertTrue(driver.quit_called)
+
+    def test_loads_reported_outside_a_lease_are_ignored(self):
+        with self.pool.lease() as driver:
+            pass
+        self.pool.record_page_load(driver)
+        self.pool.record_page_load(FakeDriver())
+        with self.pool.lease() as reused:
+            self.assertIs(reused, driver)
+        self.assertFalse(driver.quit_called)
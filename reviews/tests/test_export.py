@@ -0,0 +1,133 @@
+import csv
+import io
+import json
+import os
+import tempfile
+from datetime import date
+from decimal import Decimal
+from unittest import skipUnless
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from reviews import export
+from reviews.models import Book, ExportCursor, Review
+
+
+def export_to_file(*args, extension='jsonl'):
+    """Runs export_reviews into a temporary file and returns its bytes (or None if none was written)."""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, f'out.{extension}')
+        call_command('export_reviews', '-o', path, *args, stderr=io.StringIO())
+        if not os.path.exists(path):
+            return None
+        with open(path, 'rb') as f:
+            return f.read()
+
+
+def jsonl_rows(data):
+    return [json.loads(line) for line in data.decode('utf-8').splitlines()]
+
+
+class ExportReviewsCommandTests(TestCase):
+    def setUp(self):
+        self.book = Book.objects.create(title='Exported, "Quoted" Book', author='A. Writer', goodreads_id='77')
+        self.other = Book.objects.create(title='Other Book', author='B. Writer', goodreads_id='78')
+        for i in range(7):
+            self.add_review(self.book if i % 2 else self.other, i)
+
+    def add_review(self, book, i):
+        return Review.objects.create(
+            book=book, fingerprint=f'{i:064x}', review_text=f'Line {i}\nwith, comma ü', reviewer_name=f'Reader {i}',
+            rating=Decimal(i % 5 + 1) if i % 3 else None, review_date=date(2024, 1, i + 1),
+            sentiment_label=('Positive', 'Neutral', 'Negative')[i % 3], sentiment_score=Decimal('0.25'),
+        )
+
+    def test_jsonl_export_in_small_chunks(self):
+        rows = jsonl_rows(export_to_file('--chunk-size', '2'))
+        self.assertEqual([row['review_id'] for row in rows], sorted(Review.objects.values_list('id', flat=True)))
+        self.assertEqual(rows[1]['book_title'], 'Exported, "Quoted" Book')
+        self.assertEqual(rows[1]['review_text'], 'Line 1\nwith, comma ü')
+        self.assertIsNone(rows[0]['rating'])
+        self.assertEqual(rows[1]['rating'], 2.0)
+
+    def test_csv_export_with_filters(self):
+        data = export_to_file('--book', str(self.book.pk), '--from', '2024-01-03', '--sentiment', 'Positive',
+                              extension='csv')
+        rows = list(csv.DictReader(io.StringIO(data.decode('utf-8'))))
+        self.assertEqual([row['reviewer_name'] for row in rows], ['Reader 3'])
+        self.assertEqual(rows[0]['review_text'], 'Line 3\nwith, comma ü')
+
+    @skipUnless(export.parquet_available(), 'pyarrow is not installed')
+    def test_parquet_export_has_a_row_group_per_chunk(self):
+        import pyarrow.parquet as pq
+
+        parquet = pq.ParquetFile(io.BytesIO(export_to_file('--chunk-size', '3', extension='parquet')))
+        self.assertEqual((parquet.metadata.num_rows, parquet.num_row_groups), (7, 3))
+        table = parquet.read()
+        self.assertEqual(table.column('review_date').to_pylist()[0], date(2024, 1, 1))
+
+    def test_since_last_exports_only_new_reviews(self):
+        self.assertEqual(len(jsonl_rows(export_to_file('--since-last', 'nightly'))), 7)
+        cursor = ExportCursor.objects.get(name='nightly')
+        self.assertEqual((cursor.last_review_id, cursor.rows_exported), (export.latest_review_id(), 7))
+
+        # Nothing new: no file is written and the cursor stays where it is
+        self.assertIsNone(export_to_file('--since-last', 'nightly'))
+        self.assertEqual(ExportCursor.objects.get(name='nightly').last_review_id, cursor.last_review_id)
+
+        new = self.add_review(self.book, 8)
+        self.assertEqual([row['review_id'] for row in jsonl_rows(export_to_file('--since-last', 'nightly'))], [new.pk])
+
+    def test_cursor_never_moves_back(self):
+        export_to_file('--since-last', 'nightly')
+        position = ExportCursor.objects.get(name='nightly').last_review_id
+        Review.objects.all().delete()
+
+        self.assertIsNone(export_to_file('--since-last', 'nightly'))
+        export.advance_cursor('nightly', 0, 0)
+        self.assertEqual(ExportCursor.objects.get(name='nightly').last_review_id, position)
+
+    def test_empty_table_writes_nothing(self):
+        Review.objects.all().delete()
+        self.assertIsNone(export_to_file())
+
+
+@override_settings(REVIEW_EXPORT_HTTP_ENABLED=True, ALLOWED_HOSTS=['testserver'])
+class ExportReviewsEndpointTests(TestCase):
+    def setUp(self):
+        self.book = Book.objects.create(title='Exported Book', author='A. Writer', goodreads_id='77')
+        self.reviews = [
+            Review.objects.create(book=self.book, fingerprint=f'{i:064x}', review_text=f'Review {i}',
+                                  reviewer_name=f'Reader {i}', review_date=date(2024, 2, i + 1))
+            for i in range(3)
+        ]
+
+    def get(self, query):
+        return self.client.get(f'/reviews/export/reviews.jsonl?{query}')
+
+    def test_streams_filtered_reviews_with_next_after_id(self):
+        response = self.get(f'book={self.book.pk}')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(jsonl_rows(b''.join(response.streaming_content))), 3)
+        self.assertEqual(response['X-Export-Last-Id'], str(self.reviews[-1].pk))
+
+        response = self.get(f'book={self.book.pk}&after_id={response["X-Export-Last-Id"]}')
+        self.assertEqual(b''.join(response.streaming_content), b'')
+        self.assertEqual(response['X-Export-Last-Id'], str(self.reviews[-1].pk))
+
+    def test_after_id_beyond_the_table_is_not_moved_back(self):
+        response = self.get(f'book={self.book.pk}&after_id={self.reviews[-1].pk + 100}')
+        self.assertEqual(response['X-Export-Last-Id'], str(self.reviews[-1].pk + 100))
+
+    def test_unfiltered_and_invalid_requests_are_rejected(self):
+        self.assertEqual(self.get('').status_code, 400)
+        self.assertEqual(self.get('sentiment=Positive').status_code, 400)
+        self.assertEqual(self.get('from=2024-13-01').status_code, 400)
+        self.assertEqual(self.get(f'book={self.book.pk}&sentiment=happy').status_code, 400)
+        self.assertEqual(self.client.get(f'/reviews/export/reviews.xml?book={self.book.pk}').status_code, 404)
+        self.assertEqual(self.get('from=2024-02-02').status_code, 200)
+
+    @override_settings(REVIEW_EXPORT_HTTP_ENABLED=False)
+    def test_disabled_by_setting(self):
+        self.assertEqual(self.get(f'book={self.book.pk}').status_code, 404)
@@ -0,0 +1,78 @@
+from datetime import datetime
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import SimpleTestCase
+
+from reviews.extractors import (
+    extract_book_metadata, extract_next_data, extract_review_cards, extract_search_results, html_to_text,
+)
+from reviews.parsing import available_backends
+from reviews.tests.stub_server import FIXTURES_DIR, fixture
+
+SEARCH_PAGE = 'goodreads/search_results_page.html'
+BOOK_PAGE = 'goodreads/book_page.html'
+REVIEW_CARDS = 'goodreads/review_cards.html'
+REVIEWS_PAGE = 'goodreads/book_reviews_page.html'
+
+
+def page(name):
+    return fixture(name).decode('utf-8')
+
+
+class ExtractorBackendTests(SimpleTestCase):
+    """Every installed parser backend must read the saved Goodreads pages identically."""
+
+    def assert_same_for_every_backend(self, extractor, html, expected):
+        for backend in available_backends():
+            with self.subTest(backend=backend):
+                self.assertEqual(extractor(html, backend), expected)
+
+    def test_search_results(self):
+        self.assert_same_for_every_backend(extract_search_results, page(SEARCH_PAGE), [
+            ('5907', 'The Hobbit, or There and Back Again', 'J.R.R. Tolkien'),
+            ('31198930', 'Study Guide: The Hobbit & Its World', 'SuperSummary'),
+            ('15241', 'The Annotated Hobbit', ''),
+        ])
+        self.assert_same_for_every_backend(extract_search_results, '<html><body>No results.</body></html>', None)
+
+    def test_book_metadata(self):
+        self.assert_same_for_every_backend(extract_book_metadata, page(BOOK_PAGE), {
+            'title': 'The Hobbit',
+            'author': 'J.R.R. Tolkien',
+            'average_rating': Decimal('4.29'),
+            'num_ratings': 4170392,
+            'num_reviews': 78201,
+            'cover_image_url': 'https://images.test/5907.jpg',
+            'description': 'In a hole in the ground there lived a hobbit. Not a nasty, dirty, wet hole & not a dry, '
+                           'bare, sandy hole.It was a hobbit-hole, and that means comfort.',
+        })
+
+    def test_book_metadata_without_page_columns(self):
+        html = '<html><body><h1 class="Text__title1">Bare Page</h1></body></html>'
+        self.assert_same_for_every_backend(extract_book_metadata, html, {
+            'title': 'Bare Page', 'author': None, 'cover_image_url': None,
+        })
+
+    def test_review_cards(self):
+        # Inline tags are joined without a space, as the fingerprints of stored reviews expect
+        self.assert_same_for_every_backend(extract_review_cards, page(REVIEW_CARDS), [
+            {'review_text': 'Slow start, butworth it.Would read again & again.', 'review_date': datetime(2024, 3, 2),
+             'reviewer_name': 'Ada Reader', 'rating': Decimal('4')},
+            {'review_text': 'Not for me.', 'review_date': None, 'reviewer_name': 'Bram', 'rating': None},
+        ])
+        self.assert_same_for_every_backend(extract_review_cards, '', [])
+
+    def test_next_data_and_text(self):
+        html = page(REVIEWS_PAGE)
+        expected = html[html.index('>', html.index('id="__NEXT_DATA__"')) + 1:html.index('</script>')]
+        self.assert_same_for_every_backend(extract_next_data, html, expected)
+        self.assert_same_for_every_backend(html_to_text, '<p>Great &amp; <i>odd</i>.</p>', 'Great &odd.')
+
+    def test_bench_parsers_reports_agreement_on_the_saved_pages(self):
+        out = StringIO()
+        call_command('bench_parsers', f'search:{FIXTURES_DIR / SEARCH_PAGE}', f'book:{FIXTURES_DIR / BOOK_PAGE}',
+                     f'reviews:{FIXTURES_DIR / REVIEW_CARDS}', '--repeat', '1', stdout=out)
+        self.assertEqual(out.getvalue().count('same output'), 3 * len(available_backends()))
+        self.assertNotIn('OUTPUT DIFFERS', out.getvalue())
@@ -0,0 +1,119 @@
+import os
+import tempfile
+import time
+
+import requests
+from django.test import SimpleTestCase, override_settings
+
+from reviews import http_cache
+
+REVIEWS_URL = 'https://www.goodreads.com/book/show/5907.The_Hobbit/reviews'
+UNCACHED_URL = 'https://www.goodreads.com/user/show/1'
+
+
+def response(status, body=b'', headers=None):
+    r = requests.Response()
+    r.status_code = status
+    r.headers.update(headers or {})
+    r.encoding = 'utf-8'
+    r._content = body
+    return r
+
+
+class Origin:
+    """Fake send() for cached_get: answers from a queue and records the conditional headers it got."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.sent = []
+
+    def __call__(self, headers):
+        self.sent.append(headers)
+        return self.responses.pop(0)
+
+
+@override_settings(HTTP_CACHE_ENABLED=True, HTTP_CACHE_OFFLINE=False, HTTP_CACHE_MAX_BYTES=1024 * 1024)
+class HttpCacheTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        cache_dir = self.settings(HTTP_CACHE_DIR=directory.name)
+        cache_dir.enable()
+        self.addCleanup(cache_dir.disable)
+        http_cache._total_bytes = None
+        self.addCleanup(setattr, http_cache, '_total_bytes', None)
+        http_cache.reset_stats()
+
+    def age_entry(self, url, seconds):
+        meta, _ = http_cache._load(url)
+        meta['stored_at'] -= seconds
+        http_cache._touch(url, meta)
+
+    def test_fresh_entry_is_served_without_a_request(self):
+        origin = Origin(response(200, b'<html>page</html>', {'ETag': '"v1"', 'Content-Type': 'text/html'}))
+        first = http_cache.cached_get(REVIEWS_URL, origin)
+        second = http_cache.cached_get(REVIEWS_URL, origin)
+
+        self.assertEqual(len(origin.sent), 1)
+        self.assertEqual(second.content, first.content)
+        self.assertTrue(second.from_cache)
+        self.assertEqual(second.headers['content-type'], 'text/html')
+        self.assertEqual(http_cache.cache_stats()['hits'], 1)
+
+    def test_stale_entry_is_revalidated(self):
+        origin = Origin(
+            response(200, b'v1', {'ETag': '"v1"', 'Last-Modified': 'Mon, 01 Jan 2024 00:00:00 GMT'}),
+            response(304),
+            response(200, b'v2', {'ETag': '"v2"'}),
+        )
+        http_cache.cached_get(REVIEWS_URL, origin)
+        self.age_entry(REVIEWS_URL, 7 * 3600)
+
+        revalidated = http_cache.cached_get(REVIEWS_URL, origin)
+        self.assertEqual(origin.sent[1], {'If-None-Match': '"v1"', 'If-Modified-Since': 'Mon, 01 Jan 2024 00:00:00 GMT'})
+        self.assertEqual((revalidated.status_code, revalidated.content), (200, b'v1'))
+        # The 304 renewed the entry, so it is fresh again
+        http_cache.cached_get(REVIEWS_URL, origin)
+        self.assertEqual(len(origin.sent), 2)
+
+        self.age_entry(REVIEWS_URL, 7 * 3600)
+        self.assertEqual(http_cache.cached_get(REVIEWS_URL, origin).content, b'v2')
+        self.assertEqual(http_cache.cached_get(REVIEWS_URL, origin).content, b'v2')
+        self.assertEqual(http_cache.cache_stats()['revalidated'], 1)
+
+    def test_errors_and_unlisted_urls_are_not_stored(self):
+        origin = Origin(response(503), response(200, b'ok'), response(200, b'a'), response(200, b'b'))
+        self.assertEqual(http_cache.cached_get(REVIEWS_URL, origin).status_code, 503)
+        self.assertEqual(http_cache.cached_get(REVIEWS_URL, origin).content, b'ok')
+
+        self.assertIsNone(http_cache.ttl_for(UNCACHED_URL))
+        http_cache.cached_get(UNCACHED_URL, origin)
+        self.assertEqual(http_cache.cached_get(UNCACHED_URL, origin).content, b'b')
+        self.assertEqual(len(origin.sent), 4)
+
+    def test_offline_mode_serves_stale_entries_and_never_sends(self):
+        http_cache.cached_get(REVIEWS_URL, Origin(response(200, b'cached')))
+        self.age_entry(REVIEWS_URL, 30 * 24 * 3600)
+
+        origin = Origin()
+        with self.settings(HTTP_CACHE_OFFLINE=True):
+            self.assertEqual(http_cache.cached_get(REVIEWS_URL, origin).content, b'cached')
+            with self.assertRaises(http_cache.OfflineCacheMiss):
+                http_cache.cached_get(UNCACHED_URL, origin)
+        self.assertEqual(origin.sent, [])
+
+    def test_least_recently_used_entries_are_evicted(self):
+        urls = [f'https://www.goodreads.com/book/show/{i}/reviews' for i in range(4)]
+        with self.settings(HTTP_CACHE_MAX_BYTES=2500):
+            for i, url in enumerate(urls):
+                http_cache.cached_get(url, Origin(response(200, b'x' * 1000)))
+                # mtime is the LRU order; keep it strictly increasing on coarse clocks
+                _, body_path = http_cache._paths(url)
+                os.utime(body_path, (time.time() - 100 + i, time.time() - 100 + i))
+                if i == 1:
+                    http_cache.cached_get(urls[0], Origin())  # a hit makes the first entry recent again
+
+        self.assertIsNotNone(http_cache._load(urls[0]))
+        self.assertIsNone(http_cache._load(urls[1]))
+        self.assertIsNotNone(http_cache._load(urls[3]))
+        self.assertGreaterEqual(http_cache.cache_stats()['evictions'], 1)
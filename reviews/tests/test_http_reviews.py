@@ -0,0 +1,196 @@
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from reviews.models import Book
+from reviews.review_batch import ReviewBatch
+from reviews.scraper import ReviewsBackendUnavailable, iter_goodreads_reviews_http, review_watermark, store_review_batch
+from reviews.tests.stub_server import StubGoodreads, fixture
+
+BOOK_ID = '4671.The_Test_Book'
+WORK_ID = 'kca://work/amzn1.gr.work.v1.TESTWORK'
+PAGE_2_TOKEN = 'MjAyNC0wMi0yMFQ='
+PAGE_3_TOKEN = 'MjAyMy0wOC0wMVQ='
+REVIEWS_PATH = f'/book/show/{BOOK_ID}/reviews?sort=NEWEST'
+
+
+def goodreads_stub(**overrides):
+    routes = {
+        'get_routes': {REVIEWS_PATH: 'goodreads/book_reviews_page.html'},
+        'graphql_pages': {
+            PAGE_2_TOKEN: 'goodreads/graphql_reviews_page2.json',
+            PAGE_3_TOKEN: 'goodreads/graphql_reviews_page3.json',
+        },
+    }
+    routes.update(overrides)
+    return StubGoodreads(**routes)
+
+
+def reviews_page(change):
+    """The recorded reviews page with change(apollo_state, getReviews key) applied to its embedded data."""
+    html = fixture('goodreads/book_reviews_page.html').decode('utf-8')
+    start = html.index('>', html.index('id="__NEXT_DATA__"')) + 1
+    end = html.index('</script>', start)
+    data = json.loads(html[start:end])
+    apollo_state = data['props']['pageProps']['apolloState']
+    change(apollo_state, next(key for key in apollo_state['ROOT_QUERY'] if key.startswith('getReviews(')))
+    return (html[:start] + json.dumps(data) + html[end:]).encode('utf-8')
+
+
+@override_settings(HTTP_CACHE_ENABLED=False, RATE_LIMIT_ENABLED=False, GOODREADS_GRAPHQL_API_KEY='test-key')
+class HttpReviewsBackendTests(SimpleTestCase):
+    """iter_goodreads_reviews_http against recorded Goodreads pages served by a local stub."""
+
+    def scrape(self, stub, max_reviews=-1, graphql=True, **kwargs):
+        with self.settings(GOODREADS_BASE_URL=stub.url, GOODREADS_GRAPHQL_URL=stub.graphql_url if graphql else None):
+            return list(iter_goodreads_reviews_http(BOOK_ID, max_reviews, **kwargs))
+
+    def test_reads_embedded_page_then_follows_graphql_tokens(self):
+        with goodreads_stub() as stub:
+            batches = self.scrape(stub)
+
+        # Review 2 comes back on page 2 as well and is only kept once
+        self.assertEqual([len(batch) for batch, _ in batches], [3, 2, 2])
+        reviewers = [review['reviewer_name'] for batch, _ in batches for review in batch]
+        self.assertEqual(reviewers, ['Ada Reader', 'Bram', 'Chidi A.', 'Dana', 'Eli', 'Fern', 'Gus'])
+
+        first = batches[0][0][0]
+        self.assertEqual(first['review_text'], 'Loved it, the ending was perfect.')
+        self.assertEqual(first['rating'], Decimal('5'))
+        self.assertEqual(first['review_date'], datetime(2024, 3, 2).date())
+        self.assertEqual(len(first['fingerprint']), 64)
+        self.assertEqual(batches[1][0][0]['review_text'], 'Great characters & world building.')
+        last_page = batches[2][0]
+        self.assertIsNone(last_page[0]['rating'])
+        self.assertIsNone(last_page[1]['review_date'])
+
+        self.assertEqual(len(stub.requests_for('GET')), 1)
+        posts = stub.requests_for('POST')
+        self.assertEqual([payload['variables']['pagination']['after'] for _, _, _, payload in posts],
+                         [PAGE_2_TOKEN, PAGE_3_TOKEN])
+        self.assertEqual(posts[0][3]['variables']['filters'],
+                         {'resourceType': 'WORK', 'resourceId': WORK_ID, 'sort': 'NEWEST'})
+        self.assertEqual(posts[0][2].get('x-api-key'), 'test-key')
+
+    def test_states_record_position_for_resuming(self):
+        with goodreads_stub() as stub:
+            states = [state for _, state in self.scrape(stub)]
+
+        self.assertEqual([state['batches_done'] for state in states], [1, 2, 3])
+        self.assertEqual([state['reviews_scraped'] for state in states], [3, 5, 7])
+        self.assertEqual([state['page_token'] for state in states], [PAGE_2_TOKEN, PAGE_3_TOKEN, ''])
+        self.assertTrue(all(state['backend'] == 'http' and state['work_id'] == WORK_ID for state in states))
+
+    def test_resume_continues_from_stored_page_token(self):
+        with goodreads_stub() as stub:
+            _, state = self.scrape(stub)[0]
+            stub.requests.clear()
+            resumed = self.scrape(stub, resume=state)
+
+        self.assertFalse(stub.requests_for('GET'))
+        self.assertEqual([len(batch) for batch, _ in resumed], [3, 2])
+        self.assertEqual(resumed[-1][1]['reviews_scraped'], 8)
+        self.assertEqual(resumed[-1][1]['batches_done'], 3)
+
+    def test_stops_at_max_reviews_without_fetching_more_pages(self):
+        with goodreads_stub() as stub:
+            batches = self.scrape(stub, max_reviews=4)
+
+        self.assertEqual([len(batch) for batch, _ in batches], [3, 1])
+        self.assertEqual(batches[-1][1]['page_token'], '')
+        self.assertEqual(len(stub.requests_for('POST')), 1)
+
+    def test_unavailable_when_more_pages_need_unconfigured_graphql(self):
+        with goodreads_stub() as stub:
+            with self.assertRaises(ReviewsBackendUnavailable):
+                self.scrape(stub, graphql=False)
+            # A single page is enough without GraphQL
+            self.assertEqual(len(self.scrape(stub, max_reviews=2, graphql=False)), 1)
+
+    def test_unavailable_without_embedded_page_data(self):
+        with goodreads_stub(get_routes={}) as stub:
+            with self.assertRaises(ReviewsBackendUnavailable):
+                self.scrape(stub)
+
+
+@override_settings(HTTP_CACHE_ENABLED=False, RATE_LIMIT_ENABLED=False, GOODREADS_GRAPHQL_API_KEY='test-key')
+class IncrementalScrapeTests(TestCase):
+    """Incremental re-scrapes read the newest reviews first and stop after a batch of stored ones."""
+
+    def setUp(self):
+        self.book = Book.objects.create(title='The Test Book', goodreads_id=BOOK_ID)
+
+    def scrape(self, stub, max_reviews, watermark=None):
+        with self.settings(GOODREADS_BASE_URL=stub.url, GOODREADS_GRAPHQL_URL=stub.graphql_url):
+            return list(iter_goodreads_reviews_http(BOOK_ID, max_reviews, watermark=watermark))
+
+    def store_all_but(self, stub, *skipped_reviewers):
+        reviews = [review for batch, _ in self.scrape(stub, -1) for review in batch]
+        store_review_batch(self.book, ReviewBatch.from_dicts(
+            review for review in reviews if review['reviewer_name'] not in skipped_reviewers
+        ))
+        stub.requests.clear()
+
+    def test_watermark_is_the_newest_date_and_recent_fingerprints(self):
+        self.assertIsNone(review_watermark(self.book))
+        with goodreads_stub() as stub:
+            self.store_all_but(stub)
+
+        watermark = review_watermark(self.book)
+        self.assertEqual(watermark['latest_date'], date(2024, 3, 2))
+        self.assertEqual(len(watermark['fingerprints']), 7)
+
+    def test_refresh_of_a_fully_stored_book_reads_one_page(self):
+        with goodreads_stub() as stub:
+            self.store_all_but(stub)
+            batches = self.scrape(stub, 3, watermark=review_watermark(self.book))
+
+        self.assertEqual([len(batch) for batch, _ in batches], [0])
+        self.assertEqual((len(stub.requests_for('GET')), len(stub.requests_for('POST'))), (1, 0))
+
+    def test_new_reviews_on_top_are_read_then_the_scrape_stops(self):
+        with goodreads_stub() as stub:
+            self.store_all_but(stub, 'Ada Reader', 'Bram')
+            batches = self.scrape(stub, 50, watermark=review_watermark(self.book))
+
+        reviewers = [review['reviewer_name'] for batch, _ in batches for review in batch]
+        self.assertEqual(reviewers, ['Ada Reader', 'Bram'])
+        # Page 2 holds only stored reviews (and a repeat), so page 3 is never requested
+        self.assertEqual([payload['variables']['pagination']['after'] for _, _, _, payload in stub.requests_for('POST')],
+                         [PAGE_2_TOKEN])
+
+    def test_reviews_dated_before_the_newest_stored_one_are_known(self):
+        with goodreads_stub() as stub:
+            # Only the newest review is stored; the older ones were never wanted by this refresh
+            self.store_all_but(stub, 'Bram', 'Chidi A.', 'Dana', 'Eli', 'Fern', 'Gus')
+            batches = self.scrape(stub, 50, watermark=review_watermark(self.book))
+
+        self.assertEqual(sum(len(batch) for batch, _ in batches), 0)
+        self.assertFalse(stub.requests_for('POST'))
+
+    def test_page_in_another_order_is_replaced_by_the_sorted_graphql_page(self):
+        def unsorted(apollo_state, key):
+            apollo_state['ROOT_QUERY'][key.replace(',"sort":"NEWEST"', '')] = apollo_state['ROOT_QUERY'].pop(key)
+
+        with goodreads_stub(scripted={REVIEWS_PATH: [(200, {}, reviews_page(unsorted))]},
+                            graphql_pages={None: 'goodreads/graphql_reviews_page1.json'}) as stub:
+            batches = self.scrape(stub, 3)
+
+        self.assertEqual([review['reviewer_name'] for review in batches[0][0]], ['Ada Reader', 'Bram', 'Chidi A.'])
+        (_, _, _, payload), = stub.requests_for('POST')
+        self.assertIsNone(payload['variables']['pagination']['after'])
+        self.assertEqual(payload['variables']['filters']['sort'], 'NEWEST')
+
+    def test_no_early_stop_when_reviews_are_not_newest_first(self):
+        def oldest_first(apollo_state, key):
+            apollo_state['ROOT_QUERY'][key]['edges'].reverse()
+
+        with goodreads_stub() as stub:
+            self.store_all_but(stub)
+            stub.scripted[REVIEWS_PATH] = [(200, {}, reviews_page(oldest_first))]
+            batches = self.scrape(stub, 3, watermark=review_watermark(self.book))
+
+        self.assertEqual(sum(len(batch) for batch, _ in batches), 0)
+        self.assertEqual(len(stub.requests_for('POST')), 2)
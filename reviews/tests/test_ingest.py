@@ -0,0 +1,82 @@
+import threading
+import time
+from unittest import mock
+
+from django.test import TransactionTestCase, override_settings
+
+from reviews import scraper
+from reviews.ingest import ingest_reviews
+from reviews.models import Book, Review, ScrapeCheckpoint
+from reviews.tests.test_http_reviews import BOOK_ID, PAGE_2_TOKEN, PAGE_3_TOKEN, goodreads_stub
+
+
+@override_settings(HTTP_CACHE_ENABLED=False, RATE_LIMIT_ENABLED=False, GOODREADS_GRAPHQL_API_KEY='test-key')
+class IngestReviewsTests(TransactionTestCase):
+    """ingest_reviews end to end: the writer thread stores each batch with its checkpoint."""
+
+    def setUp(self):
+        self.book = Book.objects.create(title='The Test Book', goodreads_id=BOOK_ID)
+
+    def ingest(self, stub, **kwargs):
+        with self.settings(GOODREADS_BASE_URL=stub.url, GOODREADS_GRAPHQL_URL=stub.graphql_url):
+            return ingest_reviews(self.book, -1, backend='http', **kwargs)
+
+    def checkpoint(self):
+        return ScrapeCheckpoint.objects.filter(book=self.book).values_list('batches_done', 'page_token').first()
+
+    def test_completed_scrape_deletes_its_checkpoint(self):
+        checkpoints = []
+        with goodreads_stub() as stub:
+            result = self.ingest(stub, progress=lambda scraped, created: checkpoints.append(self.checkpoint()))
+
+        self.assertEqual(result, (7, 7))
+        self.assertEqual(checkpoints, [(1, PAGE_2_TOKEN), (2, PAGE_3_TOKEN), (3, '')])
+        self.assertIsNone(self.checkpoint())
+        self.assertEqual(Review.objects.filter(book=self.book).count(), 7)
+
+    def test_interrupted_scrape_keeps_its_checkpoint_and_resumes_after_it(self):
+        # The last page fails to load
+        with goodreads_stub(graphql_pages={PAGE_2_TOKEN: 'goodreads/graphql_reviews_page2.json'}) as stub:
+            with self.assertRaises(scraper.requests.exceptions.HTTPError):
+                self.ingest(stub)
+        self.assertEqual(self.checkpoint(), (2, PAGE_3_TOKEN))
+        self.assertEqual(Review.objects.filter(book=self.book).count(), 5)
+
+        with goodreads_stub() as stub:
+            result = self.ingest(stub)
+
+        self.assertEqual(result, (7, 2))
+        self.assertFalse(stub.requests_for('GET'))
+        self.assertEqual([payload['variables']['pagination']['after'] for _, _, _, payload in stub.requests_for('POST')],
+                         [PAGE_3_TOKEN])
+        self.assertIsNone(self.checkpoint())
+        self.assertEqual(Review.objects.filter(book=self.book).count(), 7)
+
+    @mock.patch('reviews.ingest.QUEUE_DEPTH', 1)
+    def test_store_failure_is_raised_without_blocking_the_scraper(self):
+        failure = RuntimeError('disk full')
+        outcome = []
+
+        def failing_store(book, reviews):
+            # Fail once the scraper has asked for page 3: batch 2 then sits in the full queue
+            # and the scraper can only go on if the failed writer keeps taking batches
+            deadline = time.monotonic() + 10
+            while len(stub.requests) < 3 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            raise failure
+
+        def run():
+            try:
+                outcome.append(self.ingest(stub))
+            except Exception as e:
+                outcome.append(e)
+
+        with mock.patch.object(scraper, 'store_review_batch', side_effect=failing_store), goodreads_stub() as stub:
+            thread = threading.Thread(target=run, daemon=True)
+            thread.start()
+            thread.join(timeout=30)
+
+        self.assertFalse(thread.is_alive(), 'ingest_reviews blocked after the writer failed')
+        self.assertEqual(outcome, [failure])
+        self.assertIsNone(self.checkpoint())
+        self.assertFalse(Review.objects.filter(book=self.book).exists())
@@ -0,0 +1,103 @@
+import os
+import tempfile
+import time
+from email.utils import formatdate
+
+import requests
+from django.test import SimpleTestCase, override_settings
+
+from reviews import http_client, rate_limit
+from reviews.tests.stub_server import StubGoodreads
+
+HOST = 'www.goodreads.test'
+
+
+def response(status, headers=None):
+    r = requests.Response()
+    r.status_code = status
+    r.headers.update(headers or {})
+    return r
+
+
+@override_settings(RATE_LIMIT_ENABLED=True, RATE_LIMIT_INITIAL_RATE=50.0, RATE_LIMIT_MIN_RATE=0.1,
+                   RATE_LIMIT_MAX_RATE=60.0, RATE_LIMIT_BURST=5, RATE_LIMIT_CIRCUIT_FAILURES=3,
+                   RATE_LIMIT_CIRCUIT_COOLDOWN=60, HTTP_CACHE_ENABLED=False)
+class RateLimiterTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        database = self.settings(RATE_LIMIT_DB=os.path.join(directory.name, 'rate_limit.sqlite3'))
+        database.enable()
+        self.addCleanup(database.disable)
+
+    def state(self, host=HOST):
+        return next(state for state in rate_limit.host_states() if state['host'] == host)
+
+    def test_retry_after_seconds(self):
+        self.assertEqual(rate_limit.retry_after_seconds(response(429, {'Retry-After': '7'})), 7.0)
+        in_a_minute = rate_limit.retry_after_seconds(response(503, {'Retry-After': formatdate(time.time() + 60, usegmt=True)}))
+        self.assertAlmostEqual(in_a_minute, 60, delta=2)
+        self.assertEqual(rate_limit.retry_after_seconds(response(429, {'Retry-After': formatdate(0, usegmt=True)})), 0.0)
+        self.assertIsNone(rate_limit.retry_after_seconds(response(429, {'Retry-After': 'soon'})))
+        self.assertIsNone(rate_limit.retry_after_seconds(response(429)))
+        self.assertIsNone(rate_limit.retry_after_seconds(None))
+
+    def test_throttling_halves_the_rate_once_per_pause(self):
+        rate_limit.acquire(HOST)
+        self.assertEqual(rate_limit.record_failure(HOST, response(429, {'Retry-After': '30'})), 30.0)
+        state = self.state()
+        self.assertEqual(state['rate'], 25.0)
+        self.assertAlmostEqual(state['blocked_until'] - time.time(), 30, delta=2)
+
+        # A request that was already in flight reports the same pushback: no second cut
+        rate_limit.record_failure(HOST, response(429, {'Retry-After': '30'}))
+        self.assertEqual(self.state()['rate'], 25.0)
+
+    def test_success_raises_the_rate_and_clears_failures(self):
+        rate_limit.record_failure(HOST)
+        rate_limit.record_success(HOST)
+        state = self.state()
+        self.assertEqual(state['failures'], 0)
+        self.assertAlmostEqual(state['rate'], 50.0 + rate_limit.RATE_INCREASE)
+
+    def test_burst_then_paced(self):
+        started = time.monotonic()
+        for _ in range(5 + 10):
+            rate_limit.acquire(HOST)
+        # 5 tokens up front, then 10 more at 50/s
+        self.assertGreaterEqual(time.monotonic() - started, 0.15)
+
+    def test_circuit_opens_and_lets_one_probe_through_after_cooldown(self):
+        for _ in range(3):
+            rate_limit.record_failure(HOST)
+        with self.assertRaises(rate_limit.CircuitOpenError):
+            rate_limit.acquire(HOST)
+
+        with self.settings(RATE_LIMIT_CIRCUIT_COOLDOWN=0.05):
+            rate_limit.reset(HOST)
+            for _ in range(3):
+                rate_limit.record_failure(HOST)
+            time.sleep(0.1)
+            rate_limit.acquire(HOST)  # the probe
+            with self.assertRaises(rate_limit.CircuitOpenError):
+                rate_limit.acquire(HOST)
+            rate_limit.record_success(HOST)
+            rate_limit.acquire(HOST)
+
+    def test_reset_forgets_a_host(self):
+        rate_limit.record_failure(HOST)
+        rate_limit.record_failure('other.test')
+        rate_limit.reset(HOST)
+        self.assertEqual([state['host'] for state in rate_limit.host_states()], ['other.test'])
+
+    def test_client_retries_a_throttled_request(self):
+        throttled = (429, {'Retry-After': '0'}, b'slow down')
+        with StubGoodreads(get_routes={'/page': 'goodreads/book_reviews_page.html'},
+                           scripted={'/page': [throttled, throttled]}) as stub:
+            r = http_client.fetch(f'{stub.url}/page')
+            host = stub.url.split('//', 1)[1]
+
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(len(stub.requests), 3)
+        self.assertEqual(self.state(host)['failures'], 0)
+        self.assertEqual(self.state(host)['rate'], 50.0 * 0.5 * 0.5 + rate_limit.RATE_INCREASE)
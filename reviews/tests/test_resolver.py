@@ -0,0 +1,76 @@
+import io
+from datetime import timedelta
+from unittest import mock
+
+import requests
+from django.test import TestCase
+from django.utils import timezone
+
+from reviews import resolver, title_index
+from reviews.models import Book, GoodreadsIdResolution
+
+
+class ResolverTests(TestCase):
+    def setUp(self):
+        title_index.reset()
+        self.addCleanup(title_index.reset)
+        quiet = mock.patch('sys.stdout', new_callable=io.StringIO)
+        quiet.start()
+        self.addCleanup(quiet.stop)
+
+    def search(self, answers):
+        """Patches the Goodreads search with a {title: (id, score) or exception} table."""
+        def search_goodreads_id(title, author=None):
+            answer = answers[title]
+            if isinstance(answer, Exception):
+                raise answer
+            return answer
+        patcher = mock.patch('reviews.scraper.search_goodreads_id', side_effect=search_goodreads_id)
+        self.addCleanup(patcher.stop)
+        return patcher.start()
+
+    def test_search_results_are_cached(self):
+        search = self.search({'The Hobbit': ('5907', 12), 'Unfindable': (None, 0)})
+        pairs = [('The Hobbit', 'J.R.R. Tolkien'), ('Unfindable', None), ('The Hobbit', 'J.R.R. Tolkien')]
+
+        self.assertEqual(resolver.resolve_goodreads_ids(pairs),
+                         {('The Hobbit', 'J.R.R. Tolkien'): '5907', ('Unfindable', None): None})
+        self.assertEqual(search.call_count, 2)
+
+        # Differently spelled but equal after normalization: answered from the cache
+        self.assertEqual(resolver.resolve_goodreads_id('the hobbit ', 'j.r.r. tolkien'), '5907')
+        self.assertIsNone(resolver.resolve_goodreads_id('Unfindable'))
+        self.assertEqual(search.call_count, 2)
+        self.assertEqual(GoodreadsIdResolution.objects.get(goodreads_id='5907').match_score, 12)
+
+    def test_expired_resolutions_are_searched_again(self):
+        search = self.search({'The Hobbit': ('5907', 12), 'Unfindable': (None, 0)})
+        resolver.resolve_goodreads_ids([('The Hobbit', None), ('Unfindable', None)])
+
+        # Negative results expire after a day, positive ones after thirty
+        GoodreadsIdResolution.objects.update(resolved_at=timezone.now() - timedelta(days=2))
+        resolver.resolve_goodreads_ids([('The Hobbit', None), ('Unfindable', None)])
+        self.assertEqual([call.args[0] for call in search.call_args_list], ['The Hobbit', 'Unfindable', 'Unfindable'])
+
+        GoodreadsIdResolution.objects.update(resolved_at=timezone.now() - timedelta(days=31))
+        resolver.resolve_goodreads_id('The Hobbit')
+        self.assertEqual(search.call_count, 4)
+
+    def test_failed_searches_are_not_cached(self):
+        search = self.search({'The Hobbit': requests.exceptions.ConnectionError('offline')})
+        self.assertIsNone(resolver.resolve_goodreads_id('The Hobbit'))
+        self.assertFalse(GoodreadsIdResolution.objects.exists())
+
+        search.side_effect = None
+        search.return_value = ('5907', 12)
+        self.assertEqual(resolver.resolve_goodreads_id('The Hobbit'), '5907')
+
+    def test_stored_books_answer_without_searching(self):
+        Book.objects.create(title='The Hobbit', author='J.R.R. Tolkien', goodreads_id='5907')
+        Book.objects.create(title='Dune: Deluxe Edition', author='Frank Herbert', goodreads_id='234225')
+        search = self.search({})
+
+        self.assertEqual(resolver.resolve_goodreads_ids([('THE HOBBIT', 'J.R.R. Tolkien'), ('Dune', 'Frank Herbert')]),
+                         {('THE HOBBIT', 'J.R.R. Tolkien'): '5907', ('Dune', 'Frank Herbert'): '234225'})
+        search.assert_not_called()
+        self.assertEqual(GoodreadsIdResolution.objects.count(), 2)
@@ -0,0 +1,76 @@
+from datetime import date
+from decimal import Decimal
+
+from django.test import TestCase
+from django.urls import reverse
+
+from reviews.models import Book, Review
+from reviews.views import decode_cursor, encode_cursor, review_page
+
+
+class ReviewFeedTests(TestCase):
+    def setUp(self):
+        self.book = Book.objects.create(title='Feed Book', author='A. Writer', goodreads_id='91')
+        # Several reviews share a date and some have none, so pages must break ties by id
+        dates = [date(2024, 3, 1), date(2024, 3, 1), None, date(2024, 5, 2), date(2024, 3, 1),
+                 None, date(2023, 12, 31), date(2024, 5, 2), None, date(2024, 3, 1), date(2022, 1, 1)]
+        self.reviews = [
+            Review.objects.create(book=self.book, fingerprint=f'{i:064x}', review_text=f'Review {i}',
+                                  reviewer_name=f'Reader {i}', review_date=review_date,
+                                  rating=Decimal(i % 5 + 1), sentiment_label=('Positive', 'Negative')[i % 2])
+            for i, review_date in enumerate(dates)
+        ]
+        other = Book.objects.create(title='Other Book', goodreads_id='92')
+        Review.objects.create(book=other, fingerprint='f' * 64, review_text='Elsewhere', review_date=date(2024, 3, 1))
+
+    def expected_order(self, reviews=None):
+        reviews = reviews if reviews is not None else self.reviews
+        dated = sorted((r for r in reviews if r.review_date), key=lambda r: (r.review_date, r.pk), reverse=True)
+        undated = sorted((r for r in reviews if not r.review_date), key=lambda r: r.pk, reverse=True)
+        return [r.pk for r in dated + undated]
+
+    def test_pages_walk_every_review_once_in_order(self):
+        for limit in (1, 3, 4, 11, 20):
+            seen, cursor = [], None
+            while True:
+                rows, next_cursor = review_page(Review.objects.filter(book=self.book), cursor, limit)
+                self.assertLessEqual(len(rows), limit)
+                seen += [row.pk for row in rows]
+                if next_cursor is None:
+                    break
+                cursor = decode_cursor(next_cursor)
+            self.assertEqual(seen, self.expected_order(), f'limit={limit}')
+
+    def test_cursor_round_trip(self):
+        dated, undated = self.reviews[0], self.reviews[2]
+        self.assertEqual(decode_cursor(encode_cursor(dated)), (dated.review_date, dated.pk))
+        self.assertEqual(decode_cursor(encode_cursor(undated)), (None, undated.pk))
+        for malformed in ('', 'none', '2024-13-01_5', 'none_x'):
+            with self.assertRaises(ValueError):
+                decode_cursor(malformed)
+
+    def get_json(self, **params):
+        return self.client.get(reverse('reviews:book_reviews_json', kwargs={'pk': self.book.pk}), params)
+
+    def test_json_endpoint_follows_next_cursor_with_filters(self):
+        positive = [r for r in self.reviews if r.sentiment_label == 'Positive']
+        seen, params = [], {'limit': 2, 'sentiment': 'positive'}
+        while True:
+            payload = self.get_json(**params).json()
+            seen += [row['id'] for row in payload['reviews']]
+            if payload['next_cursor'] is None:
+                break
+            params['cursor'] = payload['next_cursor']
+        self.assertEqual(seen, self.expected_order(positive))
+
+        four_stars = self.get_json(rating=4).json()['reviews']
+        self.assertEqual({row['rating'] for row in four_stars}, {4.0})
+
+    def test_json_endpoint_rejects_bad_cursors_and_clamps_limit(self):
+        self.assertEqual(self.get_json(cursor='garbage').status_code, 400)
+        self.assertEqual(len(self.get_json(limit=0).json()['reviews']), 1)
+        self.assertEqual(len(self.get_json(limit='many').json()['reviews']), 11)
+        self.assertEqual(self.client.get(reverse('reviews:book_reviews_json', kwargs={'pk': 999})).status_code, 404)
+
+        payload = self.get_json(limit=1, html=1).json()
+        self.assertIn('Review 7', payload['html'])
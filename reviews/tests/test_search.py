@@ -0,0 +1,112 @@
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from reviews import search
+from reviews.models import Book, Review
+
+# Input users might type, including FTS5 syntax that must not reach MATCH as syntax
+HOSTILE_QUERIES = [
+    'NOT love', 'love OR', 'AND', 'title:love', 'NEAR(love story)', '"unbalanced', 'lo"ve',
+    '-love', '+love', '^love', 'love*story', '(love', '{review_text}: love', '***', "l'amour", 'c++',
+]
+
+
+class FtsQueryTests(SimpleTestCase):
+    def test_words_phrases_and_prefixes(self):
+        self.assertEqual(search.fts_query('slow start'), '"slow" "start"')
+        self.assertEqual(search.fts_query('"slow start" charact*'), '"slow start" "charact"*')
+        self.assertEqual(search.fts_query('  "  " * '), '')
+        self.assertEqual(search.fts_query(None), '')
+
+    def test_operators_and_syntax_become_plain_words(self):
+        self.assertEqual(search.fts_query('NOT love OR hate'), '"NOT" "love" "OR" "hate"')
+        self.assertEqual(search.fts_query('title:love NEAR(a b)'), '"title" "love" "NEAR" "a" "b"')
+        self.assertEqual(search.fts_query('"unbalanced quote'), '"unbalanced" "quote"')
+        self.assertEqual(search.fts_query('say "hi" there"'), '"say" "hi" "there"')
+
+    def test_highlight_escapes_before_marking(self):
+        snippet = search.highlight('<b>&</b> \x02match\x03')
+        self.assertEqual(snippet, '&lt;b&gt;&amp;&lt;/b&gt; <mark>match</mark>')
+
+
+@skipUnless(connection.vendor == 'sqlite', 'full-text search needs SQLite FTS5')
+class FullTextSearchTests(TestCase):
+    def setUp(self):
+        self.book = Book.objects.create(title='The Love Story', author='Ann Author',
+                                        description='A quiet tale about characters in a small town.')
+        self.other = Book.objects.create(title='Another Book', author='Bo Writer',
+                                         description='Nothing about love here, only storms.')
+        self.review = self.add(self.book, 'This is NOT a love story, and the characters are <b>wooden</b>.',
+                               'Negative', reviewer='Cleo')
+        self.add(self.book, 'Loved the characters and the slow start.', 'Positive')
+        self.add(self.other, 'Storms and characters everywhere.', 'Neutral')
+
+    def add(self, book, text, label, reviewer='Reader'):
+        return Review.objects.create(book=book, review_text=text, reviewer_name=reviewer, sentiment_label=label,
+                                     fingerprint=f'{Review.objects.count():064x}')
+
+    def texts(self, query, **filters):
+        return [Review.objects.get(pk=row['id']).review_text for row in search.search_reviews(query, **filters)]
+
+    def test_inserted_reviews_are_found_with_stemming_and_prefixes(self):
+        self.assertEqual(len(self.texts('character')), 3)
+        self.assertEqual(len(self.texts('charact*')), 3)
+        self.assertEqual(self.texts('"slow start"'), ['Loved the characters and the slow start.'])
+        self.assertEqual(self.texts('starting'), ['Loved the characters and the slow start.'])
+        self.assertEqual([row['id'] for row in search.search_reviews('cleo')], [self.review.pk])
+
+    def test_bulk_created_reviews_are_indexed(self):
+        Review.objects.bulk_create([
+            Review(book=self.other, review_text='A thunderous finale.', fingerprint='a' * 64),
+            Review(book=self.other, review_text='Thunder again.', fingerprint='b' * 64),
+        ])
+        self.assertEqual(len(self.texts('thunder*')), 2)
+
+    def test_updates_and_deletes_keep_the_index_in_sync(self):
+        Review.objects.filter(pk=self.review.pk).update(review_text='Rewritten: a gripping mystery.')
+        self.assertEqual(self.texts('wooden'), [])
+        self.assertEqual(self.texts('gripping'), ['Rewritten: a gripping mystery.'])
+
+        self.review.delete()
+        self.assertEqual(self.texts('gripping'), [])
+
+        self.book.title = 'The Hate Story'
+        self.book.save()
+        self.assertEqual([row['id'] for row in search.search_books('hate')], [self.book.pk])
+        self.assertEqual(search.search_books('"love story"'), [])
+        self.other.delete()
+        self.assertEqual(search.search_books('storms'), [])
+        self.assertEqual(self.texts('storms'), [])
+
+    def test_book_and_sentiment_filters(self):
+        self.assertEqual(len(self.texts('characters', book_id=self.book.pk)), 2)
+        self.assertEqual(self.texts('characters', book_id=self.book.pk, sentiment='Positive'),
+                         ['Loved the characters and the slow start.'])
+        self.assertEqual(self.texts('characters', sentiment='Neutral'), ['Storms and characters everywhere.'])
+        self.assertEqual(len(self.texts('characters', limit=2)) + len(self.texts('characters', limit=2, offset=2)), 3)
+
+    def test_user_syntax_is_searched_as_words(self):
+        self.assertEqual([row['id'] for row in search.search_reviews('NOT love')], [self.review.pk])
+        # None of these may be a MATCH syntax error (search_reviews would hide it as "no results")
+        with connection.cursor() as cursor:
+            for query in HOSTILE_QUERIES:
+                match = search.fts_query(query)
+                if match:
+                    cursor.execute('SELECT count(*) FROM reviews_review_fts WHERE reviews_review_fts MATCH %s', [match])
+
+    def test_snippets_are_escaped_and_highlighted(self):
+        snippet = str(search.search_reviews('wooden')[0]['snippet'])
+        self.assertIn('&lt;b&gt;<mark>wooden</mark>&lt;/b&gt;', snippet)
+        self.assertNotIn('<b>', snippet)
+
+    def test_books_rank_title_matches_first(self):
+        self.assertEqual([row['id'] for row in search.search_books('love')], [self.book.pk, self.other.pk])
+
+    def test_json_endpoint(self):
+        payload = self.client.get(reverse('reviews:search_json'), {'q': 'characters', 'sentiment': 'negative'}).json()
+        self.assertEqual([row['id'] for row in payload['reviews']], [self.review.pk])
+        self.assertIn('<mark>characters</mark>', payload['reviews'][0]['snippet'])
+        self.assertEqual([row['id'] for row in payload['books']], [self.book.pk])
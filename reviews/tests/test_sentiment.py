@@ -0,0 +1,31 @@
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from reviews import sentiment
+
+
+class LabelThresholdTests(SimpleTestCase):
+    def label(self, name, score):
+        with mock.patch.object(sentiment.ANALYZERS[name], 'score', return_value=score):
+            return sentiment._score_chunk(name, ['text'])[0][1]
+
+    def test_textblob_boundary_stays_neutral(self):
+        # The original TextBlob labelling used strict > 0.1 / < -0.1
+        self.assertEqual(self.label('textblob', 0.1), 'Neutral')
+        self.assertEqual(self.label('textblob', -0.1), 'Neutral')
+        self.assertEqual(self.label('textblob', 0.10001), 'Positive')
+        self.assertEqual(self.label('textblob', -0.10001), 'Negative')
+
+    def test_label_uses_unrounded_score(self):
+        self.assertEqual(self.label('textblob', 0.100004), 'Positive')
+
+    def test_vader_boundary_is_inclusive(self):
+        # The original VADER labelling used >= 0.05 / <= -0.05
+        self.assertEqual(sentiment.label_for(0.05, 0.05), 'Positive')
+        self.assertEqual(sentiment.label_for(-0.05, 0.05), 'Negative')
+        self.assertEqual(sentiment.label_for(0.0499, 0.05), 'Neutral')
+
+    def test_lexicon_zero_is_neutral(self):
+        self.assertEqual(self.label('lexicon', 0.0), 'Neutral')
+        self.assertEqual(self.label('lexicon', 0.5), 'Positive')
@@ -0,0 +1,61 @@
+from datetime import date
+from decimal import Decimal
+from unittest import mock
+
+from django.test import TestCase
+
+from reviews import sentiment
+from reviews.models import Book, BookStats, Review
+from reviews.review_batch import ReviewBatch
+from reviews.scraper import store_review_batch
+from reviews.stats import recompute_book_stats
+
+
+def make_batch(count):
+    batch = ReviewBatch()
+    for i in range(count):
+        batch.append(f'Review number {i}, a fine read.', f'Reader {i}', Decimal(i % 5 + 1), date(2024, 1, i + 1))
+    return batch
+
+
+class StoreReviewBatchTests(TestCase):
+    def setUp(self):
+        self.book = Book.objects.create(title='Stored Book', goodreads_id='42')
+
+    def stats_row(self):
+        return BookStats.objects.values(
+            'review_count', 'rating_count', 'rating_sum', 'positive_count', 'neutral_count', 'negative_count'
+        ).get(book=self.book)
+
+    def test_counts_new_reviews_and_skips_stored_ones(self):
+        batch = make_batch(4)
+        self.assertEqual(store_review_batch(self.book, batch), 4)
+        self.assertEqual(store_review_batch(self.book, batch), 0)
+        self.assertEqual(Review.objects.filter(book=self.book).count(), 4)
+        self.assertEqual(self.stats_row()['review_count'], 4)
+
+    def test_reviews_inserted_concurrently_are_not_counted(self):
+        batch = make_batch(4)
+        store_review_batch(self.book, make_batch(1))
+        real_score_reviews = sentiment.score_reviews
+
+        def score_then_race(reviews):
+            real_score_reviews(reviews)
+            # Another scraper stores review 2 after the existence check, before the insert
+            racer = reviews[1]
+            Review.objects.create(book=self.book, fingerprint=racer.fingerprint, review_text=racer.review_text,
+                                  reviewer_name=racer.reviewer_name, rating=racer.rating, review_date=racer.review_date,
+                                  sentiment_label=racer.sentiment_label, sentiment_score=racer.sentiment_score)
+
+        with mock.patch.object(sentiment, 'score_reviews', side_effect=score_then_race):
+            created = store_review_batch(self.book, batch)
+
+        self.assertEqual(created, 2)
+        self.assertEqual(Review.objects.filter(book=self.book).count(), 4)
+        # The racing row was never added to the stats by its (simulated) writer, so the
+        # incremental stats are one short of a full recompute, and never over it
+        incremental = self.stats_row()
+        recompute_book_stats([self.book.pk])
+        recomputed = self.stats_row()
+        self.assertEqual(incremental['review_count'], recomputed['review_count'] - 1)
+        self.assertLess(incremental['rating_sum'], recomputed['rating_sum'])
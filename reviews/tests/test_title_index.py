@@ -0,0 +1,42 @@
+from django.test import TestCase
+
+from reviews import title_index
+from reviews.models import Book
+
+
+class TitleIndexTests(TestCase):
+    def setUp(self):
+        title_index.reset()
+        self.addCleanup(title_index.reset)
+
+    def add(self, title, author, goodreads_id):
+        return Book.objects.create(title=title, author=author, goodreads_id=goodreads_id)
+
+    def test_other_books_of_a_series_do_not_match(self):
+        self.add('Percy Jackson: The Lightning Thief', 'Rick Riordan', '28187')
+        self.add('The Lord of the Rings: The Fellowship of the Ring', 'J.R.R. Tolkien', '34')
+
+        self.assertIsNone(title_index.confident_match('Percy Jackson: The Sea of Monsters', 'Rick Riordan'))
+        self.assertIsNone(title_index.confident_match('The Lord of the Rings: The Two Towers', 'J.R.R. Tolkien'))
+
+    def test_same_series_book_still_matches_itself(self):
+        self.add('Percy Jackson: The Lightning Thief', 'Rick Riordan', '28187')
+        self.add('Percy Jackson: The Sea of Monsters', 'Rick Riordan', '28186')
+
+        match = title_index.confident_match('Percy Jackson - The Sea of Monsters', 'Rick Riordan')
+        self.assertEqual(match.goodreads_id, '28186')
+
+    def test_subtitle_on_one_side_only_matches(self):
+        self.add('Dune: Deluxe Edition', 'Frank Herbert', '234225')
+        self.add('Sapiens', 'Yuval Noah Harari', '23692271')
+
+        self.assertEqual(title_index.confident_match('Dune', 'Frank Herbert').goodreads_id, '234225')
+        match = title_index.confident_match('Sapiens: A Brief History of Humankind', 'Yuval Noah Harari')
+        self.assertEqual(match.goodreads_id, '23692271')
+
+    def test_small_spelling_differences_match(self):
+        self.add('The Hitchhiker\'s Guide to the Galaxy', 'Douglas Adams', '11')
+
+        match = title_index.confident_match('The Hitchhikers Guide to the Galaxy', 'douglas adams')
+        self.assertEqual(match.goodreads_id, '11')
+        self.assertIsNone(title_index.confident_match('The Restaurant at the End of the Universe', 'Douglas Adams'))
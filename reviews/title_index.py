@@ -0,0 +1,199 @@
+# In reviews/title_index.py
+#
+# In-process fuzzy index over the catalogue's normalized titles and authors. Lets the resolver
+# answer a title/author from a book already stored under a slightly different spelling or with
+# a subtitle, without searching Goodreads. Built lazily from one query, kept current by the
+# Book signals of this process, and rebuilt after TITLE_INDEX_MAX_AGE seconds so books written
+# by other processes are picked up too.
+
+import re
+import threading
+import time
+from collections import Counter, defaultdict, namedtuple
+from functools import lru_cache
+
+from django.conf import settings
+
+from .utils import normalize_author, normalize_title
+
+Candidate = namedtuple('Candidate', 'book_id goodreads_id title author score')
+
+# Share of the score taken by the title when the query has an author
+TITLE_WEIGHT = 0.75
+# Best candidate must beat the runner-up (a different book) by this much to count as confident
+CONFIDENT_MARGIN = 0.05
+# Candidates scored exactly per query, taken in order of shared trigrams
+CANDIDATE_LIMIT = 50
+# Trigrams found in more than this share of titles are ignored when gathering candidates
+# (they match nearly everything and only slow the lookup down)
+COMMON_GRAM_SHARE = 0.05
+
+
+@lru_cache(maxsize=65536)
+def _word_trigrams(word):
+    padded = f'  {word} '
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def trigrams(text):
+    """Set of word trigrams, padded like pg_trgm so short words and word starts still count."""
+    grams = set()
+    for word in re.findall(r'\w+', text or ''):
+        grams |= _word_trigrams(word)
+    return grams
+
+
+def main_title(normalized_title):
+    """Title with any subtitle after ':' or ';' removed."""
+    return re.split(r'[:;]', normalized_title, maxsplit=1)[0].strip()
+
+
+def _main_title_grams(normalized_title):
+    """Trigrams of the title without its subtitle, or None when it has no subtitle."""
+    main = main_title(normalized_title)
+    return trigrams(main) if main != normalized_title else None
+
+
+def dice(a, b):
+    if not a or not b:
+        return 0.0
+    return 2 * len(a & b) / (len(a) + len(b))
+
+
+class _Index:
+    def __init__(self):
+        self.entries = {}   # book_id -> (title grams, main title grams or None, author grams, goodreads_id, title, author)
+        self.postings = defaultdict(set)  # trigram -> set of book ids
+        self.built_at = time.monotonic()
+
+    def add(self, book_id, normalized_title, normalized_author, goodreads_id):
+        self.remove(book_id)
+        if not normalized_title:
+            return
+        title_grams = trigrams(normalized_title)
+        self.entries[book_id] = (
+            title_grams, _main_title_grams(normalized_title), trigrams(normalized_author),
+            goodreads_id, normalized_title, normalized_author or '',
+        )
+        postings = self.postings
+        for gram in title_grams:
+            postings[gram].add(book_id)
+
+    def remove(self, book_id):
+        entry = self.entries.pop(book_id, None)
+        if entry is None:
+            return
+        for gram in entry[0]:
+            ids = self.postings.get(gram)
+            if ids is not None:
+                ids.discard(book_id)
+                if not ids:
+                    del self.postings[gram]
+
+    def candidates(self, query_grams):
+        """Book ids sharing the most (not overly common) title trigrams with the query."""
+        common = max(50, len(self.entries) * COMMON_GRAM_SHARE)
+        lists = [self.postings[gram] for gram in query_grams if gram in self.postings]
+        rare = [ids for ids in lists if len(ids) <= common] or lists
+        shared = Counter()
+        for ids in rare:
+            shared.update(ids)
+        return [book_id for book_id, _ in shared.most_common(CANDIDATE_LIMIT)]
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def _build():
+    from .models import Book
+
+    index = _Index()
+    rows = Book.objects.values_list('id', 'normalized_title', 'normalized_author', 'goodreads_id')
+    for book_id, normalized_title, normalized_author, goodreads_id in rows.iterator(chunk_size=2000):
+        index.add(book_id, normalized_title, normalized_author, goodreads_id)
+    print(f"[DEBUG] Title index built with {len(index.entries)} books.")
+    return index
+
+
+def _get_index():
+    global _index
+    max_age = getattr(settings, 'TITLE_INDEX_MAX_AGE', 300)
+    index = _index
+    if index is None or time.monotonic() - index.built_at > max_age:
+        with _index_lock:
+            if _index is None or time.monotonic() - _index.built_at > max_age:
+                _index = _build()
+            index = _index
+    return index
+
+
+def reset():
+    """Drops the index; the next lookup rebuilds it from the database."""
+    global _index
+    with _index_lock:
+        _index = None
+
+
+def add_book(book):
+    """Indexes (or re-indexes) a saved Book. A no-op until the index has been built."""
+    with _index_lock:
+        if _index is not None:
+            _index.add(book.pk, book.normalized_title, book.normalized_author, book.goodreads_id)
+
+
+def remove_book(book_id):
+    with _index_lock:
+        if _index is not None:
+            _index.remove(book_id)
+
+
+def match(title, author=None, limit=5, min_score=0.3):
+    """
+    Books most similar to title/author, best first, as Candidate tuples with a score in [0, 1].
+    The title score is the trigram Dice similarity of the full titles. When only one of the two
+    titles has a subtitle, the titles without subtitles are compared too and the higher score
+    counts ("Dune" finds "Dune: Deluxe Edition"); two subtitled titles are compared in full, so
+    books of one series ("Percy Jackson: The Sea of Monsters" / "...: The Lightning Thief") stay
+    apart. When an author is given the title takes TITLE_WEIGHT of the score and the author
+    similarity the rest.
+    """
+    normalized_title = normalize_title(title or '')
+    normalized_author = normalize_author(author)
+    query_grams = trigrams(normalized_title)
+    if not query_grams:
+        return []
+    query_main = _main_title_grams(normalized_title)
+    query_author = trigrams(normalized_author)
+
+    index = _get_index()
+    with _index_lock:
+        results = []
+        for book_id in index.candidates(query_grams):
+            title_grams, main_grams, author_grams, goodreads_id, book_title, book_author = index.entries[book_id]
+            score = dice(query_grams, title_grams)
+            if (query_main is None) != (main_grams is None):
+                score = max(score, dice(query_main or query_grams, main_grams or title_grams))
+            if query_author:
+                score = TITLE_WEIGHT * score + (1 - TITLE_WEIGHT) * dice(query_author, author_grams)
+            if score >= min_score:
+                results.append(Candidate(book_id, goodreads_id, book_title, book_author, round(score, 4)))
+    results.sort(key=lambda candidate: (-candidate.score, candidate.book_id))
+    return results[:limit]
+
+
+def confident_match(title, author=None):
+    """
+    The stored book with a Goodreads ID that title/author almost certainly refers to, or None.
+    Needs a score of at least settings.TITLE_MATCH_THRESHOLD and a clear lead over any other
+    Goodreads ID.
+    """
+    threshold = getattr(settings, 'TITLE_MATCH_THRESHOLD', 0.85)
+    candidates = [c for c in match(title, author, limit=10, min_score=threshold - CONFIDENT_MARGIN) if c.goodreads_id]
+    if not candidates or candidates[0].score < threshold:
+        return None
+    best = candidates[0]
+    for other in candidates[1:]:
+        if other.goodreads_id != best.goodreads_id and best.score - other.score < CONFIDENT_MARGIN:
+            return None
+    return best
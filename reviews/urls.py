@@ -12,7 +12,21 @@ urlpatterns = [
     
     # Detail page for a specific book
     path('book/<int:pk>/', views.book_detail, name='book_detail'),
+
+    # Keyset-paginated reviews of a book as JSON (used by the detail page's infinite scroll)
+    path('book/<int:pk>/reviews.json', views.book_reviews_json, name='book_reviews_json'),
     
+    # Full-text search over reviews and books, as a page and as JSON
+    path('search/', views.search, name='search'),
+    path('search.json', views.search_json, name='search_json'),
+
+    # Streaming review dumps (jsonl, csv or parquet) for analytics
+    path('export/reviews.<str:fmt>', views.export_reviews, name='export_reviews'),
+
     # The page to trigger the scraping action
     path('scrape/', views.scrape_book, name='scrape_book'),
+
+    # Progress of a queued scrape job, as a page and as JSON
+    path('scrape/jobs/<int:pk>/', views.scrape_job_status, name='scrape_job_status'),
+    path('scrape/jobs/<int:pk>.json', views.scrape_job_json, name='scrape_job_json'),
 ]
\ No newline at end of file
@@ -1,6 +1,6 @@
 # reviews/utils.py
+import hashlib
 import re
-from textblob import TextBlob
 
 
 def normalize_string(text):
@@ -29,20 +29,25 @@ def normalize_author(author):
     author = re.sub(r'\s+by\s+', ' ', author)
     return author.strip().lower()
 
+def review_fingerprint(source, reviewer_name, review_date, review_text):
+    """
+    Stable hash identifying a review: source, normalized reviewer name, review date and
+    normalized text. Used as the review's dedup key everywhere reviews are compared.
+    """
+    if hasattr(review_date, 'date'):
+        review_date = review_date.date()  # datetime -> date
+    parts = [
+        source or '',
+        normalize_string(reviewer_name),
+        review_date.isoformat() if review_date else '',
+        normalize_string(review_text),
+    ]
+    return hashlib.sha256('\x1f'.join(parts).encode('utf-8')).hexdigest()
+
 def get_sentiment_label(text):
     """
     Performs sentiment analysis on a given text using TextBlob.
     Returns a sentiment label ('Positive', 'Negative', 'Neutral') and the polarity score.
     """
-    if not text:
-        return 'Neutral', 0.0
-
-    analysis = TextBlob(text)
-    score = analysis.sentiment.polarity
-    
-    if score > 0.1:
-        return 'Positive', score
-    elif score < -0.1:
-        return 'Negative', score
-    else:
-        return 'Neutral', score
\ No newline at end of file
+    from .sentiment import analyze
+    return analyze(text, 'textblob')
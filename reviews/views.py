@@ -1,37 +1,186 @@
 # In reviews/views.py
 
+from datetime import date
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db.models import Case, F, FloatField, Q, When
+from django.db.models.functions import Coalesce
 from django.shortcuts import render, redirect, get_object_or_404
-from .models import Book, Review
-from .scraper import find_goodreads_id_from_title_author, get_goodreads_book_metadata, get_goodreads_reviews, create_or_update_book_record, save_goodreads_reviews_to_db
-from django.db import transaction
-import time
+from django.http import JsonResponse, StreamingHttpResponse
+from django.template.loader import render_to_string
+from django.urls import reverse
+from django.utils.http import urlencode
+from . import export
+from .models import Book, Review, ScrapeJob
+from .jobs import enqueue_scrape
+from .search import search_books, search_reviews
+from .signals import catalogue_version
+from .stats import get_book_stats
+
+# Catalogue page size and sort orders (?sort=...) for book_list
+BOOK_LIST_PAGE_SIZE = 24
+BOOK_LIST_SORTS = {
+    'title': ('Title', ['title', 'pk']),
+    'rating': ('Rating', [F('average_rating').desc(nulls_last=True), 'title', 'pk']),
+    'reviews': ('Review count', ['-review_count', 'title', 'pk']),
+}
+
+def _book_list_page(sort, page_number):
+    """One catalogue page with review stats annotated from BookStats in the same query."""
+    books = Book.objects.annotate(
+        review_count=Coalesce(F('stats__review_count'), 0),
+        mean_rating=Case(
+            When(stats__rating_count__gt=0, then=F('stats__rating_sum') / F('stats__rating_count')),
+            default=None, output_field=FloatField(),
+        ),
+    ).only('pk', 'title', 'author', 'cover_image_url', 'average_rating').order_by(*BOOK_LIST_SORTS[sort][1])
+    page = Paginator(books, BOOK_LIST_PAGE_SIZE).get_page(page_number)
+    return {'books': list(page), 'number': page.number, 'num_pages': page.paginator.num_pages}
 
 def book_list(request):
-    books = Book.objects.all().order_by('title')
-    return render(request, 'reviews/book_list.html', {'books': books})
+    sort = request.GET.get('sort', 'title')
+    if sort not in BOOK_LIST_SORTS:
+        sort = 'title'
+    try:
+        page_number = max(1, int(request.GET.get('page', 1)))
+    except ValueError:
+        page_number = 1
+
+    # Pages are cached under the catalogue version, which reviews.signals bumps on any change
+    cache_key = f"book_list:{catalogue_version()}:{sort}:{page_number}"
+    page = cache.get(cache_key)
+    if page is None:
+        page = _book_list_page(sort, page_number)
+        cache.set(cache_key, page, getattr(settings, 'BOOK_LIST_CACHE_TIMEOUT', 300))
+
+    return render(request, 'reviews/book_list.html', {
+        **page,
+        'sort': sort,
+        'sorts': [(key, label) for key, (label, _) in BOOK_LIST_SORTS.items()],
+        'page_range': range(max(1, page['number'] - 3), min(page['num_pages'], page['number'] + 3) + 1),
+    })
+
+# Reviews per page of the book_detail feed; the JSON endpoint accepts up to MAX_REVIEWS_PAGE_SIZE
+REVIEWS_PAGE_SIZE = 20
+MAX_REVIEWS_PAGE_SIZE = 100
+SENTIMENT_CHOICES = ('Positive', 'Neutral', 'Negative')
+RATING_CHOICES = (5, 4, 3, 2, 1)
+
+def _review_filters(request):
+    """Sentiment label and whole-star rating filters from the query string; invalid values are ignored."""
+    sentiment = request.GET.get('sentiment', '').capitalize()
+    try:
+        rating = int(request.GET.get('rating', ''))
+    except ValueError:
+        rating = None
+    return {
+        'sentiment': sentiment if sentiment in SENTIMENT_CHOICES else None,
+        'rating': rating if rating in RATING_CHOICES else None,
+    }
+
+def _filtered_reviews(book, filters):
+    reviews = Review.objects.filter(book=book)
+    if filters['sentiment']:
+        reviews = reviews.filter(sentiment_label=filters['sentiment'])
+    if filters['rating']:
+        # Same whole-star buckets as the BookStats histogram
+        stars = filters['rating']
+        if stars > 1:
+            reviews = reviews.filter(rating__gte=stars - 0.5)
+        if stars < 5:
+            reviews = reviews.filter(rating__lt=stars + 0.5)
+    return reviews
+
+def encode_cursor(review):
+    return f"{review.review_date.isoformat() if review.review_date else 'none'}_{review.pk}"
+
+def decode_cursor(cursor):
+    """Parses a cursor from encode_cursor into (review_date or None, id). Raises ValueError if malformed."""
+    date_part, _, id_part = cursor.rpartition('_')
+    review_date = None if date_part == 'none' else date.fromisoformat(date_part)
+    return review_date, int(id_part)
+
+def review_page(reviews, cursor=None, limit=REVIEWS_PAGE_SIZE):
+    """
+    One page of reviews, newest first, after `cursor` (a decoded (review_date, id) pair).
+    Seeks on the (book, review_date, id) index instead of using OFFSET, so every page costs
+    the same however deep it is. Dated reviews come first, then undated ones by id.
+    Returns (reviews, next_cursor), with next_cursor None on the last page.
+    """
+    rows = []
+    cursor_date, cursor_id = cursor or (None, None)
+    if cursor is None or cursor_date is not None:
+        dated = reviews.filter(review_date__isnull=False)
+        if cursor is not None:
+            dated = dated.filter(Q(review_date__lt=cursor_date) | Q(review_date=cursor_date, id__lt=cursor_id))
+        rows = list(dated.order_by('-review_date', '-id')[:limit + 1])
+    if len(rows) <= limit:
+        undated = reviews.filter(review_date__isnull=True)
+        if cursor is not None and cursor_date is None:
+            undated = undated.filter(id__lt=cursor_id)
+        rows += list(undated.order_by('-id')[:limit + 1 - len(rows)])
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    return rows, (encode_cursor(rows[-1]) if has_more else None)
+
+def _reviews_json_url(book, filters):
+    params = {name: value for name, value in filters.items() if value}
+    params['html'] = 1
+    return f"{reverse('reviews:book_reviews_json', kwargs={'pk': book.pk})}?{urlencode(params)}"
 
 def book_detail(request, pk):
-    book = get_object_or_404(Book, pk=pk)
-    reviews = book.reviews.all().order_by('-review_date')
-
-    # New code to calculate sentiment data for the template
-    total_reviews = reviews.count()
-    sentiment_data = {
-        'total': total_reviews,
-        'positive_percent': 0,
-        'neutral_percent': 0,
-        'negative_percent': 0,
+    book = get_object_or_404(Book.objects.select_related('stats'), pk=pk)
+
+    # Only the first page is rendered; the rest is fetched from book_reviews_json on scroll
+    filters = _review_filters(request)
+    reviews, next_cursor = review_page(_filtered_reviews(book, filters))
+
+    # Sentiment and rating breakdowns come from the precomputed BookStats row
+    stats = get_book_stats(book)
+    sentiment_data = stats.sentiment_percentages()
+
+    return render(request, 'reviews/book_detail.html', {
+        'book': book, 'reviews': reviews, 'sentiment_data': sentiment_data, 'stats': stats,
+        'filters': filters, 'next_cursor': next_cursor, 'reviews_json_url': _reviews_json_url(book, filters),
+        'sentiment_choices': SENTIMENT_CHOICES, 'rating_choices': RATING_CHOICES,
+    })
+
+def _review_payload(review):
+    return {
+        'id': review.pk,
+        'reviewer_name': review.reviewer_name,
+        'review_date': review.review_date.isoformat() if review.review_date else None,
+        'rating': float(review.rating) if review.rating is not None else None,
+        'sentiment_label': review.sentiment_label,
+        'sentiment_score': float(review.sentiment_score) if review.sentiment_score is not None else None,
+        'review_text': review.review_text,
     }
-    if total_reviews > 0:
-        positive_count = reviews.filter(sentiment_label='Positive').count()
-        neutral_count = reviews.filter(sentiment_label='Neutral').count()
-        negative_count = reviews.filter(sentiment_label='Negative').count()
 
-        sentiment_data['positive_percent'] = (positive_count / total_reviews) * 100
-        sentiment_data['neutral_percent'] = (neutral_count / total_reviews) * 100
-        sentiment_data['negative_percent'] = (negative_count / total_reviews) * 100
-    
-    return render(request, 'reviews/book_detail.html', {'book': book, 'reviews': reviews, 'sentiment_data': sentiment_data})
+def book_reviews_json(request, pk):
+    """
+    A page of a book's reviews as JSON. Query parameters: cursor (from the previous page's
+    next_cursor), limit, sentiment, rating, and html=1 to include the rendered review cards.
+    """
+    book = get_object_or_404(Book.objects.only('pk'), pk=pk)
+    cursor = None
+    if request.GET.get('cursor'):
+        try:
+            cursor = decode_cursor(request.GET['cursor'])
+        except ValueError:
+            return JsonResponse({'error': 'Invalid cursor.'}, status=400)
+    try:
+        limit = min(max(int(request.GET.get('limit', REVIEWS_PAGE_SIZE)), 1), MAX_REVIEWS_PAGE_SIZE)
+    except ValueError:
+        limit = REVIEWS_PAGE_SIZE
+
+    reviews, next_cursor = review_page(_filtered_reviews(book, _review_filters(request)), cursor, limit)
+    payload = {'reviews': [_review_payload(review) for review in reviews], 'next_cursor': next_cursor}
+    if request.GET.get('html'):
+        payload['html'] = render_to_string('reviews/_review_cards.html', {'reviews': reviews}, request=request)
+    return JsonResponse(payload)
 
 def clean_title(title, author):
     # Remove 'by [author]' or any ' by ...' at the end of the title
@@ -56,6 +205,11 @@ def scrape_book(request):
         
         # You can keep the `scrape_count` logic as it was
         max_reviews = int(request.POST.get('scrape_count', 25))
+        # Optional per-request reviews backend ('selenium' or 'http'); defaults to settings
+        backend = request.POST.get('backend')
+        from .scraper import REVIEW_BACKENDS  # imported here so rendering pages never loads the scraper
+        if backend not in REVIEW_BACKENDS:
+            backend = None
 
         # Add a check to ensure at least a title is provided
         if not title:
@@ -63,32 +217,128 @@ def scrape_book(request):
             return redirect('reviews:book_list')
 
 
-        goodreads_id = find_goodreads_id_from_title_author(title, author)
-        
-        if not goodreads_id:
-            print(f"Could not find a Goodreads ID for '{title}' by {author}")
-            return redirect('reviews:book_list')
+        # The scrape runs in a run_scrape_worker process; the status page polls its progress
+        # "New reviews only" refreshes read the newest reviews first and stop after a batch of
+        # reviews already stored for the book
+        incremental = request.POST.get('incremental') == '1'
+        job = enqueue_scrape(title, author, max_reviews, backend=backend, incremental=incremental)
+        return redirect('reviews:scrape_job_status', pk=job.pk)
 
-        book_metadata = get_goodreads_book_metadata(goodreads_id)
-        
-        if not book_metadata or not book_metadata.get('title'):
-            print(f"Could not scrape metadata for Goodreads ID {goodreads_id}")
-            return redirect('reviews:book_list')
-        
-        try:
-            with transaction.atomic():
-                book_obj = create_or_update_book_record(book_metadata, 'goodreads')
-        except Exception as e:
-            print(f"Error saving book metadata: {e}")
-            return redirect('reviews:book_list')
+    books = Book.objects.all()
+    return render(request, 'reviews/scrape_form.html', {'books': books})
 
-        reviews_data = get_goodreads_reviews(goodreads_id, max_reviews)
+def _scrape_job_payload(job):
+    return {
+        'id': job.pk,
+        'title': job.title,
+        'author': job.author,
+        'status': job.status,
+        'phase': job.phase,
+        'finished': job.is_finished,
+        'reviews_scraped': job.reviews_scraped,
+        'timings': job.timings,
+        'error': job.error,
+        'book_url': reverse('reviews:book_detail', kwargs={'pk': job.book_id}) if job.book_id else None,
+        'created_at': job.created_at.isoformat(),
+        'started_at': job.started_at.isoformat() if job.started_at else None,
+        'finished_at': job.finished_at.isoformat() if job.finished_at else None,
+    }
 
-        if reviews_data:
-            save_goodreads_reviews_to_db(book_obj, reviews_data)
+def scrape_job_status(request, pk):
+    job = get_object_or_404(ScrapeJob, pk=pk)
+    return render(request, 'reviews/scrape_job_status.html', {'job': job})
 
-        return redirect('reviews:book_detail', pk=book_obj.pk)
+def scrape_job_json(request, pk):
+    job = get_object_or_404(ScrapeJob, pk=pk)
+    return JsonResponse(_scrape_job_payload(job))
 
-    books = Book.objects.all()
-    return render(request, 'reviews/scrape_form.html', {'books': books})
+# Ranked review hits per search page
+SEARCH_PAGE_SIZE = 20
+
+def _search_params(request):
+    try:
+        offset = max(0, int(request.GET.get('offset', 0)))
+    except ValueError:
+        offset = 0
+    try:
+        book_id = int(request.GET.get('book', ''))
+    except ValueError:
+        book_id = None
+    sentiment = request.GET.get('sentiment', '').capitalize()
+    return {
+        'q': request.GET.get('q', '').strip(),
+        'book': book_id,
+        'sentiment': sentiment if sentiment in SENTIMENT_CHOICES else None,
+        'offset': offset,
+    }
+
+def _run_search(params):
+    # Ask for one extra hit to know whether there is a next page
+    hits = search_reviews(params['q'], book_id=params['book'], sentiment=params['sentiment'],
+                          limit=SEARCH_PAGE_SIZE + 1, offset=params['offset'])
+    next_offset = params['offset'] + SEARCH_PAGE_SIZE if len(hits) > SEARCH_PAGE_SIZE else None
+    # Book matches are only shown on the first page of an unfiltered search
+    books = search_books(params['q'], limit=6) if not params['offset'] and not params['book'] else []
+    return books, hits[:SEARCH_PAGE_SIZE], next_offset
+
+def search(request):
+    params = _search_params(request)
+    books, hits, next_offset = _run_search(params)
+    filter_book = Book.objects.filter(pk=params['book']).only('pk', 'title').first() if params['book'] else None
+    next_url = None
+    if next_offset is not None:
+        next_url = '?' + urlencode({key: value for key, value in {**params, 'offset': next_offset}.items() if value})
+    return render(request, 'reviews/search.html', {
+        'params': params, 'books': books, 'hits': hits, 'next_url': next_url, 'filter_book': filter_book,
+        'sentiment_choices': SENTIMENT_CHOICES,
+    })
+
+def search_json(request):
+    """
+    Full-text search as JSON. Query parameters: q (words, "quoted phrases", prefix*), book,
+    sentiment and offset. Snippets are HTML with matches wrapped in <mark>.
+    """
+    params = _search_params(request)
+    books, hits, next_offset = _run_search(params)
+    for row in books + hits:
+        row['snippet'] = str(row['snippet'])
+        if row.get('review_date'):
+            row['review_date'] = str(row['review_date'])
+        if row.get('rating') is not None:
+            row['rating'] = float(row['rating'])
+    return JsonResponse({'query': params['q'], 'books': books, 'reviews': hits, 'next_offset': next_offset})
+
+def export_reviews(request, fmt):
+    """
+    Streams reviews joined with their book as JSONL, CSV or Parquet. Query parameters: book
+    (repeatable), from / to (YYYY-MM-DD review dates), sentiment, and after_id for incremental
+    exports. The X-Export-Last-Id response header is the after_id to send next time. Served only
+    with settings.REVIEW_EXPORT_HTTP_ENABLED, and only for requests naming a book or a date.
+    """
+    if not getattr(settings, 'REVIEW_EXPORT_HTTP_ENABLED', False):
+        return JsonResponse({'error': 'Review export is not enabled on this server.'}, status=404)
+    if fmt not in export.EXPORT_FORMATS:
+        return JsonResponse({'error': f'Unknown format; use one of {", ".join(export.EXPORT_FORMATS)}.'}, status=404)
+    if fmt == 'parquet' and not export.parquet_available():
+        return JsonResponse({'error': 'Parquet export is not available on this server.'}, status=501)
+    try:
+        book_ids = [int(value) for value in request.GET.getlist('book')]
+        date_from = date.fromisoformat(request.GET['from']) if request.GET.get('from') else None
+        date_to = date.fromisoformat(request.GET['to']) if request.GET.get('to') else None
+        after_id = max(0, int(request.GET.get('after_id', 0)))
+    except ValueError:
+        return JsonResponse({'error': 'Invalid book, from, to or after_id parameter.'}, status=400)
+    if not (book_ids or date_from or date_to):
+        return JsonResponse({'error': 'Name at least one book, or a from / to date.'}, status=400)
+    sentiment = request.GET.get('sentiment', '').capitalize()
+    if sentiment and sentiment not in SENTIMENT_CHOICES:
+        return JsonResponse({'error': 'Invalid sentiment.'}, status=400)
 
+    reviews = export.filtered_reviews(book_ids, date_from, date_to, sentiment or None)
+    upto_id = max(after_id, export.latest_review_id())
+    response = StreamingHttpResponse(
+        export.export_stream(fmt, reviews, after_id, upto_id), content_type=export.EXPORT_CONTENT_TYPES[fmt]
+    )
+    response['Content-Disposition'] = f'attachment; filename="reviews-to-{upto_id}.{fmt}"'
+    response['X-Export-Last-Id'] = str(upto_id)
+    return response
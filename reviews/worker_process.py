@@ -0,0 +1,22 @@
+# In reviews/worker_process.py
+#
+# Entry points for spawned worker processes. Kept free of model imports at module level so the
+# child can import it before Django is set up.
+
+import os
+
+
+def setup_django():
+    import django
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "book_reviews_project.settings")
+    django.setup()
+
+
+def bulk_scrape_process(owner, stale_before, max_reviews, backend, lease_duration, events, incremental=False):
+    """Runs jobs.run_bulk_worker in a child process, sending per-book reports to the parent's queue."""
+    setup_django()
+    from .jobs import run_bulk_worker
+    try:
+        run_bulk_worker(owner, stale_before, max_reviews, backend, lease_duration, report=events.put, incremental=incremental)
+    finally:
+        events.put({'worker': owner, 'done': True})